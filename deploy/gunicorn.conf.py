@@ -0,0 +1,60 @@
+"""
+WSGI deployment profili (gunicorn, preload + fork).
+
+    python manage.py serve
+    gunicorn -c deploy/gunicorn.conf.py taalim.wsgi:application
+
+Master jarayon ilovani bir marta yuklaydi (Django, URL'lar, shablonlar,
+katalog keshi - taalim/warmup.py), so'ng worker'larni fork qiladi: ular bu
+xotirani copy-on-write bilan bo'lishadi va ishga tushishi millisekundlarda.
+Master'dagi obyektlar `gc.freeze()` bilan muzlatiladi - worker'lardagi GC
+ularga tegmaydi va sahifalar nusxalanmaydi.
+
+Signallar (master PID ga):
+    HUP        - worker'larni silliq almashtirish (konfiguratsiya qayta o'qiladi)
+    USR2, QUIT - yangi kod bilan: USR2 yangi master'ni ishga tushiradi,
+                 u tayyor bo'lgach eski master'ga QUIT yuboriladi
+    TTIN/TTOU  - worker sonini bittaga oshirish/kamaytirish
+    TERM       - joriy so'rovlarni graceful_timeout ichida tugatib to'xtash
+
+preload_app bilan HUP ilova kodini qayta yuklamaydi - worker'lar master'dagi
+nusxadan fork qilinadi, shuning uchun deploy'da USR2 ishlatiladi.
+"""
+
+import gc
+import multiprocessing
+import os
+
+
+def _cores() -> int:
+    # Konteynerda cpu_count() butun mashina yadrolarini qaytaradi
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return multiprocessing.cpu_count()
+
+
+bind = os.environ.get("BIND", "0.0.0.0:8000")
+threads = int(os.environ.get("THREADS", 1))
+# THREADS > 1 bo'lsa gunicorn o'zi gthread worker'iga o'tadi
+workers = int(os.environ.get("WEB_CONCURRENCY", _cores() * 2 + 1))
+
+preload_app = os.environ.get("PRELOAD", "True").lower() in ("1", "true", "yes")
+
+# Xotira sizib chiqishini cheklash: worker shuncha so'rovdan keyin almashtiriladi,
+# jitter barcha worker'lar bir vaqtda qayta tug'ilmasligi uchun
+max_requests = int(os.environ.get("MAX_REQUESTS", 1000))
+max_requests_jitter = int(os.environ.get("MAX_REQUESTS_JITTER", 100))
+
+keepalive = int(os.environ.get("KEEPALIVE", 5))
+timeout = int(os.environ.get("TIMEOUT", 60))
+graceful_timeout = int(os.environ.get("GRACEFUL_TIMEOUT", 30))
+backlog = int(os.environ.get("BACKLOG", 2048))
+
+
+def when_ready(server):
+    # Ilova yuklangan, worker'lar hali fork qilinmagan
+    if preload_app:
+        gc.collect()
+        gc.freeze()
+        server.log.info("Ilova oldindan yuklandi, %s ta obyekt muzlatildi", gc.get_freeze_count())
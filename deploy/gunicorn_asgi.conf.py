@@ -0,0 +1,46 @@
+"""
+ASGI deployment profili (gunicorn + uvicorn worker'lari).
+
+    pip install -r requirements.txt   # uvicorn
+    python manage.py serve --asgi
+    gunicorn -c deploy/gunicorn_asgi.conf.py taalim.asgi:application
+
+Har bir worker bitta event loop'da minglab ochiq ulanishni ushlab turadi,
+shuning uchun worker soni yadro soniga teng bo'lishi yetarli. Preload,
+max_requests va signallar WSGI profilidagi kabi (deploy/gunicorn.conf.py).
+"""
+
+import gc
+import multiprocessing
+import os
+
+
+def _cores() -> int:
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return multiprocessing.cpu_count()
+
+
+bind = os.environ.get("BIND", "0.0.0.0:8000")
+worker_class = "uvicorn.workers.UvicornWorker"
+workers = int(os.environ.get("WEB_CONCURRENCY", _cores()))
+
+preload_app = os.environ.get("PRELOAD", "True").lower() in ("1", "true", "yes")
+max_requests = int(os.environ.get("MAX_REQUESTS", 5000))
+max_requests_jitter = int(os.environ.get("MAX_REQUESTS_JITTER", 500))
+
+# Imtihon sahifasi ochiq turgan talabalar uchun keep-alive uzunroq
+keepalive = int(os.environ.get("KEEPALIVE", 75))
+timeout = int(os.environ.get("TIMEOUT", 60))
+graceful_timeout = int(os.environ.get("GRACEFUL_TIMEOUT", 30))
+backlog = int(os.environ.get("BACKLOG", 2048))
+
+raw_env = ["ASGI=True"]
+
+
+def when_ready(server):
+    if preload_app:
+        gc.collect()
+        gc.freeze()
+        server.log.info("Ilova oldindan yuklandi, %s ta obyekt muzlatildi", gc.get_freeze_count())
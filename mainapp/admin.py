@@ -1,10 +1,46 @@
-from django.contrib import admin
-from .models import Book, TeamMember
+import csv
+
+from django import forms
+from django.conf import settings
+from django.contrib import admin, messages
+from django.http import HttpResponseRedirect, StreamingHttpResponse
+from django.template.response import TemplateResponse
+from django.urls import path, reverse
+from django.utils import timezone
+
+from .booktext import schedule_extraction, sync_book
+from .models import Book, BookText, TeamMember, UserProfile
+from .provisioning import CREDENTIAL_HEADER, DEFAULT_BATCH_SIZE, provision_students, read_students
 
 @admin.register(Book)
 class BookAdmin(admin.ModelAdmin):
-    list_display = ('title', 'uploaded_at')
+    list_display = ('title', 'uploaded_at', 'text_status')
+    list_select_related = ('text',)
+    list_filter = ('text__status',)
     search_fields = ('title', 'description')  # 🔍 admin panelda qidirish
+    actions = ['extract_text']
+
+    @admin.display(description='Matn', ordering='text__status')
+    def text_status(self, obj):
+        text = getattr(obj, 'text', None)
+        if text is None:
+            return '—'
+        return text.get_status_display() + (f": {text.error}" if text.error else '')
+
+    @admin.action(description="Tanlangan kitoblar matnini qayta ajratish", permissions=['change'])
+    def extract_text(self, request, queryset):
+        book_ids = list(queryset.values_list('pk', flat=True))
+        BookText.objects.filter(book_id__in=book_ids).update(
+            status=BookText.STATUS_PENDING, error=''
+        )
+        for book in queryset.filter(text__isnull=True):
+            sync_book(book)
+        schedule_extraction(book_ids)
+        self.message_user(
+            request,
+            f"{len(book_ids)} ta kitob matn ajratish navbatiga qo‘yildi.",
+            level=messages.SUCCESS,
+        )
 
 
 @admin.register(TeamMember)
@@ -14,3 +50,93 @@ class TeamMemberAdmin(admin.ModelAdmin):
     list_filter = ('position', 'created_at')
     list_editable = ('order',)
     fields = ('name', 'position', 'photo', 'bio', 'telegram', 'instagram', 'gmail', 'order')
+
+
+class StudentImportForm(forms.Form):
+    file = forms.FileField(
+        label="Talabalar CSV fayli",
+        help_text="Ustunlar: username, first_name, last_name, email, password (ixtiyoriy). "
+                  f"Ko‘pi bilan {settings.STUDENT_IMPORT_MAX_ROWS} ta qator; yaratilgan parollar "
+                  "tezkor xeshlanadi va talaba birinchi marta kirganda kuchaytiriladi.",
+    )
+
+
+class _Echo:
+    def write(self, value):
+        return value
+
+
+@admin.register(UserProfile)
+class UserProfileAdmin(admin.ModelAdmin):
+    list_display = ('user', 'date_of_birth')
+    list_select_related = ('user',)
+    search_fields = ('user__username', 'user__first_name', 'user__last_name')
+    raw_id_fields = ('user',)
+    change_list_template = 'admin/mainapp/userprofile/change_list.html'
+
+    def get_urls(self):
+        return [
+            path(
+                'import-students/',
+                self.admin_site.admin_view(self.import_students_view),
+                name='mainapp_userprofile_import_students',
+            ),
+        ] + super().get_urls()
+
+    def import_students_view(self, request):
+        if not request.user.has_perm('auth.add_user'):
+            self.message_user(request, "Foydalanuvchi yaratishga ruxsatingiz yo'q.", level=messages.ERROR)
+            return HttpResponseRedirect(reverse('admin:mainapp_userprofile_changelist'))
+
+        form = StudentImportForm(request.POST or None, request.FILES or None)
+        if request.method == 'POST' and form.is_valid():
+            try:
+                students = read_students(form.cleaned_data['file'])
+            except (UnicodeDecodeError, csv.Error) as exc:
+                form.add_error('file', f"Faylni o‘qishda xatolik: {exc}")
+            else:
+                error = _import_limit_error(students)
+                if error:
+                    form.add_error('file', error)
+            if not form.errors:
+                # Login/parollar yaratilish jarayonida fayl sifatida yuklab olinadi.
+                # So'rov worker timeout'iga sig'ishi uchun yaratilgan parollar
+                # tezkor xeshlanadi (birinchi kirishda kuchaytiriladi).
+                writer = csv.writer(_Echo())
+                rows = provision_students(students, batch_size=DEFAULT_BATCH_SIZE, fast_hash=True)
+                stream = (writer.writerow(row) for row in _with_header(rows))
+                response = StreamingHttpResponse(stream, content_type='text/csv; charset=utf-8')
+                filename = f"talabalar_{timezone.now():%Y%m%d_%H%M}.csv"
+                response['Content-Disposition'] = f'attachment; filename="{filename}"'
+                response['Cache-Control'] = 'no-store'
+                return response
+
+        context = {
+            **self.admin_site.each_context(request),
+            'opts': self.model._meta,
+            'title': "Talabalarni CSV fayldan yaratish",
+            'form': form,
+        }
+        return TemplateResponse(request, 'admin/mainapp/userprofile/import_students.html', context)
+
+
+def _import_limit_error(students) -> str | None:
+    command = "python manage.py provision_students"
+    if len(students) > settings.STUDENT_IMPORT_MAX_ROWS:
+        return (
+            f"Faylda {len(students)} ta qator, admin orqali ko‘pi bilan "
+            f"{settings.STUDENT_IMPORT_MAX_ROWS} ta. Katta fayllar uchun: {command}"
+        )
+    with_password = sum(1 for student in students if student['password'])
+    if with_password > settings.STUDENT_IMPORT_MAX_PASSWORDS:
+        return (
+            f"Faylda {with_password} ta parol berilgan, admin orqali ko‘pi bilan "
+            f"{settings.STUDENT_IMPORT_MAX_PASSWORDS} ta (har biri to‘liq xeshlanadi). "
+            f"Parol ustunini bo‘sh qoldiring yoki: {command}"
+        )
+    return None
+
+
+def _with_header(rows):
+    yield CREDENTIAL_HEADER
+    yield from rows
@@ -0,0 +1,241 @@
+"""
+Kitob fayllari ichidan qidiruv: matn ajratish navbati va FTS5 qidiruvi.
+
+Kitob saqlanganda (signals.py) `BookText` qatori "navbatda" holatiga
+o'tadi va tranzaksiya commit bo'lgach fayl jarayonlar puliga yuboriladi -
+upload javobi ajratishni kutmaydi. Jarayon faqat matnni qaytaradi
+(mainapp/extractors, modelsiz), natija bazaga web jarayonidagi pul oqimida
+yoziladi.
+
+Worker qayta ishga tushsa (max_requests, deploy) navbatdagi vazifalar
+yo'qolishi mumkin: ular bazada "pending" bo'lib qoladi va
+`python manage.py extract_books` bilan qayta ishlanadi.
+
+Qidiruv SQLite'da `mainapp_booktext_fts` (FTS5) bo'yicha, bm25 tartibi
+(sarlavha `TITLE_WEIGHT` marta vaznli); boshqa bazalarda - sarlavha/matn
+bo'yicha icontains. Natijalarga topilgan joydan parcha qo'shiladi.
+"""
+
+from __future__ import annotations
+
+import logging
+import multiprocessing
+import re
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+from django.conf import settings
+from django.db import connections, router, transaction
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.html import escape
+from django.utils.safestring import SafeString, mark_safe
+
+from .extractors import MissingDependency, UnsupportedFormat, extract_text, normalize, supported
+from .models import Book, BookText
+
+logger = logging.getLogger("taalim.booktext")
+
+SEARCH_LIMIT = 50
+SNIPPET_CHARS = 160
+# Parcha uchun so'z matn boshidan shu chegaragacha qidiriladi
+SNIPPET_SCAN_CHARS = 200_000
+TITLE_WEIGHT = 10.0
+MAX_QUERY_TOKENS = 8
+FTS_TABLE = "mainapp_booktext_fts"
+
+_TOKEN_RE = re.compile(r"[\w']+")
+
+_pool: ProcessPoolExecutor | None = None
+_pool_lock = threading.Lock()
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    # Birinchi upload'da yaratiladi - preload qilingan master'da emas, har bir worker'da
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(
+                max_workers=settings.BOOK_EXTRACTION_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _pool
+
+
+def sync_book(book: Book) -> bool:
+    """
+    Kitob saqlanganda `BookText` ni yangilaydi. Fayl yangi bo'lsa matn
+    tozalanib "navbatda" holatiga o'tadi va True qaytadi.
+
+    Sarlavha matn kabi normallashtirilib saqlanadi (o‘/o'/oʻ bir xil) -
+    "qo'llanma" so'rovi "qo‘llanmasi" sarlavhasini topadi.
+    """
+
+    title = normalize(book.title)
+    text, _ = BookText.objects.get_or_create(book=book, defaults={"title": title})
+    changed = []
+    if text.title != title:
+        text.title = title
+        changed.append("title")
+    new_file = text.source != book.file.name
+    if new_file:
+        text.source = book.file.name
+        text.content = ""
+        text.error = ""
+        text.status = BookText.STATUS_PENDING
+        text.extracted_at = None
+        changed += ["source", "content", "error", "status", "extracted_at"]
+    if changed:
+        text.save(update_fields=changed)
+    return new_file
+
+
+def schedule_extraction(book_ids) -> None:
+    """Commit'dan keyin kitoblarni fon pulida ajratishga yuboradi."""
+
+    if not settings.BOOK_EXTRACTION_ASYNC:
+        return
+    book_ids = list(book_ids)
+    transaction.on_commit(lambda: submit(_get_pool(), book_ids))
+
+
+def submit(pool: ProcessPoolExecutor, book_ids) -> list:
+    """
+    Kitoblarni `pool` ga yuboradi; qo'llanmaydigan formatlar darhol
+    belgilanadi. Natija: [(book_id, source, future), ...].
+    """
+
+    storage = Book._meta.get_field("file").storage
+    submitted = []
+    for book_id, source in Book.objects.filter(pk__in=book_ids).values_list("pk", "file"):
+        if not supported(source):
+            _save(book_id, source, "", BookText.STATUS_UNSUPPORTED, "Fayl formatidan matn ajratilmaydi.")
+            continue
+        job = (
+            storage.path(source),
+            settings.BOOK_PDF_EXTRACTOR,
+            settings.BOOK_TEXT_MAX_CHARS,
+        )
+        future = pool.submit(extract_text, job)
+        future.add_done_callback(partial(_finished, book_id, source, threading.get_ident()))
+        submitted.append((book_id, source, future))
+    return submitted
+
+
+def _finished(book_id: int, source: str, submitter: int, future) -> None:
+    try:
+        save_result(book_id, source, future)
+    except Exception:  # noqa: BLE001
+        logger.exception("Kitob #%s matnini saqlab bo'lmadi", book_id)
+    finally:
+        # Pul oqimining o'z ulanishi - so'rov oqimida chaqirilgan bo'lsa tegilmaydi
+        if threading.get_ident() != submitter:
+            connections.close_all()
+
+
+def save_result(book_id: int, source: str, future) -> str:
+    try:
+        content = future.result()
+    except (UnsupportedFormat, MissingDependency) as exc:
+        content, status, error = "", BookText.STATUS_UNSUPPORTED, str(exc)
+    except Exception as exc:  # noqa: BLE001
+        content, status, error = "", BookText.STATUS_FAILED, f"{type(exc).__name__}: {exc}"
+        logger.warning("Kitob #%s dan matn ajratilmadi: %s", book_id, error)
+    else:
+        status, error = BookText.STATUS_DONE, ""
+    _save(book_id, source, content, status, error)
+    return status
+
+
+def _save(book_id: int, source: str, content: str, status: str, error: str) -> None:
+    # Fayl shu orada almashtirilgan bo'lsa eski natija yozilmaydi
+    BookText.objects.filter(book_id=book_id, source=source).update(
+        content=content, status=status, error=error[:255], extracted_at=timezone.now()
+    )
+
+
+def query_tokens(query: str) -> list[str]:
+    tokens = [token.strip("'") for token in _TOKEN_RE.findall(normalize(query).lower())]
+    return [token for token in tokens if token][:MAX_QUERY_TOKENS]
+
+
+def fts_query(tokens: list[str]) -> str:
+    """
+    FTS5 so'rovi: barcha so'zlar (AND), oxirgisi prefiks bo'yicha - "qo'shin"
+    "qo'shinlari"ni ham topadi. Har bir so'z qo'shtirnoqda - FTS5 sintaksisi
+    (NOT, NEAR, *) foydalanuvchi matnidan ishlamaydi.
+    """
+
+    quoted = [f'"{token}"' for token in tokens]
+    if quoted:
+        quoted[-1] += "*"
+    return " ".join(quoted)
+
+
+def snippet(content: str, tokens: list[str]) -> SafeString:
+    """
+    Birinchi topilgan so'z atrofidagi parcha, so'zlar <mark> bilan. FTS5
+    snippet() LIMIT'dan oldin har bir mos hujjat uchun hisoblanadi - shuning
+    uchun faqat chiqariladigan natijalar uchun, shu yerda.
+    """
+
+    pattern = re.compile(
+        r"(?<![\w'])(?:" + "|".join(re.escape(token) + r"[\w']*" for token in tokens) + ")",
+        re.IGNORECASE,
+    )
+    match = pattern.search(content, 0, SNIPPET_SCAN_CHARS)
+    # Oyna xom matndan olinadi, bo'shliqlar faqat uning ichida yig'iladi
+    start = max(0, match.start() - SNIPPET_CHARS) if match else 0
+    window = " ".join(content[start:start + SNIPPET_CHARS * 3].split())
+    if match:
+        found = pattern.search(window)
+        offset = max(0, found.start() - SNIPPET_CHARS // 3) if found else 0
+        if offset:
+            # So'z o'rtasidan boshlanmasin
+            offset = window.find(" ", offset) + 1 or offset
+        start += offset
+        window = window[offset:]
+    prefix = "…" if start else ""
+    suffix = "…" if len(window) > SNIPPET_CHARS or start + SNIPPET_CHARS * 3 < len(content) else ""
+    window = window[:SNIPPET_CHARS]
+
+    parts = []
+    position = 0
+    for found in pattern.finditer(window):
+        parts.append(escape(window[position:found.start()]))
+        parts.append(f"<mark>{escape(found.group())}</mark>")
+        position = found.end()
+    parts.append(escape(window[position:]))
+    return mark_safe(prefix + "".join(str(part) for part in parts) + suffix)
+
+
+def search_books(query: str, limit: int = SEARCH_LIMIT) -> list[tuple[int, SafeString]]:
+    """Kitob sarlavhasi va matni bo'yicha: [(book_id, parcha HTML), ...], eng mosi avval."""
+
+    tokens = query_tokens(query)
+    if not tokens:
+        return []
+    connection = connections[router.db_for_read(BookText)]
+    texts = BookText.objects.using(connection.alias)
+
+    if connection.vendor == "sqlite":
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s "
+                f"ORDER BY bm25({FTS_TABLE}, %s, 1.0) LIMIT %s",
+                [fts_query(tokens), TITLE_WEIGHT, limit],
+            )
+            ranked = [row[0] for row in cursor.fetchall()]
+        rows = {
+            pk: (book_id, content)
+            for pk, book_id, content in texts.filter(pk__in=ranked).values_list("pk", "book_id", "content")
+        }
+        rows = [rows[pk] for pk in ranked if pk in rows]
+    else:
+        needle = " ".join(tokens)
+        rows = list(
+            texts.filter(Q(title__icontains=needle) | Q(content__icontains=needle))
+            .values_list("book_id", "content")[:limit]
+        )
+    return [(book_id, snippet(content, tokens)) for book_id, content in rows]
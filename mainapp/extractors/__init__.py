@@ -0,0 +1,86 @@
+"""
+Kitob fayllaridan matn ajratish (DOCX / PPTX / XLSX / PDF / TXT).
+
+Funksiyalar spawn qilingan jarayonlar pulida ishlaydi (mainapp/booktext.py),
+shuning uchun paket modellarni import qilmaydi va `django.setup()` talab
+qilmaydi. python-docx, lxml va PDF kutubxonasi faqat shu formatdagi fayl
+kelganda import qilinadi - web worker'lar ularni xotiraga olmaydi.
+
+PDF ajratuvchi almashtiriladi: `BOOK_PDF_EXTRACTOR` sozlamasi - fayl
+yo'lini olib matn qaytaradigan funksiyaning to'liq nomi.
+"""
+
+from __future__ import annotations
+
+import os
+import re
+from importlib import import_module
+
+from django.utils.module_loading import import_string
+
+# kengaytma -> (modul, funksiya, o'rnatilmagan bo'lsa xabar)
+FORMATS = {
+    ".docx": ("office", "extract_docx", "DOCX uchun 'python-docx' paketini o‘rnating."),
+    ".pptx": ("office", "extract_pptx", "PPTX uchun 'lxml' paketini o‘rnating."),
+    ".xlsx": ("office", "extract_xlsx", "XLSX uchun 'openpyxl' paketini o‘rnating."),
+    ".txt": ("office", "extract_txt", None),
+}
+PDF_EXTENSION = ".pdf"
+
+_APOSTROPHES_RE = re.compile(r"[‘’ʻʼ`´]")
+_SPACES_RE = re.compile(r"[ \t\r\f\v]+")
+_BLANK_LINES_RE = re.compile(r"\n\s*\n+")
+
+
+class UnsupportedFormat(Exception):
+    pass
+
+
+class MissingDependency(Exception):
+    pass
+
+
+def supported(filename: str) -> bool:
+    extension = os.path.splitext(filename)[1].lower()
+    return extension in FORMATS or extension == PDF_EXTENSION
+
+
+def normalize(text: str) -> str:
+    """
+    Qidiruv indeksi uchun: o‘/o'/oʻ bitta belgiga, ortiqcha bo'shliqlar
+    qisqartiriladi (qidiruv so'rovi ham xuddi shunday normallashtiriladi).
+    """
+
+    text = _APOSTROPHES_RE.sub("'", text)
+    text = _SPACES_RE.sub(" ", text)
+    return _BLANK_LINES_RE.sub("\n\n", text).strip()
+
+
+def _extractor(filename: str, pdf_extractor: str):
+    extension = os.path.splitext(filename)[1].lower()
+    if extension == PDF_EXTENSION:
+        try:
+            return import_string(pdf_extractor)
+        except ImportError as exc:
+            raise MissingDependency(f"PDF ajratuvchi yuklanmadi: {exc}") from exc
+    if extension not in FORMATS:
+        raise UnsupportedFormat(f"{extension or filename} formatidan matn ajratilmaydi.")
+
+    module_name, function, missing = FORMATS[extension]
+    try:
+        module = import_module(f".{module_name}", __name__)
+        return getattr(module, function)
+    except ImportError as exc:
+        if missing is None:
+            raise
+        raise MissingDependency(missing) from exc
+
+
+def extract_text(job: tuple[str, str, int]) -> str:
+    """
+    Pul vazifasi: (fayl yo'li, PDF ajratuvchi nomi, belgilar chegarasi) -> matn.
+    """
+
+    path, pdf_extractor, max_chars = job
+    text = _extractor(path, pdf_extractor)(path)
+    return normalize(text)[:max_chars]
@@ -0,0 +1,81 @@
+"""
+Office fayllar: DOCX (python-docx), PPTX (zip + lxml), XLSX (openpyxl), TXT.
+"""
+
+from __future__ import annotations
+
+import re
+import zipfile
+
+from lxml import etree
+
+DRAWING_NS = "http://schemas.openxmlformats.org/drawingml/2006/main"
+_SLIDE_RE = re.compile(r"^ppt/slides/slide(\d+)\.xml$")
+_NOTES_RE = re.compile(r"^ppt/notesSlides/notesSlide(\d+)\.xml$")
+
+
+def extract_docx(path: str) -> str:
+    from docx import Document
+
+    document = Document(path)
+    parts = [paragraph.text for paragraph in document.paragraphs]
+    for table in document.tables:
+        for row in table.rows:
+            parts.append(" | ".join(cell.text for cell in row.cells))
+    return "\n".join(part for part in parts if part.strip())
+
+
+def _drawing_paragraphs(data: bytes) -> list[str]:
+    # Har bir a:p - slayddagi bitta qator, a:t - uning matn bo'laklari
+    root = etree.fromstring(data)
+    lines = []
+    for paragraph in root.iter(f"{{{DRAWING_NS}}}p"):
+        line = "".join(node.text or "" for node in paragraph.iter(f"{{{DRAWING_NS}}}t"))
+        if line.strip():
+            lines.append(line)
+    return lines
+
+
+def extract_pptx(path: str) -> str:
+    with zipfile.ZipFile(path) as archive:
+        names = archive.namelist()
+        slides = sorted(
+            (int(match.group(1)), name) for name in names if (match := _SLIDE_RE.match(name))
+        )
+        notes = dict(
+            (int(match.group(1)), name) for name in names if (match := _NOTES_RE.match(name))
+        )
+        parts = []
+        for number, name in slides:
+            parts.extend(_drawing_paragraphs(archive.read(name)))
+            if number in notes:
+                parts.extend(_drawing_paragraphs(archive.read(notes[number])))
+            parts.append("")
+    return "\n".join(parts)
+
+
+def extract_xlsx(path: str) -> str:
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(path, read_only=True, data_only=True)
+    try:
+        lines = []
+        for sheet in workbook.worksheets:
+            for row in sheet.iter_rows(values_only=True):
+                cells = [str(value) for value in row if value not in (None, "")]
+                if cells:
+                    lines.append(" | ".join(cells))
+        return "\n".join(lines)
+    finally:
+        workbook.close()
+
+
+def extract_txt(path: str) -> str:
+    with open(path, "rb") as file:
+        data = file.read()
+    for encoding in ("utf-8-sig", "cp1251"):
+        try:
+            return data.decode(encoding)
+        except UnicodeDecodeError:
+            continue
+    return data.decode("latin-1")
@@ -0,0 +1,37 @@
+"""
+Standart PDF ajratuvchi: `pypdf` o'rnatilgan bo'lsa u, aks holda poppler'ning
+`pdftotext` dasturi. Boshqa kutubxona ishlatish uchun `BOOK_PDF_EXTRACTOR`
+sozlamasida `path -> str` funksiyani ko'rsating.
+"""
+
+from __future__ import annotations
+
+import shutil
+import subprocess
+
+from . import MissingDependency
+
+PDFTOTEXT_TIMEOUT = 300
+
+
+def extract_pdf(path: str) -> str:
+    try:
+        from pypdf import PdfReader
+    except ImportError:
+        return _pdftotext(path)
+
+    reader = PdfReader(path)
+    return "\n\n".join(page.extract_text() or "" for page in reader.pages)
+
+
+def _pdftotext(path: str) -> str:
+    executable = shutil.which("pdftotext")
+    if executable is None:
+        raise MissingDependency("PDF uchun 'pypdf' paketini yoki poppler-utils (pdftotext) ni o‘rnating.")
+    result = subprocess.run(
+        [executable, "-enc", "UTF-8", "-q", path, "-"],
+        capture_output=True,
+        check=True,
+        timeout=PDFTOTEXT_TIMEOUT,
+    )
+    return result.stdout.decode("utf-8", errors="replace")
@@ -0,0 +1,29 @@
+"""
+Parol xeshlash jarayonlari uchun funksiyalar (mainapp/provisioning.py).
+
+Modul spawn qilingan jarayonda ilovalar reyestri tayyor bo'lmasdan import
+qilinadi, shuning uchun bu yerda modellar import qilinmaydi.
+"""
+
+from __future__ import annotations
+
+import os
+
+import django
+from django.contrib.auth.hashers import PBKDF2PasswordHasher, make_password
+
+FAST_HASH_ITERATIONS = 2_000
+
+
+def init_worker(settings_module: str) -> None:
+    # make_password PASSWORD_HASHERS sozlamasini o'qiydi
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", settings_module)
+    django.setup(set_prefix=False)
+
+
+def hash_password(job: tuple[str, bool]) -> str:
+    password, fast = job
+    if fast:
+        hasher = PBKDF2PasswordHasher()
+        return hasher.encode(password, hasher.salt(), iterations=FAST_HASH_ITERATIONS)
+    return make_password(password)
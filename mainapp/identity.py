@@ -0,0 +1,39 @@
+"""
+Kirgan foydalanuvchi va uning profilini bitta so'rov bilan yuklash.
+
+`ProfileModelBackend.get_user` (AuthenticationMiddleware'dagi `request.user`
+manbai) User'ni `select_related("userprofile")` bilan oladi: identifikatsiya
+va profil bitta JOIN so'rov. So'rov ichida `request.user` SimpleLazyObject
+sifatida bir marta yuklanadi.
+
+User keshlanmaydi: faolsizlantirish, parol o'zgarishi va staff huquqini
+olish barcha worker'larda keyingi so'rovdan kuchga kirishi kerak.
+"""
+
+from __future__ import annotations
+
+from django.contrib.auth.backends import ModelBackend
+from django.contrib.auth.models import User
+
+
+def user_profile(user):
+    """
+    Foydalanuvchi profili yoki None. Backend orqali yuklangan `request.user`
+    uchun qo'shimcha so'rov bajarilmaydi.
+    """
+
+    if not user.is_authenticated:
+        return None
+    try:
+        return user.userprofile
+    except User.userprofile.RelatedObjectDoesNotExist:
+        return None
+
+
+class ProfileModelBackend(ModelBackend):
+    def get_user(self, user_id):
+        try:
+            user = User._default_manager.select_related("userprofile").get(pk=user_id)
+        except User.DoesNotExist:
+            return None
+        return user if self.user_can_authenticate(user) else None
@@ -0,0 +1,81 @@
+"""
+Kitob fayllaridan matn ajratish va qidiruv indeksiga yozish (mainapp/booktext.py).
+
+    python manage.py extract_books                 # navbatdagi, xato bo'lgan va yangi kitoblar
+    python manage.py extract_books --all           # hammasini qaytadan
+    python manage.py extract_books --workers 8
+    python manage.py extract_books --rebuild-index # FTS5 indeksini BookText'dan qayta qurish
+
+Upload'dan keyingi fon ajratish worker qayta ishga tushganda uzilib qolsa,
+kitob "navbatda" holatida qoladi - buyruqni cron'dan davriy ishga tushirish
+mumkin.
+"""
+
+from __future__ import annotations
+
+import multiprocessing
+import os
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from mainapp.booktext import FTS_TABLE, submit, sync_book
+from mainapp.models import Book, BookText
+
+
+class Command(BaseCommand):
+    help = "Kitob fayllaridan matnni ajratib, kitoblar ichidan qidiruv indeksini to'ldiradi."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--all", action="store_true",
+                            help="Tayyor kitoblarni ham qaytadan ajratish.")
+        parser.add_argument("--workers", type=int, default=None,
+                            help="Jarayonlar soni (standart: CPU yadrolari).")
+        parser.add_argument("--rebuild-index", action="store_true",
+                            help="Faqat FTS5 indeksini BookText jadvalidan qayta qurish.")
+
+    def handle(self, *args, **options):
+        if options["rebuild_index"]:
+            if connection.vendor != "sqlite":
+                self.stdout.write("FTS5 indeksi faqat SQLite'da ishlatiladi.")
+                return
+            with connection.cursor() as cursor:
+                cursor.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')")
+            self.stdout.write(self.style.SUCCESS("Qidiruv indeksi qayta qurildi."))
+            return
+
+        # Matn qatori yo'q kitoblar (migratsiyadan oldin yuklanganlar)
+        for book in Book.objects.filter(text__isnull=True).iterator():
+            sync_book(book)
+
+        texts = BookText.objects.all()
+        if not options["all"]:
+            texts = texts.filter(status__in=[BookText.STATUS_PENDING, BookText.STATUS_FAILED])
+        book_ids = list(texts.values_list("book_id", flat=True))
+        if not book_ids:
+            self.stdout.write("Ajratiladigan kitob yo'q.")
+            return
+
+        started = time.perf_counter()
+        workers = options["workers"] or os.cpu_count() or 1
+        with ProcessPoolExecutor(
+            max_workers=workers, mp_context=multiprocessing.get_context("spawn")
+        ) as pool:
+            submit(pool, book_ids)
+        # Natijalar pul oqimida yozilgan - holatlar bazadan
+        statuses = Counter(
+            BookText.objects.filter(book_id__in=book_ids).values_list("status", flat=True)
+        )
+        summary = ", ".join(f"{status}: {count}" for status, count in sorted(statuses.items()))
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{len(book_ids)} ta kitob, {time.perf_counter() - started:.1f} s ({summary})."
+            )
+        )
+        for book_id, error in BookText.objects.filter(
+            book_id__in=book_ids, status=BookText.STATUS_FAILED
+        ).values_list("book_id", "error"):
+            self.stderr.write(f"  #{book_id}: {error}")
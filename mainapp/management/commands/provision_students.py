@@ -0,0 +1,60 @@
+"""
+Talabalar hisoblarini CSV fayldan ommaviy yaratish.
+
+    python manage.py provision_students talabalar.csv --output loginlar.csv
+    python manage.py provision_students talabalar.csv --workers 8 --fast-hash
+
+Kiruvchi fayl formati va parollarni xeshlash - mainapp/provisioning.py.
+Login/parollar `--output` faylga (yoki stdout'ga) CSV ko'rinishida yoziladi.
+"""
+
+from __future__ import annotations
+
+import csv
+import sys
+import time
+from collections import Counter
+
+from django.core.management.base import BaseCommand, CommandError
+
+from mainapp.provisioning import CREDENTIAL_HEADER, DEFAULT_BATCH_SIZE, provision_students, read_students
+
+
+class Command(BaseCommand):
+    help = "CSV fayldagi talabalar uchun User va UserProfile yaratadi, login/parollarni chiqaradi."
+
+    def add_arguments(self, parser):
+        parser.add_argument("csv_file")
+        parser.add_argument("--output", help="Login/parollar yoziladigan CSV (standart: stdout).")
+        parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+        parser.add_argument("--workers", type=int, help="Xeshlash jarayonlari soni (standart: yadrolar soni).")
+        parser.add_argument("--fast-hash", action="store_true",
+                            help="Yaratilgan parollar uchun kamroq iteratsiya; birinchi kirishda yangilanadi.")
+
+    def handle(self, *args, **options):
+        try:
+            with open(options["csv_file"], encoding="utf-8-sig", newline="") as handle:
+                students = read_students(handle)
+        except OSError as exc:
+            raise CommandError(f"Faylni o'qib bo'lmadi: {exc}") from exc
+
+        output = open(options["output"], "w", encoding="utf-8", newline="") if options["output"] else sys.stdout
+        started = time.perf_counter()
+        statuses = Counter()
+        try:
+            writer = csv.writer(output)
+            writer.writerow(CREDENTIAL_HEADER)
+            for row in provision_students(
+                students,
+                batch_size=options["batch_size"],
+                workers=options["workers"],
+                fast_hash=options["fast_hash"],
+            ):
+                writer.writerow(row)
+                statuses[row[-1]] += 1
+        finally:
+            if output is not sys.stdout:
+                output.close()
+
+        summary = ", ".join(f"{status}: {count}" for status, count in statuses.items())
+        self.stderr.write(f"{len(students)} ta qator, {summary} - {time.perf_counter() - started:.1f}s")
@@ -0,0 +1,82 @@
+# Generated by Django 5.2.9 on 2026-10-19 05:12
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+# Kitob matni bo'yicha to'liq matnli qidiruv (faqat SQLite, FTS5). Indeks
+# mainapp_booktext ustidagi "external content" jadval: matn ikki marta
+# saqlanmaydi, trigger'lar har bir INSERT/UPDATE/DELETE'da indeksni yangilaydi.
+# Apostrof so'z ichidagi belgi: o'zbek, qo'llanma - bitta token.
+FTS_SQL = (
+    """
+    CREATE VIRTUAL TABLE mainapp_booktext_fts USING fts5(
+        title, content,
+        content='mainapp_booktext', content_rowid='id',
+        tokenize="unicode61 remove_diacritics 2 tokenchars ''''"
+    )
+    """,
+    """
+    CREATE TRIGGER mainapp_booktext_fts_ai AFTER INSERT ON mainapp_booktext BEGIN
+        INSERT INTO mainapp_booktext_fts(rowid, title, content)
+        VALUES (new.id, new.title, new.content);
+    END
+    """,
+    """
+    CREATE TRIGGER mainapp_booktext_fts_ad AFTER DELETE ON mainapp_booktext BEGIN
+        INSERT INTO mainapp_booktext_fts(mainapp_booktext_fts, rowid, title, content)
+        VALUES ('delete', old.id, old.title, old.content);
+    END
+    """,
+    """
+    CREATE TRIGGER mainapp_booktext_fts_au AFTER UPDATE OF title, content ON mainapp_booktext BEGIN
+        INSERT INTO mainapp_booktext_fts(mainapp_booktext_fts, rowid, title, content)
+        VALUES ('delete', old.id, old.title, old.content);
+        INSERT INTO mainapp_booktext_fts(rowid, title, content)
+        VALUES (new.id, new.title, new.content);
+    END
+    """,
+)
+DROP_FTS_SQL = (
+    "DROP TRIGGER IF EXISTS mainapp_booktext_fts_au",
+    "DROP TRIGGER IF EXISTS mainapp_booktext_fts_ad",
+    "DROP TRIGGER IF EXISTS mainapp_booktext_fts_ai",
+    "DROP TABLE IF EXISTS mainapp_booktext_fts",
+)
+
+
+def _run(statements):
+    def run(apps, schema_editor):
+        # Boshqa bazalarda qidiruv BookText.content bo'yicha oddiy filtr bilan
+        if schema_editor.connection.vendor != 'sqlite':
+            return
+        for statement in statements:
+            schema_editor.execute(statement)
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('mainapp', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BookText',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('title', models.CharField(max_length=200)),
+                ('content', models.TextField(blank=True)),
+                ('source', models.CharField(blank=True, max_length=255)),
+                ('status', models.CharField(choices=[('pending', 'Navbatda'), ('done', 'Tayyor'), ('failed', 'Xato'), ('unsupported', 'Qo‘llanmaydi')], db_index=True, default='pending', max_length=16)),
+                ('error', models.CharField(blank=True, max_length=255)),
+                ('extracted_at', models.DateTimeField(blank=True, null=True)),
+                ('book', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='text', to='mainapp.book')),
+            ],
+            options={
+                'verbose_name': 'Kitob matni',
+                'verbose_name_plural': 'Kitob matnlari',
+            },
+        ),
+        migrations.RunPython(_run(FTS_SQL), _run(DROP_FTS_SQL)),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 5.2.9 on 2026-10-19 05:52
+
+from django.db import migrations
+
+from mainapp.extractors import normalize
+
+
+def normalize_titles(apps, schema_editor):
+    # sync_book endi sarlavhani normallashtirib saqlaydi - mavjud qatorlar
+    # ham shunday bo'lsin (FTS trigger'i indeksni yangilaydi)
+    BookText = apps.get_model('mainapp', 'BookText')
+    for text in BookText.objects.only('pk', 'title').iterator():
+        title = normalize(text.title)
+        if title != text.title:
+            BookText.objects.filter(pk=text.pk).update(title=title)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('mainapp', '0002_booktext'),
+    ]
+
+    operations = [
+        migrations.RunPython(normalize_titles, migrations.RunPython.noop),
+    ]
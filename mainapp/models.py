@@ -39,4 +39,39 @@ class TeamMember(models.Model):
         ordering = ['order', 'name']
 
     def __str__(self):
-        return f"{self.name} - {self.position}"
\ No newline at end of file
+        return f"{self.name} - {self.position}"
+
+class BookText(models.Model):
+    """
+    Kitob faylidan ajratilgan matn (mainapp/booktext.py). SQLite'da
+    `mainapp_booktext_fts` FTS5 jadvali shu jadval ustida trigger'lar bilan
+    yangilanadi (0002_booktext migratsiyasi).
+    """
+
+    STATUS_PENDING = 'pending'
+    STATUS_DONE = 'done'
+    STATUS_FAILED = 'failed'
+    STATUS_UNSUPPORTED = 'unsupported'
+    STATUS_CHOICES = (
+        (STATUS_PENDING, 'Navbatda'),
+        (STATUS_DONE, 'Tayyor'),
+        (STATUS_FAILED, 'Xato'),
+        (STATUS_UNSUPPORTED, 'Qo‘llanmaydi'),
+    )
+
+    book = models.OneToOneField(Book, on_delete=models.CASCADE, related_name='text')
+    # Qidiruvda sarlavha ham vaznli ustun sifatida ishlatiladi
+    title = models.CharField(max_length=200)
+    content = models.TextField(blank=True)
+    # Matn qaysi fayldan olingani - fayl almashtirilsa qayta ajratiladi
+    source = models.CharField(max_length=255, blank=True)
+    status = models.CharField(max_length=16, choices=STATUS_CHOICES, default=STATUS_PENDING, db_index=True)
+    error = models.CharField(max_length=255, blank=True)
+    extracted_at = models.DateTimeField(blank=True, null=True)
+
+    class Meta:
+        verbose_name = 'Kitob matni'
+        verbose_name_plural = 'Kitob matnlari'
+
+    def __str__(self):
+        return f"{self.title} ({self.get_status_display()})"
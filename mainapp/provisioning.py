@@ -0,0 +1,186 @@
+"""
+Talabalar hisoblarini CSV fayldan ommaviy yaratish.
+
+Kiruvchi CSV ustunlari (birinchi qator sarlavha):
+
+    username,first_name,last_name,email,password
+
+Faqat `username` majburiy. `password` bo'sh bo'lsa tasodifiy parol
+yaratiladi. Natija - har bir qator uchun login/parol va holat
+(`CREDENTIAL_HEADER`), u yaratilish jarayonida oqim bilan qaytariladi.
+
+Parol xeshlash (PBKDF2, har biri ~0.5 soniya) jarayonlar pulida bajariladi,
+`User` va `UserProfile` qatorlari esa `bulk_create` bilan partiyalab
+yoziladi. Xeshlar tartib bilan keladi: birinchi partiya xeshlanishi bilan
+bazaga yoziladi, qolganlari esa fonda xeshlanishda davom etadi.
+
+`fast_hash=True` faqat tasodifiy yaratilgan parollar uchun kamroq
+iteratsiyali PBKDF2 ishlatadi (10 belgili parol - ~57 bit entropiya, uni
+terib topish baribir amalda imkonsiz). Talaba birinchi marta kirganda
+Django xeshni avtomatik ravishda standart iteratsiyalar soniga yangilaydi
+(`PBKDF2PasswordHasher.must_update`). CSV'da berilgan parollar
+`AUTH_PASSWORD_VALIDATORS` bilan tekshiriladi va har doim to'liq xeshlanadi.
+"""
+
+from __future__ import annotations
+
+import csv
+import io
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+from django.contrib.auth.models import User
+from django.contrib.auth.password_validation import validate_password
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.utils.crypto import get_random_string
+
+from .hashing import hash_password, init_worker
+from .models import UserProfile
+
+STUDENT_FIELDS = ("username", "first_name", "last_name", "email", "password")
+CREDENTIAL_HEADER = ["username", "password", "first_name", "last_name", "email", "status"]
+
+STATUS_CREATED = "yaratildi"
+STATUS_EXISTS = "mavjud"
+
+PASSWORD_LENGTH = 10
+# Chalkashadigan belgilarsiz (0/O, 1/l/I) - parol qog'ozda tarqatiladi
+PASSWORD_CHARS = "abcdefghjkmnpqrstuvwxyzABCDEFGHJKMNPQRSTUVWXYZ23456789"
+DEFAULT_BATCH_SIZE = 500
+
+
+def generate_password() -> str:
+    return get_random_string(PASSWORD_LENGTH, PASSWORD_CHARS)
+
+
+def read_students(file) -> list[dict]:
+    """
+    CSV (matn yoki bayt oqimi) -> talabalar ro'yxati; `username` bo'sh
+    qatorlar o'tkazib yuboriladi.
+    """
+
+    if isinstance(file.read(0), bytes):
+        file = io.TextIOWrapper(file, encoding="utf-8-sig")
+    students = []
+    for row in csv.DictReader(file):
+        student = {field: (row.get(field) or "").strip() for field in STUDENT_FIELDS}
+        if student["username"]:
+            students.append(student)
+    return students
+
+
+def _validate(student: dict, seen: set[str]) -> str | None:
+    username = student["username"]
+    if username in seen:
+        return "xato: fayl ichida takrorlangan"
+    try:
+        User.username_validator(username)
+    except ValidationError as exc:
+        return "xato: " + " ".join(exc.messages)
+    if len(username) > User._meta.get_field("username").max_length:
+        return "xato: username juda uzun"
+    if student["password"]:
+        user = User(
+            username=username,
+            first_name=student["first_name"],
+            last_name=student["last_name"],
+            email=student["email"],
+        )
+        try:
+            validate_password(student["password"], user)
+        except ValidationError as exc:
+            return "xato: " + " ".join(exc.messages)
+    return None
+
+
+def _credential_row(student: dict, password: str, status: str) -> list[str]:
+    return [
+        student["username"],
+        password,
+        student["first_name"],
+        student["last_name"],
+        student["email"],
+        status,
+    ]
+
+
+def _insert_batch(batch: list[tuple[dict, str]]) -> None:
+    users = [
+        User(
+            username=student["username"],
+            first_name=student["first_name"],
+            last_name=student["last_name"],
+            email=student["email"],
+            password=encoded,
+        )
+        for student, encoded in batch
+    ]
+    with transaction.atomic():
+        User.objects.bulk_create(users)
+        if any(user.pk is None for user in users):
+            # RETURNING'ni qo'llamaydigan bazalar uchun
+            ids = dict(
+                User.objects.filter(username__in=[user.username for user in users])
+                .values_list("username", "id")
+            )
+            for user in users:
+                user.pk = ids[user.username]
+        UserProfile.objects.bulk_create(UserProfile(user_id=user.pk) for user in users)
+
+
+def provision_students(
+    students: list[dict],
+    *,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    workers: int | None = None,
+    fast_hash: bool = False,
+):
+    """
+    Talabalarni yaratadi va har bir kiruvchi qator uchun
+    `CREDENTIAL_HEADER` tartibidagi ro'yxatni yield qiladi.
+    Mavjud username'lar o'zgartirilmaydi ("mavjud" holati bilan qaytadi).
+    """
+
+    existing = set()
+    usernames = [student["username"] for student in students]
+    for offset in range(0, len(usernames), batch_size):
+        existing.update(
+            User.objects.filter(username__in=usernames[offset:offset + batch_size])
+            .values_list("username", flat=True)
+        )
+
+    seen: set[str] = set()
+    pending = []
+    for student in students:
+        error = _validate(student, seen)
+        seen.add(student["username"])
+        if error is not None:
+            yield _credential_row(student, "", error)
+        elif student["username"] in existing:
+            yield _credential_row(student, "", STATUS_EXISTS)
+        else:
+            generated = not student["password"]
+            password = generate_password() if generated else student["password"]
+            pending.append((student, password, fast_hash and generated))
+
+    if not pending:
+        return
+
+    workers = workers or os.cpu_count() or 1
+    jobs = [(password, fast) for _, password, fast in pending]
+    # spawn: web worker'dagi oqimlar va ochiq ulanishlar fork bilan meros qolmasin
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=init_worker,
+        initargs=(os.environ.get("DJANGO_SETTINGS_MODULE", "taalim.settings"),),
+    ) as pool:
+        hashes = pool.map(hash_password, jobs, chunksize=max(1, min(64, len(jobs) // (workers * 4))))
+        entries = iter(zip(pending, hashes))
+        while batch := list(islice(entries, batch_size)):
+            _insert_batch([(student, encoded) for (student, _, _), encoded in batch])
+            for (student, password, _), _ in batch:
+                yield _credential_row(student, password, STATUS_CREATED)
@@ -0,0 +1,18 @@
+"""
+Kitob saqlanganda uning matnini ajratish navbatiga qo'yish (mainapp/booktext.py).
+"""
+
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from .booktext import schedule_extraction, sync_book
+from .models import Book
+
+
+@receiver(post_save, sender=Book)
+def book_saved(sender, instance: Book, raw=False, **kwargs):
+    if raw:
+        return
+    # Fayl o'zgargan bo'lsa - fon pulida, commit'dan keyin
+    if sync_book(instance):
+        schedule_extraction([instance.pk])
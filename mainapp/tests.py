@@ -1,3 +1,104 @@
-from django.test import TestCase
+import asyncio
+from types import SimpleNamespace
+from unittest import mock
 
-# Create your tests here.
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, override_settings
+
+from taalim.routers import (
+    PIN_COOKIE_NAME,
+    REPLICA_DB_ALIAS,
+    PrimaryPinningMiddleware,
+    PrimaryReplicaRouter,
+    _read_from_replica,
+)
+from .models import Book
+
+# Ulanish ochilmaydi: router faqat DATABASES'da "replica" borligini tekshiradi
+WITH_REPLICA = {REPLICA_DB_ALIAS: {**settings.DATABASES[DEFAULT_DB_ALIAS]}}
+
+
+class PrimaryReplicaRouterTests(SimpleTestCase):
+    router = PrimaryReplicaRouter()
+
+    def read_db(self, use_replica: bool) -> str:
+        token = _read_from_replica.set(use_replica)
+        try:
+            return self.router.db_for_read(Book)
+        finally:
+            _read_from_replica.reset(token)
+
+    def test_reads_go_to_primary_without_replica(self):
+        self.assertEqual(self.read_db(True), DEFAULT_DB_ALIAS)
+
+    @mock.patch.dict(settings.DATABASES, WITH_REPLICA)
+    def test_safe_request_reads_from_replica(self):
+        self.assertEqual(self.read_db(True), REPLICA_DB_ALIAS)
+        self.assertEqual(self.read_db(False), DEFAULT_DB_ALIAS)
+
+    @mock.patch.dict(settings.DATABASES, WITH_REPLICA)
+    def test_reads_inside_transaction_stay_on_primary(self):
+        with mock.patch.object(connections[DEFAULT_DB_ALIAS], "in_atomic_block", True):
+            self.assertEqual(self.read_db(True), DEFAULT_DB_ALIAS)
+
+    @mock.patch.dict(settings.DATABASES, WITH_REPLICA)
+    def test_writes_and_migrations_use_primary(self):
+        self.assertEqual(self.router.db_for_write(Book), DEFAULT_DB_ALIAS)
+        self.assertTrue(self.router.allow_migrate(DEFAULT_DB_ALIAS, "mainapp"))
+        self.assertFalse(self.router.allow_migrate(REPLICA_DB_ALIAS, "mainapp"))
+
+
+@override_settings(DB_PRIMARY_PIN_SECONDS=10)
+@mock.patch.dict(settings.DATABASES, WITH_REPLICA)
+class PrimaryPinningMiddlewareTests(SimpleTestCase):
+    factory = RequestFactory()
+
+    def run_request(self, request, session_modified=False):
+        seen = {}
+
+        def view(request):
+            request.session = SimpleNamespace(modified=session_modified)
+            seen["db"] = PrimaryReplicaRouter().db_for_read(Book)
+            return HttpResponse()
+
+        response = PrimaryPinningMiddleware(view)(request)
+        return seen["db"], response
+
+    def test_get_reads_from_replica_without_pinning(self):
+        db, response = self.run_request(self.factory.get("/kitoblar/"))
+        self.assertEqual(db, REPLICA_DB_ALIAS)
+        self.assertNotIn(PIN_COOKIE_NAME, response.cookies)
+
+    def test_post_pins_the_session_to_primary(self):
+        db, response = self.run_request(self.factory.post("/testlar/1/start/"))
+        self.assertEqual(db, DEFAULT_DB_ALIAS)
+        cookie = response.cookies[PIN_COOKIE_NAME]
+        self.assertEqual(cookie["max-age"], 10)
+        self.assertTrue(cookie["httponly"])
+
+    def test_pinned_get_reads_from_primary(self):
+        request = self.factory.get("/results/1/")
+        request.COOKIES[PIN_COOKIE_NAME] = "1"
+        db, _ = self.run_request(request)
+        self.assertEqual(db, DEFAULT_DB_ALIAS)
+
+    def test_get_that_writes_the_session_pins(self):
+        _, response = self.run_request(self.factory.get("/testlar/"), session_modified=True)
+        self.assertIn(PIN_COOKIE_NAME, response.cookies)
+
+    def test_no_cookie_without_replica(self):
+        with mock.patch.dict(settings.DATABASES):
+            del settings.DATABASES[REPLICA_DB_ALIAS]
+            _, response = self.run_request(self.factory.post("/testlar/1/start/"))
+        self.assertNotIn(PIN_COOKIE_NAME, response.cookies)
+
+    def test_async_middleware(self):
+        async def view(request):
+            return HttpResponse(PrimaryReplicaRouter().db_for_read(Book))
+
+        response = asyncio.run(PrimaryPinningMiddleware(view)(self.factory.get("/kitoblar/")))
+        self.assertEqual(response.content.decode(), REPLICA_DB_ALIAS)
+        # So'rovdan keyin holat tiklanadi
+        self.assertFalse(_read_from_replica.get())
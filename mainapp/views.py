@@ -14,6 +14,11 @@ from .forms import LoginForm, UserRegistrationForm, UserProfileEditForm, Profile
 from django.http import HttpResponse
 from django.contrib.auth import login,authenticate
 
+from django.db.models import Q
+
+from .booktext import search_books
+from .extractors import normalize
+from .identity import user_profile
 from .models import UserProfile
 
 
@@ -24,9 +29,24 @@ def index(request):
 
 # Book List page
 def book_list(request):
-    query = request.GET.get('q')
+    query = (request.GET.get('q') or '').strip()
     if query:
-        books = Book.objects.filter(title__icontains=query)
+        # Kitob ichidagi matn bo'yicha (FTS5), eng mosi avval; matni hali
+        # ajratilmagan kitoblar sarlavha bo'yicha oxirida
+        hits = search_books(query)
+        found = Book.objects.in_bulk([book_id for book_id, _ in hits])
+        books = []
+        for book_id, snippet in hits:
+            if book_id in found:
+                book = found[book_id]
+                book.snippet = snippet
+                books.append(book)
+        # BookText.title normallashtirilgan (o‘/o'/oʻ bir xil) - so'rov ham
+        books += (
+            Book.objects.filter(Q(text__title__icontains=normalize(query)) | Q(title__icontains=query))
+            .exclude(pk__in=list(found))
+            .order_by('-uploaded_at')
+        )
     else:
         books = Book.objects.all().order_by('-uploaded_at')
     return render(request, 'mainapp/books.html', {'books': books, 'query': query})
@@ -34,7 +54,8 @@ def book_list(request):
 
 def profile_page_view(request):
     user = request.user
-    profile = UserProfile.objects.filter(user=user).first()
+    # Profil request.user bilan birga yuklangan - alohida so'rov yo'q
+    profile = user_profile(user)
     # print("prolife",profile)
     context = {
         'user':user,
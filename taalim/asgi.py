@@ -5,6 +5,9 @@ It exposes the ASGI callable as a module-level variable named ``application``.
 
 For more information on this file, see
 https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
+
+ASGI profili (async view'lar, CONN_MAX_AGE=0) shu modul orqali yoqiladi.
+Ishga tushirish: gunicorn -c deploy/gunicorn_asgi.conf.py taalim.asgi:application
 """
 
 import os
@@ -12,5 +15,11 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'taalim.settings')
+os.environ.setdefault('ASGI', 'True')
 
 application = get_asgi_application()
+
+# Shablonlar, URL'lar va katalog keshi birinchi so'rovdan oldin yuklanadi
+from taalim.warmup import warmup_on_boot  # noqa: E402
+
+warmup_on_boot()
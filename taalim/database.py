@@ -0,0 +1,141 @@
+"""
+Ma'lumotlar bazasi ulanish sozlamalari.
+
+`DATABASES["default"]` shu yerda .env (python-decouple) orqali yig'iladi:
+
+  DB_ENGINE            sqlite (standart) yoki postgres
+  DB_NAME              SQLite fayl yo'li yoki Postgres baza nomi
+  DB_USER / DB_PASSWORD / DB_HOST / DB_PORT   faqat Postgres uchun
+  DB_CONN_MAX_AGE      doimiy ulanish umri, soniyada (standart 60)
+  DB_POOL              Postgres uchun psycopg pool (True/False)
+  DB_POOL_MIN_SIZE / DB_POOL_MAX_SIZE
+  SQLITE_BUSY_TIMEOUT  "database is locked" o'rniga kutish, soniyada
+  SQLITE_MMAP_SIZE     PRAGMA mmap_size, baytda
+  SQLITE_CACHE_SIZE    PRAGMA cache_size, KiB da
+
+O'qish ulanishi (`DATABASES["replica"]`, taalim/routers.py):
+
+  DB_READ_REPLICA      True bo'lsa GET so'rovlardagi o'qishlar replica'ga
+  DB_REPLICA_HOST / DB_REPLICA_PORT / DB_REPLICA_NAME   Postgres replica
+                       (berilmaganlari primary'dan olinadi)
+  DB_PRIMARY_PIN_SECONDS  yozuvdan keyin sessiya primary'da qoladigan vaqt
+
+SQLite'da replica - o'sha faylga `mode=ro` bilan ochilgan alohida ulanish.
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+from decouple import config
+
+SQLITE_ENGINE = "django.db.backends.sqlite3"
+POSTGRES_ENGINE = "django.db.backends.postgresql"
+
+
+def sqlite_pragmas() -> list[str]:
+    """
+    Har bir yangi SQLite ulanishida bajariladigan PRAGMA buyruqlari.
+
+    WAL rejimi o'quvchilarni yozuvchidan ajratadi, synchronous=NORMAL esa
+    WAL bilan xavfsiz va har bir commit'dagi fsync'ni kamaytiradi.
+    """
+
+    busy_timeout = config("SQLITE_BUSY_TIMEOUT", default=20, cast=int)
+    mmap_size = config("SQLITE_MMAP_SIZE", default=128 * 1024 * 1024, cast=int)
+    cache_size = config("SQLITE_CACHE_SIZE", default=32 * 1024, cast=int)
+    return [
+        "PRAGMA journal_mode=WAL",
+        "PRAGMA synchronous=NORMAL",
+        f"PRAGMA busy_timeout={busy_timeout * 1000}",
+        f"PRAGMA mmap_size={mmap_size}",
+        # Manfiy qiymat - KiB hisobida
+        f"PRAGMA cache_size=-{cache_size}",
+        "PRAGMA temp_store=MEMORY",
+    ]
+
+
+def sqlite_readonly_pragmas() -> list[str]:
+    # journal_mode va synchronous faqat yozuvchi ulanishda o'rnatiladi
+    return [
+        pragma
+        for pragma in sqlite_pragmas()
+        if not pragma.startswith(("PRAGMA journal_mode", "PRAGMA synchronous"))
+    ]
+
+
+def sqlite_config(base_dir: Path) -> dict:
+    return {
+        "ENGINE": SQLITE_ENGINE,
+        "NAME": config("DB_NAME", default=str(base_dir / "db.sqlite3")),
+        "CONN_MAX_AGE": config("DB_CONN_MAX_AGE", default=60, cast=int),
+        "CONN_HEALTH_CHECKS": True,
+        "OPTIONS": {
+            "timeout": config("SQLITE_BUSY_TIMEOUT", default=20, cast=int),
+            # Yozuvchi tranzaksiyalar boshidanoq RESERVED lock oladi,
+            # shunda o'rtada "database is locked" bilan yiqilmaydi.
+            "transaction_mode": "IMMEDIATE",
+            "init_command": "; ".join(sqlite_pragmas()),
+        },
+    }
+
+
+def postgres_config() -> dict:
+    use_pool = config("DB_POOL", default=True, cast=bool)
+    options: dict = {}
+    if use_pool:
+        options["pool"] = {
+            "min_size": config("DB_POOL_MIN_SIZE", default=2, cast=int),
+            "max_size": config("DB_POOL_MAX_SIZE", default=20, cast=int),
+        }
+    return {
+        "ENGINE": POSTGRES_ENGINE,
+        "NAME": config("DB_NAME", default="taalim"),
+        "USER": config("DB_USER", default="postgres"),
+        "PASSWORD": config("DB_PASSWORD", default=""),
+        "HOST": config("DB_HOST", default="localhost"),
+        "PORT": config("DB_PORT", default="5432"),
+        # Pool bilan doimiy ulanish (CONN_MAX_AGE) birga ishlatilmaydi
+        "CONN_MAX_AGE": 0 if use_pool else config("DB_CONN_MAX_AGE", default=60, cast=int),
+        "CONN_HEALTH_CHECKS": not use_pool,
+        "OPTIONS": options,
+    }
+
+
+def database_config(base_dir: Path) -> dict:
+    """
+    `DB_ENGINE` bo'yicha `DATABASES["default"]` lug'atini qaytaradi.
+    """
+
+    engine = config("DB_ENGINE", default="sqlite").lower()
+    if engine in {"postgres", "postgresql", POSTGRES_ENGINE}:
+        return postgres_config()
+    return sqlite_config(base_dir)
+
+
+def replica_config(primary: dict) -> dict | None:
+    """
+    `DB_READ_REPLICA=True` bo'lsa o'qish ulanishi sozlamalari, aks holda None.
+
+    Testlarda replica primary'ni aks ettiradi (TEST MIRROR) - alohida test
+    bazasi yaratilmaydi.
+    """
+
+    if not config("DB_READ_REPLICA", default=False, cast=bool):
+        return None
+
+    replica = {**primary, "OPTIONS": dict(primary["OPTIONS"]), "TEST": {"MIRROR": "default"}}
+    if primary["ENGINE"] == SQLITE_ENGINE:
+        path = Path(primary["NAME"]).resolve()
+        replica["NAME"] = f"file:{path.as_posix()}?mode=ro"
+        replica["OPTIONS"]["uri"] = True
+        # Faqat o'quvchi ulanish RESERVED lock ololmaydi - BEGIN odatdagidek (DEFERRED)
+        replica["OPTIONS"].pop("transaction_mode", None)
+        replica["OPTIONS"]["init_command"] = "; ".join(sqlite_readonly_pragmas())
+    else:
+        replica["HOST"] = config("DB_REPLICA_HOST", default=primary["HOST"])
+        replica["PORT"] = config("DB_REPLICA_PORT", default=primary["PORT"])
+        replica["NAME"] = config("DB_REPLICA_NAME", default=primary["NAME"])
+        if replica["OPTIONS"].get("pool"):
+            replica["OPTIONS"]["pool"] = dict(replica["OPTIONS"]["pool"])
+    return replica
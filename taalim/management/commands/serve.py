@@ -0,0 +1,68 @@
+"""
+Production server'ni loyiha sozlamalari bilan ishga tushirish.
+
+    python manage.py serve                      # WSGI, deploy/gunicorn.conf.py
+    python manage.py serve --asgi               # ASGI, deploy/gunicorn_asgi.conf.py
+    python manage.py serve --workers 9 --bind 0.0.0.0:8080
+    python manage.py serve -- --log-level debug # qolgan argumentlar gunicorn'ga
+
+Buyruq joriy jarayonni gunicorn bilan almashtiradi (exec): PID o'zgarmaydi,
+shuning uchun systemd/supervisor signallari (HUP, USR2, TERM) to'g'ridan-to'g'ri
+gunicorn master'ga boradi. Worker soni, preload va max_requests sozlamalari
+konfiguratsiya faylida, muhit o'zgaruvchilaridan o'qiladi.
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+from importlib.util import find_spec
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+PROFILES = {
+    False: ("gunicorn.conf.py", "taalim.wsgi:application"),
+    True: ("gunicorn_asgi.conf.py", "taalim.asgi:application"),
+}
+
+
+class Command(BaseCommand):
+    help = "gunicorn'ni preload va fork qilingan worker'lar bilan ishga tushiradi."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--asgi", action="store_true", default=settings.ASGI,
+                            help="ASGI profili (uvicorn worker'lari). Standart: ASGI sozlamasi.")
+        parser.add_argument("--bind", help="Manzil, masalan 0.0.0.0:8000 (BIND).")
+        parser.add_argument("--workers", type=int, help="Worker soni (WEB_CONCURRENCY).")
+        parser.add_argument("--no-preload", action="store_true",
+                            help="Har bir worker ilovani o'zi yuklasin (PRELOAD=False).")
+        parser.add_argument("gunicorn_args", nargs="*", help="gunicorn'ga uzatiladigan qo'shimcha argumentlar.")
+
+    def handle(self, *args, **options):
+        if find_spec("gunicorn") is None:
+            raise CommandError("Server uchun avval 'gunicorn' paketini o‘rnating.")
+        if options["asgi"] and find_spec("uvicorn") is None:
+            raise CommandError("ASGI profili uchun avval 'uvicorn' paketini o‘rnating.")
+
+        config_name, app = PROFILES[options["asgi"]]
+        env = dict(os.environ)
+        if options["bind"]:
+            env["BIND"] = options["bind"]
+        if options["workers"]:
+            env["WEB_CONCURRENCY"] = str(options["workers"])
+        if options["no_preload"]:
+            env["PRELOAD"] = "False"
+        if options["asgi"]:
+            env["ASGI"] = "True"
+
+        argv = [
+            sys.executable, "-m", "gunicorn",
+            "--chdir", str(settings.BASE_DIR),
+            "-c", str(settings.BASE_DIR / "deploy" / config_name),
+            *options["gunicorn_args"],
+            app,
+        ]
+        self.stdout.write(" ".join(argv[1:]))
+        self.stdout.flush()
+        os.execve(sys.executable, argv, env)
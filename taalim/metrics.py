@@ -0,0 +1,269 @@
+"""
+So'rovlar bo'yicha SQL va vaqt o'lchovlari.
+
+`RequestMetricsMiddleware` har bir so'rov uchun quyidagilarni yozib boradi:
+  - SQL so'rovlar soni va ularning umumiy vaqti
+  - template render vaqti
+  - qolgan Python vaqti (umumiy - SQL - template)
+
+Ko'rsatkichlar URL nomi bo'yicha jamlanadi (har bir jarayonda alohida):
+so'nggi `METRICS_RING_SIZE` ta so'rov kechikishi (p50/p95/p99 uchun) va
+Prometheus uslubidagi gistogramma. Natijalar:
+  - /admin/metrics/  - faqat staff uchun jadval
+  - /metrics/        - Prometheus matni (staff yoki `Authorization: Bearer METRICS_TOKEN`)
+
+So'rovlar soni `METRICS_QUERY_BUDGET` dan oshsa, ogohlantirish log'ga yoziladi.
+"""
+
+from __future__ import annotations
+
+import contextvars
+import logging
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.contrib.admin.views.decorators import staff_member_required
+from django.contrib import admin
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.http import HttpRequest, HttpResponse, HttpResponseForbidden
+from django.shortcuts import render
+from django.template.base import Template
+from django.utils.crypto import constant_time_compare
+
+logger = logging.getLogger("taalim.metrics")
+
+# Prometheus gistogrammasi chegaralari, soniyada
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_current: contextvars.ContextVar[RequestStats | None] = contextvars.ContextVar(
+    "taalim_request_stats", default=None
+)
+
+
+@dataclass
+class RequestStats:
+    started: float = field(default_factory=time.perf_counter)
+    queries: int = 0
+    sql_time: float = 0.0
+    template_time: float = 0.0
+    template_depth: int = 0
+
+
+class ViewMetrics:
+    def __init__(self, ring_size: int):
+        self.count = 0
+        self.queries = 0
+        self.max_queries = 0
+        self.sql_time = 0.0
+        self.template_time = 0.0
+        self.python_time = 0.0
+        self.total_time = 0.0
+        self.over_budget = 0
+        self.buckets = [0] * len(LATENCY_BUCKETS)
+        self.recent: deque[float] = deque(maxlen=ring_size)
+
+    def observe(self, stats: RequestStats, duration: float, over_budget: bool) -> None:
+        self.count += 1
+        self.queries += stats.queries
+        self.max_queries = max(self.max_queries, stats.queries)
+        self.sql_time += stats.sql_time
+        self.template_time += stats.template_time
+        self.python_time += max(duration - stats.sql_time - stats.template_time, 0.0)
+        self.total_time += duration
+        self.over_budget += over_budget
+        for index, bound in enumerate(LATENCY_BUCKETS):
+            if duration <= bound:
+                self.buckets[index] += 1
+        self.recent.append(duration)
+
+    def percentile(self, pct: float) -> float:
+        if not self.recent:
+            return 0.0
+        ordered = sorted(self.recent)
+        return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+    def summary(self) -> dict:
+        count = self.count or 1
+        return {
+            "count": self.count,
+            "avg_queries": self.queries / count,
+            "max_queries": self.max_queries,
+            "avg_ms": self.total_time / count * 1000,
+            "avg_sql_ms": self.sql_time / count * 1000,
+            "avg_template_ms": self.template_time / count * 1000,
+            "avg_python_ms": self.python_time / count * 1000,
+            "p50_ms": self.percentile(50) * 1000,
+            "p95_ms": self.percentile(95) * 1000,
+            "p99_ms": self.percentile(99) * 1000,
+            "over_budget": self.over_budget,
+        }
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._views: dict[str, ViewMetrics] = {}
+
+    def observe(self, view: str, stats: RequestStats, duration: float, over_budget: bool) -> None:
+        with self._lock:
+            metrics = self._views.get(view)
+            if metrics is None:
+                metrics = self._views[view] = ViewMetrics(settings.METRICS_RING_SIZE)
+            metrics.observe(stats, duration, over_budget)
+
+    def snapshot(self) -> dict[str, dict]:
+        with self._lock:
+            return {view: metrics.summary() for view, metrics in sorted(self._views.items())}
+
+    def prometheus(self) -> str:
+        lines = []
+        counters = (
+            ("taalim_requests_total", "count", "So'rovlar soni"),
+            ("taalim_request_queries_total", "queries", "SQL so'rovlar soni"),
+            ("taalim_request_sql_seconds_total", "sql_time", "SQL vaqti"),
+            ("taalim_request_template_seconds_total", "template_time", "Template render vaqti"),
+            ("taalim_request_python_seconds_total", "python_time", "Python vaqti"),
+            ("taalim_request_over_budget_total", "over_budget", "Query budjetidan oshgan so'rovlar"),
+        )
+        with self._lock:
+            views = sorted(self._views.items())
+            for name, attr, help_text in counters:
+                lines.append(f"# HELP {name} {help_text}")
+                lines.append(f"# TYPE {name} counter")
+                for view, metrics in views:
+                    lines.append(f'{name}{{view="{view}"}} {getattr(metrics, attr)}')
+
+            name = "taalim_request_duration_seconds"
+            lines.append(f"# HELP {name} So'rov kechikishi")
+            lines.append(f"# TYPE {name} histogram")
+            for view, metrics in views:
+                for bound, bucket in zip(LATENCY_BUCKETS, metrics.buckets):
+                    lines.append(f'{name}_bucket{{view="{view}",le="{bound}"}} {bucket}')
+                lines.append(f'{name}_bucket{{view="{view}",le="+Inf"}} {metrics.count}')
+                lines.append(f'{name}_sum{{view="{view}"}} {metrics.total_time}')
+                lines.append(f'{name}_count{{view="{view}"}} {metrics.count}')
+        return "\n".join(lines) + "\n"
+
+    def reset(self) -> None:
+        with self._lock:
+            self._views.clear()
+
+
+registry = MetricsRegistry()
+
+
+def _sql_timer(execute, sql, params, many, context):
+    stats = _current.get()
+    if stats is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        stats.queries += 1
+        stats.sql_time += time.perf_counter() - started
+
+
+def _install_sql_timer(sender, connection, **kwargs):
+    if _sql_timer not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_sql_timer)
+
+
+def _install_template_timer() -> None:
+    if getattr(Template.render, "_metrics_timed", False):
+        return
+    original_render = Template.render
+
+    def render(self, context):
+        stats = _current.get()
+        if stats is None or stats.template_depth:
+            # {% include %} va {% extends %} tashqi render vaqtiga kiradi
+            return original_render(self, context)
+        stats.template_depth += 1
+        started = time.perf_counter()
+        try:
+            return original_render(self, context)
+        finally:
+            stats.template_depth -= 1
+            stats.template_time += time.perf_counter() - started
+
+    render._metrics_timed = True
+    Template.render = render
+
+
+class RequestMetricsMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+        connection_created.connect(_install_sql_timer, dispatch_uid="taalim.metrics")
+        for connection in connections.all(initialized_only=True):
+            _install_sql_timer(None, connection)
+        _install_template_timer()
+
+    def __call__(self, request: HttpRequest):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        token = _current.set(RequestStats())
+        try:
+            return self.get_response(request)
+        finally:
+            self._record(request, _current.get())
+            _current.reset(token)
+
+    async def __acall__(self, request: HttpRequest):
+        token = _current.set(RequestStats())
+        try:
+            return await self.get_response(request)
+        finally:
+            self._record(request, _current.get())
+            _current.reset(token)
+
+    def _record(self, request: HttpRequest, stats: RequestStats) -> None:
+        duration = time.perf_counter() - stats.started
+        match = getattr(request, "resolver_match", None)
+        view = (match.view_name if match else None) or "unresolved"
+        budget = settings.METRICS_QUERY_BUDGET
+        over_budget = bool(budget) and stats.queries > budget
+        if over_budget:
+            logger.warning(
+                "%s: %d ta SQL so'rov (budjet %d), %.1fms (SQL %.1fms)",
+                view,
+                stats.queries,
+                budget,
+                duration * 1000,
+                stats.sql_time * 1000,
+            )
+        registry.observe(view, stats, duration, over_budget)
+
+
+@staff_member_required
+def metrics_admin_view(request: HttpRequest) -> HttpResponse:
+    context = {
+        **admin.site.each_context(request),
+        "title": "So'rovlar statistikasi",
+        "views": registry.snapshot(),
+        "query_budget": settings.METRICS_QUERY_BUDGET,
+    }
+    return render(request, "admin/metrics.html", context)
+
+
+def metrics_text_view(request: HttpRequest) -> HttpResponse:
+    token = settings.METRICS_TOKEN
+    header = request.headers.get("Authorization", "")
+    authorized = request.user.is_active and request.user.is_staff
+    if token and not authorized:
+        authorized = constant_time_compare(header, f"Bearer {token}")
+    if not authorized:
+        return HttpResponseForbidden()
+    return HttpResponse(
+        registry.prometheus(), content_type="text/plain; version=0.0.4; charset=utf-8"
+    )
@@ -0,0 +1,111 @@
+"""
+O'qish/yozish bo'yicha ma'lumotlar bazasi router'i.
+
+`DATABASES["replica"]` sozlangan bo'lsa (taalim/database.py,
+`DB_READ_REPLICA`), GET/HEAD so'rovlardagi o'qishlar replica'ga yuboriladi:
+test ro'yxati, natijalar, amaliy savollar, kitoblar va jamoa sahifalari
+imtihon javoblarini yozayotgan primary bilan raqobatlashmaydi.
+
+Primary'da qoladi:
+  - barcha yozuvlar va migratsiyalar;
+  - POST/PUT/DELETE so'rovlaridagi barcha o'qishlar (start_test, test_run POST,
+    admin formalari);
+  - tranzaksiya ichidagi o'qishlar (select_for_update va h.k.);
+  - so'rovdan tashqaridagi kod (management buyruqlari, warmup, shell);
+  - yozgan sessiyaning keyingi `DB_PRIMARY_PIN_SECONDS` soniyadagi so'rovlari
+    (read-your-writes: test_run POST -> natijalar sahifasi).
+
+Sessiya qaysi bazaga "qadalgani" cookie'da saqlanadi - uni tekshirish uchun
+sessiya jadvalini o'qish shart emas.
+"""
+
+from __future__ import annotations
+
+import contextvars
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.http import HttpRequest
+
+REPLICA_DB_ALIAS = "replica"
+PIN_COOKIE_NAME = "db_primary"
+SAFE_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+_read_from_replica: contextvars.ContextVar[bool] = contextvars.ContextVar(
+    "taalim_read_from_replica", default=False
+)
+
+
+class PrimaryReplicaRouter:
+    def db_for_read(self, model, **hints):
+        if (
+            _read_from_replica.get()
+            and REPLICA_DB_ALIAS in settings.DATABASES
+            and not connections[DEFAULT_DB_ALIAS].in_atomic_block
+        ):
+            return REPLICA_DB_ALIAS
+        return DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Ikkala ulanish ham bir xil ma'lumotni ko'radi
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == DEFAULT_DB_ALIAS
+
+
+class PrimaryPinningMiddleware:
+    """
+    Xavfsiz (GET/HEAD) so'rovlarda, sessiya qadalmagan bo'lsa, o'qishlarni
+    replica'ga yo'naltiradi. Yozuvchi so'rovdan keyin javobga qisqa muddatli
+    cookie qo'yiladi - shu vaqt ichida sessiya faqat primary'dan o'qiydi.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request: HttpRequest):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        token = _read_from_replica.set(self._use_replica(request))
+        try:
+            response = self.get_response(request)
+        finally:
+            _read_from_replica.reset(token)
+        return self._pin(request, response)
+
+    async def __acall__(self, request: HttpRequest):
+        token = _read_from_replica.set(self._use_replica(request))
+        try:
+            response = await self.get_response(request)
+        finally:
+            _read_from_replica.reset(token)
+        return self._pin(request, response)
+
+    @staticmethod
+    def _use_replica(request: HttpRequest) -> bool:
+        return request.method in SAFE_METHODS and PIN_COOKIE_NAME not in request.COOKIES
+
+    @staticmethod
+    def _pin(request: HttpRequest, response):
+        session = getattr(request, "session", None)
+        # GET ham sessiyani yozishi mumkin (test topshiruvchi kaliti)
+        wrote = request.method not in SAFE_METHODS or (session is not None and session.modified)
+        if wrote and REPLICA_DB_ALIAS in settings.DATABASES:
+            response.set_cookie(
+                PIN_COOKIE_NAME,
+                "1",
+                max_age=settings.DB_PRIMARY_PIN_SECONDS,
+                httponly=True,
+                samesite="Lax",
+            )
+        return response
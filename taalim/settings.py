@@ -4,7 +4,9 @@ from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
-from decouple import config
+from decouple import Csv, config
+
+from taalim.database import database_config, replica_config
 
 # Quick-start development settings - unsuitable for production
 # See https://docs.djangoproject.com/en/5.2/howto/deployment/checklist/
@@ -16,6 +18,11 @@ DEBUG = config('DEBUG', default=False, cast=bool)
 
 ALLOWED_HOSTS = ['*']
 
+# ASGI profili: taalim/asgi.py uni avtomatik yoqadi (ASGI=True)
+ASGI = config('ASGI', default=False, cast=bool)
+# testapp sahifalarini async view'lar bilan xizmat qilish
+ASYNC_VIEWS = config('ASYNC_VIEWS', default=ASGI, cast=bool)
+
 
 # Application definition
 
@@ -26,6 +33,8 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    # Loyiha darajasidagi buyruqlar (manage.py serve)
+    'taalim',
     'mainapp',
     'testapp',
     "whitenoise.runserver_nostatic",
@@ -35,6 +44,8 @@ INSTALLED_APPS = [
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',
+    'taalim.routers.PrimaryPinningMiddleware',
+    'taalim.metrics.RequestMetricsMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -42,15 +53,43 @@ MIDDLEWARE = [
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
-STATICFILES_STORAGE = "whitenoise.storage.CompressedManifestStaticFilesStorage"
+
+# So'rovlar statistikasi (taalim/metrics.py)
+METRICS_QUERY_BUDGET = config('METRICS_QUERY_BUDGET', default=50, cast=int)
+METRICS_RING_SIZE = config('METRICS_RING_SIZE', default=500, cast=int)
+METRICS_TOKEN = config('METRICS_TOKEN', default='')
+
+# Test sessiyalarini saqlash muddatlari (manage.py archive_sessions)
+TEST_SESSION_ABANDON_HOURS = config('TEST_SESSION_ABANDON_HOURS', default=24, cast=int)
+TEST_SESSION_ARCHIVE_DAYS = config('TEST_SESSION_ARCHIVE_DAYS', default=30, cast=int)
+# Yangi sessiyalar javoblari: 'packed' - sessiya qatorida ixcham, 'rows' - har biri UserAnswer qatori
+TEST_ANSWER_STORAGE = config('TEST_ANSWER_STORAGE', default='packed')
+
+# Django 5.1 dan STATICFILES_STORAGE e'tiborga olinmaydi - ombor STORAGES orqali.
+# collectstatic CSS'ni minifikatsiya qiladi, nomiga xesh qo'shadi va gzip/Brotli
+# nusxalarini tayyorlaydi (taalim/storage.py)
+STORAGES = {
+    'default': {'BACKEND': 'django.core.files.storage.FileSystemStorage'},
+    'staticfiles': {'BACKEND': 'taalim.storage.MinifiedCompressedManifestStaticFilesStorage'},
+}
+# collectstatic ishga tushirilmagan muhitda (dev, testlar) xeshsiz nomga qaytadi
+WHITENOISE_MANIFEST_STRICT = False
 ROOT_URLCONF = 'taalim.urls'
 
 TEMPLATES = [
     {
         'BACKEND': 'django.template.backends.django.DjangoTemplates',
         'DIRS': [BASE_DIR / 'templates'],
-        'APP_DIRS': True,
         'OPTIONS': {
+            # Kompilyatsiya qilingan shablonlar jarayon xotirasida saqlanadi
+            # (DEBUG'da fayl o'zgarsa autoreloader keshni tozalaydi).
+            # Worker ishga tushganda taalim/warmup.py ularni oldindan yuklaydi.
+            'loaders': [
+                ('django.template.loaders.cached.Loader', [
+                    'django.template.loaders.filesystem.Loader',
+                    'django.template.loaders.app_directories.Loader',
+                ]),
+            ],
             'context_processors': [
                 'django.template.context_processors.request',
                 'django.contrib.auth.context_processors.auth',
@@ -62,16 +101,93 @@ TEMPLATES = [
 
 WSGI_APPLICATION = 'taalim.wsgi.application'
 
+# wsgi.py/asgi.py worker so'rov qabul qilishidan oldin shablonlar, URL'lar va
+# katalog keshini qizdiradi (taalim/warmup.py)
+WARMUP_ON_BOOT = config('WARMUP_ON_BOOT', default=True, cast=bool)
+
 
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
 
+# Engine, doimiy ulanishlar va SQLite PRAGMA'lari taalim/database.py da (.env orqali)
 DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
+    'default': database_config(BASE_DIR),
+}
+# DB_READ_REPLICA=True: GET so'rovlardagi o'qishlar replica'ga (taalim/routers.py)
+_replica = replica_config(DATABASES['default'])
+if _replica is not None:
+    DATABASES['replica'] = _replica
+DATABASE_ROUTERS = ['taalim.routers.PrimaryReplicaRouter']
+DB_PRIMARY_PIN_SECONDS = config('DB_PRIMARY_PIN_SECONDS', default=10, cast=int)
+if ASGI:
+    # ASGI'da doimiy ulanishlar har bir so'rov oqimida qolib ketadi,
+    # Postgres bilan DB_POOL ishlatiladi
+    for _database in DATABASES.values():
+        _database['CONN_MAX_AGE'] = 0
+
+
+# Cache
+# CACHE_URL=redis://... bo'lsa barcha worker'lar uchun umumiy Redis kesh ishlatiladi
+# (redis paketi kerak), aks holda har bir jarayonning o'z xotiradagi keshi.
+
+CACHE_URL = config('CACHE_URL', default='')
+SHARED_CACHE = CACHE_URL.startswith(('redis://', 'rediss://'))
+if SHARED_CACHE:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': CACHE_URL,
+        }
     }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'taalim',
+        }
+    }
+
+
+# start_test / test_run POST chastotasi cheklovi (testapp/throttling.py), "so'rovlar/soniya".
+# Hisoblagichlar barcha worker'lar uchun umumiy bo'lishi kerak: standart holatda
+# faqat CACHE_URL (Redis) berilganda yoqiladi, LocMem bilan yoqilsa
+# `manage.py check` xato beradi.
+RATELIMIT_ENABLED = config('RATELIMIT_ENABLED', default=SHARED_CACHE, cast=bool)
+RATELIMIT_RATES = {
+    'start': config('RATELIMIT_START', default='10/60'),
+    'submit': config('RATELIMIT_SUBMIT', default='10/60'),
+    # Bitta IP (imtihon zali NAT orqali) uchun umumiy chegara
+    'ip': config('RATELIMIT_IP', default='600/60'),
+}
+# Mijoz IP manzili shu proksilar (IP yoki CIDR) qo'ygan X-Forwarded-For'dan olinadi,
+# boshqa manbadan kelgan sarlavha e'tiborga olinmaydi
+TRUSTED_PROXIES = config('TRUSTED_PROXIES', default='127.0.0.1,::1', cast=Csv())
+
+
+# Sessions
+# SESSION_ENGINE: db, cached_db (standart), cache yoki signed_cookies.
+# Muddati o'tgan sessiyalar `python manage.py purge_sessions` bilan tozalanadi.
+
+SESSION_ENGINES = {
+    'db': 'django.contrib.sessions.backends.db',
+    'cached_db': 'django.contrib.sessions.backends.cached_db',
+    'cache': 'django.contrib.sessions.backends.cache',
+    'signed_cookies': 'django.contrib.sessions.backends.signed_cookies',
 }
+_session_engine = config('SESSION_ENGINE', default='cached_db')
+SESSION_ENGINE = SESSION_ENGINES.get(_session_engine, _session_engine)
+SESSION_COOKIE_AGE = config('SESSION_COOKIE_AGE', default=60 * 60 * 24 * 14, cast=int)
+SESSION_COOKIE_HTTPONLY = True
+
+
+# Authentication
+# request.user profili bilan bitta so'rovda yuklanadi (mainapp/identity.py).
+# ModelBackend avval kirgan sessiyalar (sessiyada uning yo'li saqlangan) uchun qoldirilgan.
+
+AUTHENTICATION_BACKENDS = [
+    'mainapp.identity.ProfileModelBackend',
+    'django.contrib.auth.backends.ModelBackend',
+]
 
 
 # Password validation
@@ -113,6 +229,21 @@ STATICFILES_DIRS = [BASE_DIR / 'static']
 STATIC_ROOT =BASE_DIR / 'staticfiles'
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
+
+# Kitob fayllaridan matn ajratish va qidiruv (mainapp/booktext.py).
+# BOOK_EXTRACTION_ASYNC=False - upload'da navbatga qo'yish o'chiriladi,
+# matn faqat `manage.py extract_books` bilan ajratiladi.
+BOOK_EXTRACTION_ASYNC = config('BOOK_EXTRACTION_ASYNC', default=True, cast=bool)
+BOOK_EXTRACTION_WORKERS = config('BOOK_EXTRACTION_WORKERS', default=2, cast=int)
+BOOK_PDF_EXTRACTOR = config('BOOK_PDF_EXTRACTOR', default='mainapp.extractors.pdf.extract_pdf')
+BOOK_TEXT_MAX_CHARS = config('BOOK_TEXT_MAX_CHARS', default=5_000_000, cast=int)
+
+# Admin'dagi talabalar importi (mainapp/admin.py) bitta so'rov ichida
+# bajariladi va gunicorn timeout'iga (60 s) sig'ishi kerak: yaratilgan
+# parollar har doim tezkor xeshlanadi, CSV'dagi parollar esa to'liq
+# (~0.5 s). Kattaroq fayllar - `manage.py provision_students`.
+STUDENT_IMPORT_MAX_ROWS = config('STUDENT_IMPORT_MAX_ROWS', default=5000, cast=int)
+STUDENT_IMPORT_MAX_PASSWORDS = config('STUDENT_IMPORT_MAX_PASSWORDS', default=50, cast=int)
 LOGIN_URL = '/login/'
 LOGIN_REDIRECT_URL = '/'
 
@@ -120,3 +251,21 @@ LOGIN_REDIRECT_URL = '/'
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
+
+
+# Logging
+# taalim.* log'lari (warmup hisoboti, metrics ogohlantirishlari) stderr'ga yoziladi
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {'class': 'logging.StreamHandler'},
+    },
+    'loggers': {
+        'taalim': {
+            'handlers': ['console'],
+            'level': config('LOG_LEVEL', default='INFO'),
+        },
+    },
+}
@@ -0,0 +1,40 @@
+"""
+collectstatic uchun statik fayllar ombori.
+
+WhiteNoise'ning `CompressedManifestStaticFilesStorage` iga CSS minifikatsiyasini
+qo'shadi: fayl STATIC_ROOT ga ko'chirilayotganda izohlar va ortiqcha bo'sh
+joylar olib tashlanadi, so'ng odatdagidek xesh qo'shilgan nom beriladi va
+gzip (brotli o'rnatilgan bo'lsa, Brotli ham) nusxalari tayyorlanadi.
+Xeshli fayllarni WhiteNoise bir yillik `immutable` sarlavha bilan beradi.
+"""
+
+from __future__ import annotations
+
+import re
+
+from django.core.files.base import ContentFile
+from whitenoise.storage import CompressedManifestStaticFilesStorage
+
+_COMMENT_RE = re.compile(r"/\*.*?\*/", re.S)
+_SPACE_RE = re.compile(r"\s+")
+# Selektorlardagi ":" va ">" atrofidagi bo'sh joy ma'noga ega bo'lishi mumkin,
+# shuning uchun faqat shu belgilar atrofidagi bo'sh joy olib tashlanadi
+_PUNCT_RE = re.compile(r"\s*([{};,])\s*")
+
+
+def minify_css(css: str) -> str:
+    # Litsenziya izohlari (/*! ... */) saqlanadi
+    css = _COMMENT_RE.sub(lambda m: m.group(0) if m.group(0).startswith("/*!") else "", css)
+    css = _SPACE_RE.sub(" ", css)
+    css = _PUNCT_RE.sub(r"\1", css)
+    return css.replace(";}", "}").strip() + "\n"
+
+
+class MinifiedCompressedManifestStaticFilesStorage(CompressedManifestStaticFilesStorage):
+    def _save(self, name, content):
+        if name.endswith(".css") and not name.endswith(".min.css"):
+            # post_process faylni xesh hisoblash uchun o'qib bo'lgan bo'ladi
+            content.seek(0)
+            css = content.read().decode("utf-8")
+            content = ContentFile(minify_css(css).encode("utf-8"))
+        return super()._save(name, content)
@@ -4,11 +4,16 @@ from django.urls import path, include
 from django.conf import settings
 from django.conf.urls.static import static
 
+from taalim import metrics
+
 urlpatterns = [
     # Asosiy sayt (bosh sahifa, kitoblar va h.k.)
     path('', include('mainapp.urls')),
     # Test tizimi (yangi `testapp`)
     path('', include('testapp.urls')),
+    # So'rovlar statistikasi (faqat staff / METRICS_TOKEN)
+    path('admin/metrics/', metrics.metrics_admin_view, name='admin_metrics'),
+    path('metrics/', metrics.metrics_text_view, name='metrics'),
     path('admin/', admin.site.urls),
 ]
 
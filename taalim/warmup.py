@@ -0,0 +1,126 @@
+"""
+Worker so'rov qabul qilishidan oldin bajariladigan qizdirish (warmup).
+
+`taalim/wsgi.py` va `taalim/asgi.py` ilova yaratilgandan keyin `warmup()` ni
+chaqiradi:
+  - `templates/` dagi barcha shablonlar cached loader orqali kompilyatsiya
+    qilinadi (birinchi imtihon so'rovi parse qilish vaqtini to'lamaydi);
+  - URL pattern'lar import qilinib, reverse jadvali to'ldiriladi;
+  - statik fayllar manifesti o'qiladi;
+  - test turlari katalogi keshga yoziladi.
+
+Har bir bosqich vaqti log'ga (`taalim.warmup`) yoziladi. Bosqichdagi xato
+worker'ni to'xtatmaydi - u odatdagidek birinchi so'rovda qayta urinadi.
+Import ishlayotgan event loop ichida bo'lsa (masalan uvicorn), warmup alohida
+oqimda bajariladi.
+`WARMUP_ON_BOOT=False` bilan o'chiriladi.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import threading
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.db import connections
+from django.template import TemplateSyntaxError, engines
+from django.urls import get_resolver
+
+from testapp.services import build_catalogue
+
+logger = logging.getLogger("taalim.warmup")
+
+
+def _compile_templates() -> int:
+    compiled = 0
+    for engine in engines.all():
+        for directory in map(Path, getattr(engine, "dirs", ())):
+            for path in sorted(directory.rglob("*.html")):
+                name = path.relative_to(directory).as_posix()
+                try:
+                    engine.get_template(name)
+                except TemplateSyntaxError:
+                    logger.exception("Shablonni kompilyatsiya qilib bo'lmadi: %s", name)
+                else:
+                    compiled += 1
+    return compiled
+
+
+def _resolve_urls() -> int:
+    # reverse_dict birinchi murojaatda barcha include'larni import qilib to'ldiriladi
+    return len(get_resolver().reverse_dict)
+
+
+def _load_static_manifest() -> int:
+    return len(getattr(staticfiles_storage, "hashed_files", ()))
+
+
+def _prime_catalogue() -> int:
+    return len(build_catalogue())
+
+
+STEPS = (
+    ("templates", _compile_templates),
+    ("urls", _resolve_urls),
+    ("static", _load_static_manifest),
+    ("catalogue", _prime_catalogue),
+)
+
+
+def warmup() -> dict[str, dict]:
+    """
+    Barcha bosqichlarni bajaradi; {bosqich: {"count", "ms"}} qaytaradi.
+    """
+
+    report = {}
+    started = time.perf_counter()
+    try:
+        for name, step in STEPS:
+            step_started = time.perf_counter()
+            try:
+                count = step()
+            except Exception:  # noqa: BLE001
+                logger.exception("Warmup bosqichi bajarilmadi: %s", name)
+                count = None
+            report[name] = {"count": count, "ms": (time.perf_counter() - step_started) * 1000}
+    finally:
+        # gunicorn --preload'da ulanish fork qilingan worker'larga meros qolmasin
+        try:
+            connections.close_all()
+        except Exception:  # noqa: BLE001
+            logger.exception("Warmup ulanishlarini yopib bo'lmadi")
+
+    total_ms = (time.perf_counter() - started) * 1000
+    logger.info(
+        "Warmup %.1fms: %s",
+        total_ms,
+        ", ".join(f"{name}={step['count']} ({step['ms']:.1f}ms)" for name, step in report.items()),
+    )
+    report["total"] = {"count": None, "ms": total_ms}
+    return report
+
+
+def _event_loop_running() -> bool:
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return False
+    return True
+
+
+def warmup_on_boot() -> None:
+    if not settings.WARMUP_ON_BOOT:
+        return
+    if _event_loop_running():
+        # ASGI server ilovani event loop ichida import qilsa, bazaga sinxron
+        # murojaat (katalog, close_all) SynchronousOnlyOperation beradi -
+        # warmup alohida oqimda, o'z ulanishlari bilan bajariladi
+        thread = threading.Thread(target=warmup, name="warmup")
+        thread.start()
+        thread.join()
+    else:
+        warmup()
@@ -14,3 +14,8 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'taalim.settings')
 
 application = get_wsgi_application()
+
+# Shablonlar, URL'lar va katalog keshi birinchi so'rovdan oldin yuklanadi
+from taalim.warmup import warmup_on_boot  # noqa: E402
+
+warmup_on_boot()
@@ -1,34 +1,69 @@
-import csv
-import io
-import json
-
 from django import forms
 from django.contrib import admin, messages
 from django.db.models import Max
+from django.contrib.admin import helpers
+from django.core.exceptions import PermissionDenied
+from django.db import transaction
 from django.http import HttpRequest, HttpResponseRedirect
+from django.template.response import TemplateResponse
 from django.urls import path, reverse
+from django.utils.html import format_html, format_html_join
 from django.utils.safestring import mark_safe
 
-from .models import Question, TestTuri, PracticeQuestion, Category
-
-# Word (DOCX) fayllari uchun importni yanada ishonchli qilish
-try:
-    import docx
-
-    Document = docx.Document
-except Exception:  # noqa: BLE001
-    Document = None
+from .admin_tools import (
+    EstimatedCountPaginator,
+    GroupNumberFilter,
+    PaginatedInlineFormSet,
+    question_text_search,
+)
+from . import exports, importers
+from .models import Question, TestTuri, TestSession, PracticeQuestion, Category
+from .richtext import render_objects
+from .services import bump_question_set_versions, lock_test_type, move_questions, regroup_questions
+from .similarity import KIND_PRACTICE, KIND_QUESTION, duplicate_clusters, find_similar, index_objects
+
+# Hisobotda ko'rsatiladigan klasterlar soni (katta klasterlar avval)
+DUPLICATES_REPORT_LIMIT = 100
+# Savol tahrirlash sahifasidagi o'xshash savollar soni
+SIMILAR_QUESTIONS_LIMIT = 10
+
+
+def _similar_questions(obj):
+    """
+    Tahrirlanayotgan savolga deyarli bir xil savollar (testapp/similarity.py)
+    havolalari - takrorni saqlashdan oldin ko'rish uchun.
+    """
 
-try:  # Excel (xlsx) fayllari uchun
-    from openpyxl import load_workbook
-except Exception:  # noqa: BLE001
-    load_workbook = None
+    if obj is None or obj.pk is None:
+        return "—"
+    found = find_similar(obj)[:SIMILAR_QUESTIONS_LIMIT]
+    if not found:
+        return "—"
+    model = type(obj)
+    objects = model.objects.select_related("category").in_bulk([pk for pk, _ in found])
+    change_url = f"admin:testapp_{model._meta.model_name}_change"
+    rows = (
+        (reverse(change_url, args=[pk]), pk, objects[pk], objects[pk].category, round(score * 100))
+        for pk, score in found
+        if pk in objects
+    )
+    return format_html_join(mark_safe("<br>"), '<a href="{}">#{} {}</a> ({}, {}%)', rows)
 
 
 class QuestionInline(admin.TabularInline):
     model = Question
     extra = 1
     readonly_fields = ("group_number",)
+    # Minglab savolli test turida change form faqat bitta sahifani chiqaradi
+    formset = PaginatedInlineFormSet
+    template = "admin/testapp/testturi/question_inline.html"
+    ordering = ("group_number", "id")
+
+    def get_formset(self, request, obj=None, **kwargs):
+        formset = super().get_formset(request, obj, **kwargs)
+        page = request.GET.get("questions_page", "")
+        formset.page_number = int(page) if page.isdigit() else 1
+        return formset
 
 
 class QuestionUploadForm(forms.Form):
@@ -53,10 +88,117 @@ class QuestionUploadForm(forms.Form):
     )
 
 
+class RegroupForm(forms.Form):
+    chunk_size = forms.IntegerField(
+        label="Har bo'limdagi savollar soni",
+        min_value=1,
+        initial=20,
+        help_text="Savollar joriy tartibda shu sondan qaytadan bo'limlarga bo'linadi.",
+    )
+
+
+class MoveQuestionsForm(forms.Form):
+    category = forms.ModelChoiceField(
+        label="Qaysi test turiga",
+        queryset=TestTuri.objects.order_by("name"),
+    )
+    group_number = forms.IntegerField(
+        label="Bo'lim raqami",
+        min_value=1,
+        required=False,
+        help_text="Bo'sh qoldirilsa, savollarning bo'lim raqami o'zgarmaydi.",
+    )
+
+
+def _bulk_action_form(modeladmin, request, queryset, form_class, title):
+    """
+    Oraliq formali admin amali: forma to'g'ri to'ldirilgan bo'lsa uni,
+    aks holda formani ko'rsatuvchi javobni qaytaradi.
+
+    "Barcha N tasini tanlash" bosilgan bo'lsa, minglab ID'lar sahifaga
+    yozilmaydi - changelist filtrlari bo'yicha queryset qayta hisoblanadi.
+    """
+
+    if "apply" in request.POST:
+        form = form_class(request.POST)
+        if form.is_valid():
+            return form, None
+    else:
+        form = form_class()
+
+    select_across = request.POST.get("select_across") == "1"
+    context = {
+        **modeladmin.admin_site.each_context(request),
+        "opts": modeladmin.model._meta,
+        "title": title,
+        "form": form,
+        "action": request.POST["action"],
+        "select_across": select_across,
+        "selected": [] if select_across else request.POST.getlist(helpers.ACTION_CHECKBOX_NAME),
+        "selected_count": queryset.count(),
+    }
+    return None, TemplateResponse(request, "admin/testapp/bulk_action.html", context)
+
+
+def _export_action(export, file_format: str, description: str, to_questions=None):
+    """
+    Eksport admin amalini yasaydi; `to_questions` tanlangan obyektlardan
+    eksport qilinadigan queryset'ni oladi (masalan, test turlari -> savollar).
+    """
+
+    def action(modeladmin, request, queryset):
+        if file_format == "xlsx" and not exports.xlsx_available():
+            modeladmin.message_user(
+                request,
+                "Excel fayl yaratish uchun avval 'openpyxl' paketini o‘rnating.",
+                level=messages.ERROR,
+            )
+            return None
+        if to_questions is not None:
+            queryset = to_questions(queryset)
+        return export(queryset, file_format)
+
+    action.__name__ = f"export_{file_format}"
+    return admin.action(description=description)(action)
+
+
+def _category_questions(queryset):
+    return Question.objects.filter(category__in=queryset)
+
+
 @admin.register(TestTuri)
 class TestTuriAdmin(admin.ModelAdmin):
     list_display = ("name", "description")
     inlines = [QuestionInline]
+    actions = [
+        "regroup_questions",
+        _export_action(exports.export_questions, "csv", "Savollarni CSV ga eksport qilish", _category_questions),
+        _export_action(exports.export_questions, "json", "Savollarni JSON ga eksport qilish", _category_questions),
+        _export_action(exports.export_questions, "xlsx", "Savollarni Excel ga eksport qilish", _category_questions),
+    ]
+
+    @admin.action(description="Savollarni bo'limlarga qaytadan bo'lish", permissions=["change"])
+    def regroup_questions(self, request, queryset):
+        form, response = _bulk_action_form(
+            self, request, queryset, RegroupForm, "Savollarni bo'limlarga qaytadan bo'lish"
+        )
+        if form is None:
+            return response
+
+        chunk_size = form.cleaned_data["chunk_size"]
+        # Hammasi bitta tranzaksiyada: biror test turida xato bo'lsa,
+        # oldingilari ham qayta bo'linmagan holatda qoladi
+        with transaction.atomic():
+            changed = sum(
+                regroup_questions(category_id, chunk_size)
+                for category_id in queryset.values_list("pk", flat=True)
+            )
+        self.message_user(
+            request,
+            f"{changed} ta savolning bo'limi o'zgardi ({chunk_size} tadan).",
+            level=messages.SUCCESS,
+        )
+        return None
 
     change_form_template = "admin/testapp/testturi/change_form.html"
 
@@ -88,51 +230,13 @@ class TestTuriAdmin(admin.ModelAdmin):
             if form.is_valid():
                 upload_file = form.cleaned_data["file"]
                 chunk_size = form.cleaned_data["chunk_size"]
-                name = upload_file.name.lower()
 
                 try:
-                    if name.endswith(".csv"):
-                        self._create_questions_from_csv(
-                            upload_file, category, request, chunk_size
-                        )
-                    elif name.endswith(".json"):
-                        self._create_questions_from_json(
-                            upload_file, category, request, chunk_size
-                        )
-                    elif name.endswith(".docx"):
-                        if Document is None:
-                            self.message_user(
-                                request,
-                                "DOCX fayllarni o‘qish uchun avval 'python-docx' paketini o‘rnating.",
-                                level=messages.ERROR,
-                            )
-                        else:
-                            self._create_questions_from_docx(
-                                upload_file, category, request, chunk_size
-                            )
-                    elif name.endswith(".xlsx"):
-                        if load_workbook is None:
-                            self.message_user(
-                                request,
-                                "Excel fayllarni o‘qish uchun avval 'openpyxl' paketini o‘rnating.",
-                                level=messages.ERROR,
-                            )
-                        else:
-                            self._create_questions_from_excel(
-                                upload_file, category, request, chunk_size
-                            )
-                    else:
-                        self.message_user(
-                            request,
-                            "Faqat CSV, JSON, DOCX yoki Excel (XLSX) fayl yuklash mumkin.",
-                            level=messages.ERROR,
-                        )
-                        return HttpResponseRedirect(
-                            reverse(
-                                "admin:testapp_testturi_change",
-                                args=[category.pk],
-                            )
-                        )
+                    # Parser (python-docx / openpyxl) shu yerda birinchi marta yuklanadi
+                    rows, source = importers.parse_upload(upload_file)
+                    self._bulk_create_questions(rows, category, request, source, chunk_size)
+                except (importers.UnsupportedFormat, importers.MissingDependency) as exc:
+                    self.message_user(request, str(exc), level=messages.ERROR)
                 except Exception as exc:  # noqa: BLE001
                     self.message_user(
                         request,
@@ -172,8 +276,38 @@ class TestTuriAdmin(admin.ModelAdmin):
         Savollarni foydalanuvchi ko'rsatgan `chunk_size` bo'yicha bo'lib saqlash.
         """
 
+        with transaction.atomic():
+            # Bo'lim raqamlari Max(group_number) dan - parallel import yoki
+            # qayta bo'lish bilan bir xil raqam olinmasin
+            lock_test_type(category.pk)
+            created = self._create_question_batches(rows, category, chunk_size)
+
+        self.message_user(
+            request,
+            f"{len(created)} ta savol {source} fayldan muvaffaqiyatli qo‘shildi.",
+            level=messages.SUCCESS,
+        )
+
+        # Yangi savollar shu test turidagi boshqa savollarni takrorlamaydimi:
+        # faqat yuklangan savollar tekshiriladi (har biriga bitta LSH so'rovi),
+        # test turining qolgan savollari klasterlanmaydi
+        similar = sum(1 for question in created if find_similar(question, same_scope=True))
+        if similar:
+            report_url = reverse("admin:testapp_question_duplicates") + f"?scope={category.pk}"
+            self.message_user(
+                request,
+                format_html(
+                    "Yangi savollardan {} tasi boshqa savollarga juda o‘xshash. "
+                    '<a href="{}">Takroriy savollar hisoboti</a>',
+                    similar,
+                    report_url,
+                ),
+                level=messages.WARNING,
+            )
+
+    def _create_question_batches(self, rows: list[dict], category, chunk_size: int) -> list[Question]:
         batch_size = chunk_size
-        created = 0
+        created: list[Question] = []
         batch: list[Question] = []
 
         max_group = (
@@ -205,213 +339,22 @@ class TestTuriAdmin(admin.ModelAdmin):
                 items_in_current_group = 0
 
             if len(batch) == batch_size:
-                Question.objects.bulk_create(batch)
-                created += len(batch)
+                render_objects(batch)
+                created.extend(Question.objects.bulk_create(batch))
                 batch = []
 
         if batch:
-            Question.objects.bulk_create(batch)
-            created += len(batch)
-
-        self.message_user(
-            request,
-            f"{created} ta savol {source} fayldan muvaffaqiyatli qo‘shildi.",
-            level=messages.SUCCESS,
-        )
-
-    def _create_questions_from_csv(
-        self, upload_file, category, request: HttpRequest, chunk_size: int
-    ):
-        decoded = upload_file.read().decode("utf-8")
-        reader = csv.DictReader(io.StringIO(decoded))
-        rows = []
-        for row in reader:
-            if not row.get("question_text"):
-                continue
-            rows.append(
-                {
-                    "question_text": row["question_text"],
-                    "choice_a": row["choice_a"],
-                    "choice_b": row["choice_b"],
-                    "choice_c": row["choice_c"],
-                    "choice_d": row["choice_d"],
-                    "correct_answer": row["correct_answer"].upper(),
-                }
-            )
-
-        self._bulk_create_questions(rows, category, request, "CSV", chunk_size)
-
-    def _create_questions_from_json(
-        self, upload_file, category, request: HttpRequest, chunk_size: int
-    ):
-        data = json.load(upload_file)
-        if isinstance(data, dict):
-            data = data.get("questions", [])
-
-        rows = []
-        for item in data:
-            if not item.get("question_text"):
-                continue
-            rows.append(
-                {
-                    "question_text": item["question_text"],
-                    "choice_a": item["choice_a"],
-                    "choice_b": item["choice_b"],
-                    "choice_c": item["choice_c"],
-                    "choice_d": item["choice_d"],
-                    "correct_answer": item["correct_answer"].upper(),
-                }
-            )
-
-        self._bulk_create_questions(rows, category, request, "JSON", chunk_size)
-
-    def _create_questions_from_docx(
-        self, upload_file, category, request: HttpRequest, chunk_size: int
-    ):
-        """
-        Word (DOCX) fayldan savollarni o‘qish.
-
-        Kutilgan format (takrorlanadi):
-
-        Savol matni
-        A) variant A
-        B) variant B
-        C) variant C
-        D) variant D
-        To'g'ri: A
-
-        Bo'sh qatordan keyin keyingi savol.
-        """
-
-        if Document is None:
-            raise RuntimeError("python-docx o‘rnatilmagan.")
-
-        document = Document(upload_file)
-        lines = [p.text.strip() for p in document.paragraphs if p.text.strip()]
-
-        def _clean_choice(line: str) -> str:
-            # "A) matn" yoki "A. matn" bo'lsa, boshini olib tashlaymiz
-            if len(line) > 2 and line[1] in [")", "."]:
-                return line[2:].lstrip()
-            return line
-
-        rows = []
-        i = 0
-        n = len(lines)
-
-        while i + 6 <= n:
-            question_text = lines[i]
-            a_line = lines[i + 1]
-            b_line = lines[i + 2]
-            c_line = lines[i + 3]
-            d_line = lines[i + 4]
-            correct_line = lines[i + 5]
-
-            if not question_text or not correct_line:
-                i += 1
-                continue
-
-            # Endi format: "Javob: A" yoki "Javob A"
-            norm = correct_line.lower()
-            if not norm.startswith("javob"):
-                i += 1
-                continue
-
-            parts = correct_line.split(":", 1)
-            if len(parts) == 2:
-                candidate = parts[1].strip()
-            else:
-                # "Javob A" ko'rinishida bo'lsa
-                candidate = correct_line[len("Javob") :].strip()
-
-            correct = candidate.upper()[:1]
-            if correct not in {"A", "B", "C", "D"}:
-                i += 1
-                continue
-
-            rows.append(
-                {
-                    "question_text": question_text,
-                    "choice_a": _clean_choice(a_line),
-                    "choice_b": _clean_choice(b_line),
-                    "choice_c": _clean_choice(c_line),
-                    "choice_d": _clean_choice(d_line),
-                    "correct_answer": correct,
-                }
-            )
-            i += 6
-
-        self._bulk_create_questions(
-            rows, category, request, "DOCX (Word)", chunk_size
+            render_objects(batch)
+            created.extend(Question.objects.bulk_create(batch))
+
+        # bulk_create signal yubormaydi - HTML yuqorida render qilindi, yangi
+        # bo'limlar versiyasini va o'xshashlik imzolarini o'zimiz yangilaymiz
+        bump_question_set_versions(
+            (category.pk, group_number)
+            for group_number in range(max_group + 1, current_group + 1)
         )
-
-    def _create_questions_from_excel(
-        self, upload_file, category, request: HttpRequest, chunk_size: int
-    ):
-        """
-        Excel (XLSX) fayldan savollarni o‘qish.
-
-        Kutilgan ustunlar (birinchi qatorda sarlavha bo‘lishi mumkin):
-
-        A: Savol
-        B: To'g'ri javob
-        C–E: Noto'g'ri javoblar
-        """
-
-        if load_workbook is None:
-            raise RuntimeError("openpyxl o‘rnatilmagan.")
-
-        workbook = load_workbook(upload_file, read_only=True, data_only=True)
-        sheet = workbook.active
-
-        def _cell_to_str(value) -> str:
-            if value is None:
-                return ""
-            return str(value).strip()
-
-        rows: list[dict] = []
-        first = True
-        for row in sheet.iter_rows(values_only=True):
-            if first:
-                # birinchi qator sarlavha deb hisoblaymiz
-                first = False
-                continue
-
-            question_text = _cell_to_str(row[0] if len(row) > 0 else None)
-            correct = _cell_to_str(row[1] if len(row) > 1 else None)
-            wrong1 = _cell_to_str(row[2] if len(row) > 2 else None)
-            wrong2 = _cell_to_str(row[3] if len(row) > 3 else None)
-            wrong3 = _cell_to_str(row[4] if len(row) > 4 else None)
-
-            if not question_text or not correct:
-                continue
-
-            # To'g'ri javobni A qilib, noto'g'ri javoblarni B, C, D ga joylaymiz
-            choices = [correct, wrong1, wrong2, wrong3]
-            # Bo'sh bo'lmaganlarini to'playmiz
-            non_empty = [c for c in choices if c]
-            if len(non_empty) < 2:  # kamida bitta noto'g'ri javob bo'lsin
-                continue
-
-            # Birinchi element to'g'ri javob bo'lib qoladi, qolganlari noto'g'ri
-            choice_a = non_empty[0]
-            other = non_empty[1:4]
-            # Agar 3 tadan kam bo'lsa, qolganlarini bo'sh qoldiramiz
-            while len(other) < 3:
-                other.append("")
-
-            rows.append(
-                {
-                    "question_text": question_text,
-                    "choice_a": choice_a,
-                    "choice_b": other[0],
-                    "choice_c": other[1],
-                    "choice_d": other[2],
-                    "correct_answer": "A",
-                }
-            )
-
-        self._bulk_create_questions(rows, category, request, "Excel (XLSX)", chunk_size)
+        index_objects(created)
+        return created
 
     def render_change_form(self, request, context, *args, **kwargs):
         obj = context.get("original")
@@ -427,9 +370,128 @@ class TestTuriAdmin(admin.ModelAdmin):
 
 @admin.register(Question)
 class QuestionAdmin(admin.ModelAdmin):
+    change_list_template = "admin/testapp/question/change_list.html"
     list_display = ("question_text", "category", "group_number", "correct_answer")
-    list_filter = ("category", "group_number")
+    list_filter = ("category", GroupNumberFilter)
+    list_select_related = ("category",)
     search_fields = ("question_text",)
+    search_help_text = "Savol matni yoki ID raqami bo'yicha qidirish"
+    paginator = EstimatedCountPaginator
+    actions = [
+        "move_to_category",
+        _export_action(exports.export_questions, "csv", "Tanlangan savollarni CSV ga eksport qilish"),
+        _export_action(exports.export_questions, "json", "Tanlangan savollarni JSON ga eksport qilish"),
+        _export_action(exports.export_questions, "xlsx", "Tanlangan savollarni Excel ga eksport qilish"),
+    ]
+    readonly_fields = ("similar_questions",)
+    # Filtrlangan ro'yxatda butun jadval uchun qo'shimcha COUNT(*) qilinmaydi
+    show_full_result_count = False
+
+    @admin.display(description="O'xshash savollar")
+    def similar_questions(self, obj):
+        return _similar_questions(obj)
+
+    def get_search_results(self, request, queryset, search_term):
+        # Raqam kiritilsa - matn bo'yicha skanersiz, birlamchi kalit bo'yicha qidiramiz
+        term = search_term.strip()
+        if term.isdigit():
+            return queryset.filter(pk=int(term)), False
+        if term:
+            found = question_text_search(queryset, term)
+            if found is not None:
+                return found, False
+        return super().get_search_results(request, queryset, search_term)
+
+    def get_urls(self):
+        custom_urls = [
+            path(
+                "duplicates/",
+                self.admin_site.admin_view(self.duplicates_view),
+                name="testapp_question_duplicates",
+            ),
+        ]
+        return custom_urls + super().get_urls()
+
+    def duplicates_view(self, request: HttpRequest):
+        """
+        Deyarli bir xil savollar klasterlari (testapp/similarity.py).
+        ?kind=practice - amaliy savollar, ?scope=<id> - bitta test turi/kategoriya.
+        """
+
+        if not self.has_view_permission(request):
+            raise PermissionDenied
+
+        practice = request.GET.get("kind") == "practice"
+        model = PracticeQuestion if practice else Question
+        scope_model = Category if practice else TestTuri
+        scope = request.GET.get("scope", "")
+        scope_id = int(scope) if scope.isdigit() else None
+
+        clusters = duplicate_clusters(
+            KIND_PRACTICE if practice else KIND_QUESTION, scope_id=scope_id
+        )[:DUPLICATES_REPORT_LIMIT]
+        objects = model.objects.select_related("category").in_bulk(
+            [pk for cluster in clusters for pk in cluster["ids"]]
+        )
+        change_url = f"admin:testapp_{model._meta.model_name}_change"
+        rows = [
+            {
+                "similarity": round(cluster["similarity"] * 100),
+                "questions": [
+                    (objects[pk], reverse(change_url, args=[pk]))
+                    for pk in cluster["ids"]
+                    if pk in objects
+                ],
+            }
+            for cluster in clusters
+        ]
+
+        context = {
+            **self.admin_site.each_context(request),
+            "opts": self.model._meta,
+            "title": "Takroriy savollar",
+            "practice": practice,
+            "scope_id": scope_id,
+            "scopes": scope_model.objects.order_by("name").values_list("pk", "name"),
+            "clusters": rows,
+            "limit": DUPLICATES_REPORT_LIMIT,
+        }
+        return TemplateResponse(request, "admin/testapp/question/duplicates.html", context)
+
+    @admin.action(description="Tanlangan savollarni boshqa test turiga ko'chirish", permissions=["change"])
+    def move_to_category(self, request, queryset):
+        form, response = _bulk_action_form(
+            self, request, queryset, MoveQuestionsForm, "Savollarni ko'chirish"
+        )
+        if form is None:
+            return response
+
+        category = form.cleaned_data["category"]
+        changed = move_questions(queryset, category.pk, form.cleaned_data["group_number"])
+        self.message_user(
+            request,
+            f"{changed} ta savol \"{category}\" test turiga ko'chirildi.",
+            level=messages.SUCCESS,
+        )
+        return None
+
+
+@admin.register(TestSession)
+class TestSessionAdmin(admin.ModelAdmin):
+    list_display = ("id", "category", "group_number", "started_at", "finished_at")
+    list_filter = ("category", ("finished_at", admin.EmptyFieldListFilter))
+    list_select_related = ("category",)
+    date_hierarchy = "started_at"
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    actions = [
+        _export_action(exports.export_results, "csv", "Natijalarni CSV ga eksport qilish"),
+        _export_action(exports.export_results, "xlsx", "Natijalarni Excel ga eksport qilish"),
+    ]
+
+    def has_add_permission(self, request):
+        # Sessiyalar faqat test boshlanganda yaratiladi
+        return False
 
 
 @admin.register(Category)
@@ -445,6 +507,10 @@ class PracticeQuestionAdmin(admin.ModelAdmin):
     list_display = ('question_text', 'category', 'created_at', 'updated_at')
     list_filter = ('category', 'created_at')
     search_fields = ('question_text', 'correct_answer')
-    readonly_fields = ('created_at', 'updated_at')
-    fields = ('category', 'question_text', 'correct_answer', 'created_at', 'updated_at')
+    readonly_fields = ('created_at', 'updated_at', 'similar_questions')
+    fields = ('category', 'question_text', 'correct_answer', 'created_at', 'updated_at', 'similar_questions')
     list_per_page = 20
+
+    @admin.display(description="O'xshash savollar")
+    def similar_questions(self, obj):
+        return _similar_questions(obj)
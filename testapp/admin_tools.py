@@ -0,0 +1,161 @@
+"""
+Katta jadvallar (minglab savollar) uchun admin yordamchilari.
+
+  - `EstimatedCountPaginator` - filtrsiz ro'yxatda har sahifada COUNT(*) o'rniga
+    taxminiy/keshlangan sonni ishlatadi;
+  - `GroupNumberFilter` - bo'limlar ro'yxatini DISTINCT so'rovsiz, keshlangan
+    katalogdan oladi;
+  - `PaginatedInlineFormSet` - inline'da kategoriyaning barcha savollarini emas,
+    faqat bitta sahifasini chiqaradi;
+  - `question_text_search` - SQLite'da savol matni qidiruvini FTS5 (trigram)
+    indeksi bo'yicha bajaradi.
+"""
+
+from __future__ import annotations
+
+import math
+
+from django.contrib import admin
+from django.core.cache import cache
+from django.core.paginator import Paginator
+from django.db import connections
+from django.db.models.expressions import RawSQL
+from django.forms.models import BaseInlineFormSet
+from django.utils.functional import cached_property
+from django.utils.text import smart_split, unescape_string_literal
+
+from .services import build_catalogue
+
+ADMIN_COUNT_CACHE_TIMEOUT = 60
+# Postgres statistikasi shu sondan katta jadval haqida gapirsa, taxminiy son olinadi
+ESTIMATED_COUNT_THRESHOLD = 10_000
+# 0008_question_text_fts migratsiyasi (faqat SQLite)
+QUESTION_FTS_TABLE = "testapp_question_fts"
+# trigram indeksi bundan qisqa so'zni topa olmaydi
+MIN_FTS_TERM_LENGTH = 3
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Filtr yoki qidiruv bo'lmasa, jadvaldagi qatorlar soni:
+    Postgres'da `pg_class.reltuples` statistikasidan, boshqa bazalarda esa
+    qisqa muddat keshlangan COUNT(*) dan olinadi. Filtrlangan ro'yxat aniq
+    sanaladi - u indeks bo'yicha toraytirilgan bo'ladi.
+    """
+
+    @cached_property
+    def count(self) -> int:
+        queryset = self.object_list
+        query = getattr(queryset, "query", None)
+        if query is None or query.where:
+            return super().count
+
+        model = queryset.model
+        connection = connections[queryset.db]
+        if connection.vendor == "postgresql":
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    "SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass",
+                    [model._meta.db_table],
+                )
+                row = cursor.fetchone()
+            if row and row[0] > ESTIMATED_COUNT_THRESHOLD:
+                return int(row[0])
+
+        key = f"testapp:admin:count:{model._meta.label_lower}"
+        total = cache.get(key)
+        if total is None:
+            total = super().count
+            cache.set(key, total, ADMIN_COUNT_CACHE_TIMEOUT)
+        return total
+
+
+class GroupNumberFilter(admin.SimpleListFilter):
+    """
+    `list_filter = ("group_number",)` butun jadval bo'yicha DISTINCT ishlatadi.
+    Bu filtr variantlarni `build_catalogue()` keshidan oladi va test turi
+    tanlangan bo'lsa, faqat uning bo'limlarini ko'rsatadi.
+    """
+
+    title = "Bo'lim raqami"
+    parameter_name = "group_number"
+
+    def lookups(self, request, model_admin):
+        category_id = request.GET.get("category__id__exact")
+        group_numbers = set()
+        for entry in build_catalogue():
+            if category_id and str(entry["id"]) != category_id:
+                continue
+            group_numbers.update(group["group_number"] for group in entry["groups"])
+        return [(str(number), str(number)) for number in sorted(group_numbers)]
+
+    def queryset(self, request, queryset):
+        value = self.value()
+        if value and value.isdigit():
+            return queryset.filter(group_number=int(value))
+        return queryset
+
+
+class PaginatedInlineFormSet(BaseInlineFormSet):
+    """
+    Inline formset, bitta sahifadagi obyektlar bilan ishlaydi.
+
+    Sahifa raqami `page_number` atributi orqali beriladi (`get_formset` da
+    so'rovdan o'qiladi). Change form POST'i ham shu URL'ga yuboriladi,
+    shuning uchun saqlashda ham aynan shu sahifa tekshiriladi.
+    """
+
+    per_page = 50
+    page_number = 1
+    total_count = 0
+    num_pages = 1
+
+    def get_queryset(self):
+        if not hasattr(self, "_queryset"):
+            queryset = super().get_queryset()
+            self.total_count = queryset.count()
+            self.num_pages = max(1, math.ceil(self.total_count / self.per_page))
+            self.page_number = min(max(self.page_number, 1), self.num_pages)
+            start = (self.page_number - 1) * self.per_page
+            self._queryset = queryset[start:start + self.per_page]
+        return self._queryset
+
+    @property
+    def previous_page_number(self) -> int | None:
+        return self.page_number - 1 if self.page_number > 1 else None
+
+    @property
+    def next_page_number(self) -> int | None:
+        return self.page_number + 1 if self.page_number < self.num_pages else None
+
+
+def question_text_search(queryset, search_term: str):
+    """
+    Admin qidiruvi bilan bir xil ma'no: har bir so'z (yoki qo'shtirnoqdagi
+    ibora) matnning qismi, so'zlar AND bilan. 3+ belgili so'zlar FTS5 indeksi
+    bo'yicha, qisqalari esa shu natija ichida icontains bilan tekshiriladi.
+    SQLite bo'lmasa yoki barcha so'zlar qisqa bo'lsa - None (odatiy qidiruv).
+    """
+
+    if connections[queryset.db].vendor != "sqlite":
+        return None
+    words = []
+    for bit in smart_split(search_term):
+        if bit.startswith(('"', "'")) and bit[0] == bit[-1]:
+            bit = unescape_string_literal(bit)
+        if bit:
+            words.append(bit)
+    indexed = [word for word in words if len(word) >= MIN_FTS_TERM_LENGTH]
+    if not indexed:
+        return None
+
+    match = " AND ".join('"' + word.replace('"', '""') + '"' for word in indexed)
+    queryset = queryset.filter(
+        pk__in=RawSQL(
+            f"SELECT rowid FROM {QUESTION_FTS_TABLE} WHERE {QUESTION_FTS_TABLE} MATCH %s", [match]
+        )
+    )
+    for word in words:
+        if len(word) < MIN_FTS_TERM_LENGTH:
+            queryset = queryset.filter(question_text__icontains=word)
+    return queryset
@@ -0,0 +1,238 @@
+"""
+Test topshirish oqimi uchun yengil JSON API (mobil va SPA mijozlar uchun).
+
+  GET  /api/v1/tests/                                        - katalog
+  POST /api/v1/tests/<category_id>/start/                    - sessiya ochish
+  GET  /api/v1/tests/<category_id>/groups/<group>/questions/ - bo'limning hozirgi savollari
+  GET  /api/v1/sessions/<test_session_id>/questions/         - sessiya savollari
+  POST /api/v1/sessions/<test_session_id>/submit/            - javoblarni topshirish
+
+Mijoz savollar to'plamini bir marta oladi va barcha javoblarni bitta
+so'rovda yuboradi. Sessiya ochilganda `questions_url` sessiya savollariga
+ishora qiladi: ular sessiya boshlangan versiya nusxasidan olinadi va ball
+ham shu nusxa bo'yicha hisoblanadi, oradagi tahrirlar ta'sir qilmaydi.
+Savollar javobi versiyaga bog'langan, shuning uchun ETag va Cache-Control
+bilan keshda saqlanishi mumkin.
+POST so'rovlar uchun CSRF token katalog javobida cookie sifatida beriladi.
+Topshirish so'rovi `Idempotency-Key` sarlavhasini qabul qiladi: tarmoq
+uzilib, so'rov qayta yuborilsa (boshqa worker'ga tushsa ham) javoblar qayta
+yozilmaydi va birinchi javob qaytariladi.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+
+from django.core.cache import cache
+from django.db import transaction
+from django.http import HttpRequest, HttpResponse
+from django.shortcuts import get_object_or_404
+from django.urls import reverse
+from django.views.decorators.csrf import ensure_csrf_cookie
+from django.views.decorators.http import require_GET, require_POST
+
+from .models import SubmitToken, TestSession, TestTuri
+from .services import (
+    QUESTION_PAYLOAD_CACHE_TIMEOUT,
+    build_catalogue,
+    build_question_payload,
+    claim_submit_token,
+    create_test_session,
+    finish_session,
+    normalize_answers,
+    question_payload_cache_key,
+    question_set_version,
+    resolve_group_number,
+    save_answers,
+    score,
+    session_answer_key,
+)
+from .throttling import ratelimit
+from .views import _get_or_create_session_key
+
+try:  # ixtiyoriy (requirements-optional.txt): o'rnatilgan bo'lsa, tezroq serializatsiya
+    import orjson
+except ImportError:
+    orjson = None
+
+API_VERSION = 1
+QUESTIONS_MAX_AGE = 5 * 60
+
+
+def _dumps(data) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(data)
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def _json(data, status: int = 200) -> HttpResponse:
+    return HttpResponse(_dumps(data), content_type="application/json", status=status)
+
+
+def _error(message: str, status: int) -> HttpResponse:
+    return _json({"error": message}, status=status)
+
+
+def _request_data(request: HttpRequest) -> dict:
+    if request.content_type == "application/json":
+        try:
+            data = json.loads(request.body or b"{}")
+        except ValueError:
+            return {}
+        return data if isinstance(data, dict) else {}
+    return request.POST.dict()
+
+
+@require_GET
+@ensure_csrf_cookie
+def catalogue(request: HttpRequest) -> HttpResponse:
+    return _json({"version": API_VERSION, "tests": build_catalogue()})
+
+
+@require_POST
+@ratelimit("start")
+def start_session(request: HttpRequest, category_id: int) -> HttpResponse:
+    category = get_object_or_404(TestTuri, pk=category_id)
+    data = _request_data(request)
+    try:
+        requested = int(data.get("group_number") or 1)
+    except (TypeError, ValueError):
+        return _error("group_number butun son bo'lishi kerak.", 400)
+
+    group_number = resolve_group_number(category.pk, requested)
+    if group_number is None:
+        return _error("Ushbu kategoriya uchun savollar mavjud emas.", 404)
+
+    test_session = create_test_session(
+        _get_or_create_session_key(request), category.pk, group_number
+    )
+    return _json(
+        {
+            "session_id": test_session.pk,
+            "category_id": category.pk,
+            "group_number": group_number,
+            "question_set_version": test_session.question_set_version,
+            "questions_url": reverse("api_session_questions", args=[test_session.pk]),
+            "submit_url": reverse("api_submit", args=[test_session.pk]),
+        },
+        status=201,
+    )
+
+
+def _questions_response(
+    request: HttpRequest,
+    category_id: int,
+    group_number: int,
+    version: int,
+    question_ids=None,
+    cache_control: str = "public",
+) -> HttpResponse:
+    key = f"{question_payload_cache_key(category_id, group_number, version)}:json"
+    cached = cache.get(key)
+    if cached is None:
+        payload = build_question_payload(category_id, group_number, version, question_ids)
+        if not payload:
+            return _error("Savollar topilmadi.", 404)
+        body = _dumps(
+            {
+                "category_id": category_id,
+                "group_number": group_number,
+                "version": version,
+                "questions": payload,
+            }
+        )
+        cached = (f'"{hashlib.sha1(body).hexdigest()}"', body)
+        cache.set(key, cached, QUESTION_PAYLOAD_CACHE_TIMEOUT)
+
+    etag, body = cached
+    if etag in request.headers.get("If-None-Match", ""):
+        response = HttpResponse(status=304)
+    else:
+        response = HttpResponse(body, content_type="application/json")
+    response["ETag"] = etag
+    response["Cache-Control"] = f"{cache_control}, max-age={QUESTIONS_MAX_AGE}"
+    return response
+
+
+@require_GET
+def questions(request: HttpRequest, category_id: int, group_number: int) -> HttpResponse:
+    version = question_set_version(category_id, group_number)
+    return _questions_response(request, category_id, group_number, version)
+
+
+@require_GET
+def session_questions(request: HttpRequest, test_session_id: int) -> HttpResponse:
+    test_session = get_object_or_404(TestSession, pk=test_session_id)
+    if test_session.session_key != _get_or_create_session_key(request):
+        return _error("Ushbu test sessiyasiga kirish huquqingiz yo'q.", 404)
+    return _questions_response(
+        request,
+        test_session.category_id,
+        test_session.group_number,
+        test_session.question_set_version,
+        session_answer_key(test_session),
+        cache_control="private",
+    )
+
+
+def _replay(test_session: TestSession, idempotency_key: str) -> HttpResponse | None:
+    body = (
+        SubmitToken.objects.filter(
+            test_session=test_session, scope=SubmitToken.SCOPE_API, token=idempotency_key
+        )
+        .values_list("response", flat=True)
+        .first()
+    )
+    if not body:
+        return None
+    return HttpResponse(body.encode("utf-8"), content_type="application/json")
+
+
+@require_POST
+@ratelimit("submit")
+def submit(request: HttpRequest, test_session_id: int) -> HttpResponse:
+    test_session = get_object_or_404(TestSession, pk=test_session_id)
+    if test_session.session_key != _get_or_create_session_key(request):
+        return _error("Ushbu test sessiyasiga kirish huquqingiz yo'q.", 404)
+
+    raw_answers = _request_data(request).get("answers")
+    if not isinstance(raw_answers, dict):
+        return _error("'answers' {savol_id: javob} ko'rinishida bo'lishi kerak.", 400)
+
+    # Idempotency-Key bilan qayta yuborilgan so'rovga birinchi javob qaytariladi.
+    # Kalit javoblar bilan bitta tranzaksiyada bazaga yoziladi (SubmitToken):
+    # parallel nusxa birinchisi commit bo'lguncha kutadi va uning javobini oladi,
+    # yozish xato bilan tugasa kalit ham yozilmaydi.
+    idempotency_key = request.headers.get("Idempotency-Key", "")[:64]
+    if idempotency_key:
+        replay = _replay(test_session, idempotency_key)
+        if replay is not None:
+            return replay
+
+    key = session_answer_key(test_session)
+    answers = normalize_answers(raw_answers, key.keys())
+    with transaction.atomic():
+        token = None
+        if idempotency_key:
+            token = claim_submit_token(test_session, SubmitToken.SCOPE_API, idempotency_key)
+            if token is None:
+                return _replay(test_session, idempotency_key) or _error(
+                    "So'rov hali bajarilmoqda, birozdan keyin qayta yuboring.", 409
+                )
+        save_answers(test_session, answers)
+        finish_session(test_session)
+
+        body = _dumps(
+            {
+                "session_id": test_session.pk,
+                "finished_at": test_session.finished_at.isoformat(),
+                "answered": len(answers),
+                **score(answers, key),
+                "results_url": reverse("test_results", args=[test_session.pk]),
+            }
+        )
+        if token is not None:
+            token.response = body.decode("utf-8")
+            token.save(update_fields=["response"])
+    return HttpResponse(body, content_type="application/json")
@@ -0,0 +1,201 @@
+"""
+`views.py` dagi test view'larining async (ASGI) variantlari.
+
+`ASYNC_VIEWS=True` (ASGI profilida standart) bo'lsa `urls.py` shu
+view'larni ulaydi. Ular Django'ning async ORM API'sidan foydalanadi, shuning
+uchun imtihon paytida ulanib turgan talabalar har biri alohida oqim
+(thread) band qilmaydi. Template'da lazy FK so'rovlari bo'lmasligi uchun
+bog'langan obyektlar oldindan `select_related` bilan olinadi.
+"""
+
+from __future__ import annotations
+
+from django.http import Http404, HttpRequest, HttpResponse
+from django.shortcuts import aget_object_or_404, redirect, render
+from django.utils.crypto import get_random_string
+from django.views.decorators.http import require_GET, require_http_methods, require_POST
+
+from .models import Category, PracticeQuestion, Question, TestSession, TestTuri
+from .rendering import aquestion_fragments, render_questions
+from .throttling import ratelimit
+from .services import (
+    TEST_TAKER_SESSION_KEY,
+    abuild_catalogue,
+    acreate_test_session,
+    aresolve_group_number,
+    asession_answer_key,
+    asession_answers,
+    asession_questions,
+    asubmit_answers,
+    normalize_answers,
+)
+from .views import (
+    SignedCookieSessionStore,
+    _results_context,
+)
+
+
+async def _aget_or_create_session_key(request: HttpRequest) -> str:
+    """
+    `views._get_or_create_session_key` ning async varianti.
+    """
+
+    session = request.session
+    taker_key = await session.aget(TEST_TAKER_SESSION_KEY)
+    if taker_key:
+        return taker_key
+
+    if session.session_key and not isinstance(session, SignedCookieSessionStore):
+        taker_key = session.session_key
+    else:
+        taker_key = get_random_string(32)
+    await session.aset(TEST_TAKER_SESSION_KEY, taker_key)
+    return taker_key
+
+
+async def _aget_own_session(request: HttpRequest, test_session_id: int) -> TestSession:
+    test_session = await aget_object_or_404(
+        TestSession.objects.select_related("category"), pk=test_session_id
+    )
+    if test_session.session_key != await _aget_or_create_session_key(request):
+        raise Http404("Ushbu test sessiyasiga kirish huquqingiz yo'q.")
+    return test_session
+
+
+async def _agroup_questions(test_session: TestSession) -> list[Question]:
+    return [question async for question in (await asession_questions(test_session)).aiterator()]
+
+
+@require_GET
+async def test_list(request: HttpRequest) -> HttpResponse:
+    category_entries = [
+        {
+            "category": entry,
+            "groups": entry["groups"],
+            "total_questions": entry["total_questions"],
+        }
+        for entry in await abuild_catalogue()
+    ]
+    return render(
+        request,
+        "testapp/test_list.html",
+        {"category_entries": category_entries},
+    )
+
+
+@require_POST
+@ratelimit("start")
+async def start_test(request: HttpRequest, category_id: int) -> HttpResponse:
+    category = await aget_object_or_404(TestTuri, pk=category_id)
+    session_key = await _aget_or_create_session_key(request)
+
+    group_number = await aresolve_group_number(
+        category.pk, int(request.POST.get("group_number", 1) or 1)
+    )
+    if group_number is None:
+        raise Http404("Ushbu kategoriya uchun savollar mavjud emas.")
+
+    test_session = await acreate_test_session(session_key, category.pk, group_number)
+    return redirect("test_run", test_id=test_session.pk)
+
+
+@require_http_methods(["GET", "POST"])
+@ratelimit("submit")
+async def test_run(request: HttpRequest, test_id: int) -> HttpResponse:
+    test_session = await _aget_own_session(request, test_id)
+    fragments = await aquestion_fragments(test_session)
+
+    if not fragments:
+        return render(
+            request,
+            "testapp/test_empty.html",
+            {"test_session": test_session},
+        )
+
+    if request.method == "POST":
+        question_ids = [fragment.question_id for fragment in fragments]
+        answers = normalize_answers(
+            {
+                question_id: request.POST.get(f"question_{question_id}")
+                for question_id in question_ids
+            },
+            question_ids,
+        )
+        # Qayta yuborilgan forma (ikki marta bosish, yangilash) bazaga yozmaydi
+        await asubmit_answers(test_session, answers, request.POST.get("submit_token", ""))
+        return redirect("test_results", test_session_id=test_session.pk)
+
+    user_answers = await asession_answers(test_session)
+    return render(
+        request,
+        "testapp/test_run.html",
+        {
+            "test_session": test_session,
+            "questions_html": render_questions(fragments, user_answers),
+            "total_questions": len(fragments),
+            "submit_token": get_random_string(22),
+        },
+    )
+
+
+@require_GET
+async def test_results(request: HttpRequest, test_session_id: int) -> HttpResponse:
+    test_session = await _aget_own_session(request, test_session_id)
+    questions = await _agroup_questions(test_session)
+    user_answers = await asession_answers(test_session)
+    key = await asession_answer_key(test_session)
+    return render(
+        request,
+        "testapp/test_results.html",
+        _results_context(test_session, questions, user_answers, key),
+    )
+
+
+@require_GET
+async def practice_questions_list(request: HttpRequest) -> HttpResponse:
+    category_slug = request.GET.get("category")
+    questions = (
+        PracticeQuestion.objects.select_related("category")
+        .defer("rendered_html")  # ro'yxatda faqat qisqa oddiy matn
+        .order_by("-created_at")
+    )
+    if category_slug:
+        questions = questions.filter(category__slug=category_slug)
+
+    return render(
+        request,
+        "testapp/practice_questions_list.html",
+        {
+            "questions": [question async for question in questions.aiterator()],
+            "categories": [category async for category in Category.objects.aiterator()],
+            "current_category": category_slug,
+        },
+    )
+
+
+@require_http_methods(["GET", "POST"])
+async def practice_question_detail(request: HttpRequest, question_id: int) -> HttpResponse:
+    question = await aget_object_or_404(PracticeQuestion, pk=question_id)
+
+    user_answer = ""
+    is_correct = None
+    show_result = False
+
+    if request.method == "POST":
+        user_answer = request.POST.get("user_answer", "").strip()
+        show_result = True
+        # Javobni tekshirish (katta/kichik harflarni e'tiborsiz)
+        is_correct = bool(user_answer) and (
+            user_answer.lower() == question.correct_answer.lower().strip()
+        )
+
+    return render(
+        request,
+        "testapp/practice_question_detail.html",
+        {
+            "question": question,
+            "user_answer": user_answer,
+            "is_correct": is_correct,
+            "show_result": show_result,
+        },
+    )
@@ -0,0 +1,26 @@
+"""
+Deploy sozlamalari tekshiruvi (`manage.py check`).
+
+Chastota cheklovi hisoblagichlari keshda: LocMem'da har bir worker o'z
+hisoblagichini yuritadi va chegara worker soniga ko'payib ketadi. Bunday
+holatda cheklovni yoqish rad etiladi - umumiy kesh (`CACHE_URL=redis://...`)
+kerak.
+"""
+
+from __future__ import annotations
+
+from django.conf import settings
+from django.core.checks import Error, register
+
+
+@register()
+def ratelimit_cache_check(app_configs, **kwargs):
+    if settings.RATELIMIT_ENABLED and not settings.SHARED_CACHE:
+        return [
+            Error(
+                "RATELIMIT_ENABLED umumiy keshsiz yoqilgan: har bir worker alohida hisoblaydi.",
+                hint="CACHE_URL=redis://... bering (redis paketi) yoki RATELIMIT_ENABLED=False.",
+                id="testapp.E001",
+            )
+        ]
+    return []
@@ -0,0 +1,310 @@
+"""
+Test natijalari va savollar bazasini eksport qilish (CSV / JSON / XLSX).
+
+Javob `StreamingHttpResponse` orqali bo'laklab yuboriladi: sessiyalar
+`.iterator(chunk_size=...)` bilan o'qiladi, javoblar esa har bir sessiyalar
+bo'lagi uchun alohida so'rov bilan olinadi - million qatorli jadval ham
+xotiraga to'liq yuklanmaydi. XLSX ham oqim bilan yoziladi: kitobning
+qolgan qismlari (uslublar, workbook.xml) openpyxl'dagi bo'sh kitobdan
+olinadi, varaq qatorlari esa ZIP ichiga yozilishi bilan mijozga beriladi -
+na xotirada, na diskda butun fayl to'planmaydi.
+
+Savollar formati `TestTuriAdmin` importi bilan bir xil, shuning uchun
+eksport qilingan faylni boshqa test turiga qayta yuklash mumkin.
+"""
+
+from __future__ import annotations
+
+import csv
+import io
+import json
+import re
+import zipfile
+from collections import defaultdict
+from importlib.util import find_spec
+from itertools import chain, islice
+from xml.sax.saxutils import escape
+
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+
+from .models import UserAnswer
+from .services import archived_score, score, session_answer_key, session_answers
+
+EXPORT_CHUNK_SIZE = 2000
+XLSX_CONTENT_TYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+XLSX_SHEET = "xl/worksheets/sheet1.xml"
+XLSX_CHUNK_SIZE = 64 * 1024
+# XML 1.0 da ruxsat etilmagan boshqaruv belgilari (openpyxl ular bilan xato beradi)
+XML_ILLEGAL_RE = re.compile(r"[\x00-\x08\x0b\x0c\x0e-\x1f]")
+
+RESULT_HEADER = [
+    "session_id",
+    "session_key",
+    "category",
+    "group_number",
+    "question_set_version",
+    "started_at",
+    "finished_at",
+    "duration_seconds",
+    "correct",
+    "total",
+    "percentage",
+    "answers",
+]
+QUESTION_HEADER = [
+    "question_text",
+    "choice_a",
+    "choice_b",
+    "choice_c",
+    "choice_d",
+    "correct_answer",
+]
+
+
+class _Echo:
+    """csv.writer uchun: yozilgan satrni buferlamasdan qaytaradi."""
+
+    def write(self, value):
+        return value
+
+
+def _chunks(iterable, size: int):
+    iterator = iter(iterable)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+def _format_dt(value) -> str:
+    return timezone.localtime(value).isoformat(timespec="seconds") if value else ""
+
+
+# -------------------------------------------------------------------
+# Natijalar
+
+
+def result_rows(queryset, chunk_size: int = EXPORT_CHUNK_SIZE):
+    """
+    Har bir TestSession uchun bitta qator (RESULT_HEADER tartibida).
+
+    `answers` ustuni "savol_id:javob" juftliklari, bo'sh joy bilan ajratilgan.
+    Ball sessiya boshlangan versiya nusxasi (`session_answer_key`) bo'yicha,
+    arxivlangan sessiyada esa saqlab qo'yilgan natijadan olinadi.
+    """
+
+    sessions = (
+        queryset.select_related("category")
+        .order_by("pk")
+        .iterator(chunk_size=chunk_size)
+    )
+    # (test turi, bo'lim, versiya) -> javoblar kaliti; bir xil versiyadagi sessiyalar ko'p
+    keys: dict[tuple[int, int, int], dict[int, str]] = {}
+    for batch in _chunks(sessions, chunk_size):
+        answers_by_session: dict[int, dict[int, str]] = defaultdict(dict)
+        answers = (
+            UserAnswer.objects.filter(test_session_id__in=[session.pk for session in batch])
+            .order_by("test_session_id", "question_id")
+            .values_list("test_session_id", "question_id", "selected_answer")
+            .iterator(chunk_size=chunk_size)
+        )
+        for session_id, question_id, selected in answers:
+            answers_by_session[session_id][question_id] = selected
+
+        for session in batch:
+            if session.question_ids:
+                answers = session_answers(session)
+            else:
+                answers = answers_by_session.get(session.pk, {})
+            if session.archived_at:
+                # Arxivlangan sessiya: ball arxivlash paytidagi holatda
+                result = archived_score(session)
+            else:
+                version = (session.category_id, session.group_number, session.question_set_version)
+                if version not in keys:
+                    keys[version] = session_answer_key(session)
+                result = score(answers, keys[version])
+            duration = (
+                int((session.finished_at - session.started_at).total_seconds())
+                if session.finished_at
+                else ""
+            )
+            yield [
+                session.pk,
+                session.session_key,
+                session.category.name,
+                session.group_number,
+                session.question_set_version,
+                _format_dt(session.started_at),
+                _format_dt(session.finished_at),
+                duration,
+                result["correct"],
+                result["total"],
+                result["percentage"],
+                " ".join(f"{question_id}:{selected}" for question_id, selected in answers.items()),
+            ]
+
+
+# -------------------------------------------------------------------
+# Savollar
+
+
+def question_rows(queryset, chunk_size: int = EXPORT_CHUNK_SIZE):
+    return (
+        queryset.order_by("category_id", "group_number", "id")
+        .values_list(*QUESTION_HEADER)
+        .iterator(chunk_size=chunk_size)
+    )
+
+
+def _question_xlsx_rows(queryset):
+    # Import formati: A - savol, B - to'g'ri javob, C-E - noto'g'ri javoblar
+    for text, *choices, correct in question_rows(queryset):
+        index = "ABCD".find(correct)
+        right = choices[index] if index >= 0 else ""
+        wrong = [choice for position, choice in enumerate(choices) if position != index]
+        yield [text, right, *wrong]
+
+
+# -------------------------------------------------------------------
+# Oqimli javoblar
+
+
+def _csv_stream(header, rows, bom: bool = False):
+    writer = csv.writer(_Echo())
+    # Excel UTF-8 faylni to'g'ri ochishi uchun BOM (import qilinadigan
+    # savollar faylida kerak emas - CSV importi uni sarlavhaning bir qismi deb o'qiydi)
+    yield ("\ufeff" if bom else "") + writer.writerow(header)
+    for row in rows:
+        yield writer.writerow(row)
+
+
+def xlsx_available() -> bool:
+    # openpyxl'ni import qilmasdan tekshiradi - u faqat XLSX eksportida yuklanadi
+    return find_spec("openpyxl") is not None
+
+
+class _ZipBuffer:
+    """ZipFile uchun: yozilgan baytlarni oqimga berilguncha yig'ib turadi."""
+
+    def __init__(self):
+        self.chunks: list[bytes] = []
+        self.size = 0
+
+    def write(self, data) -> int:
+        self.chunks.append(bytes(data))
+        self.size += len(data)
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self) -> bytes:
+        data = b"".join(self.chunks)
+        self.chunks.clear()
+        self.size = 0
+        return data
+
+
+def _xlsx_row(number: int, row, columns: list[str]) -> bytes:
+    # openpyxl write-only rejimi kabi: matn - inlineStr, son - t="n"
+    cells = []
+    for column, value in zip(columns, row):
+        if value is None or value == "":
+            continue
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            cells.append(f'<c r="{column}{number}" t="n"><v>{value}</v></c>')
+        else:
+            text = escape(XML_ILLEGAL_RE.sub("", str(value)))
+            cells.append(
+                f'<c r="{column}{number}" t="inlineStr"><is><t xml:space="preserve">{text}</t></is></c>'
+            )
+    return f'<row r="{number}">{"".join(cells)}</row>'.encode("utf-8")
+
+
+def _xlsx_stream(header, rows, title: str):
+    from openpyxl import Workbook
+    from openpyxl.utils import get_column_letter
+
+    # Bo'sh kitob bir necha KB: undan varaqdan boshqa barcha qismlar ko'chiriladi
+    template = io.BytesIO()
+    workbook = Workbook(write_only=True)
+    workbook.create_sheet(title=title[:31])
+    workbook.save(template)
+
+    columns = [get_column_letter(index) for index in range(1, len(header) + 1)]
+    buffer = _ZipBuffer()
+    with zipfile.ZipFile(template) as source, zipfile.ZipFile(
+        buffer, "w", zipfile.ZIP_DEFLATED
+    ) as target:
+        for name in source.namelist():
+            if name != XLSX_SHEET:
+                target.writestr(name, source.read(name))
+                continue
+            head, tail = source.read(name).split(b"<sheetData></sheetData>")
+            # Orqaga qaytib bo'lmaydigan (seek qilinmaydigan) oqim: o'lcham va CRC
+            # ma'lumotlar deskriptorida, 4 GB dan katta varaq uchun ZIP64
+            with target.open(name, "w", force_zip64=True) as sheet:
+                sheet.write(head + b"<sheetData>")
+                for number, row in enumerate(chain([header], rows), start=1):
+                    sheet.write(_xlsx_row(number, row, columns))
+                    if buffer.size >= XLSX_CHUNK_SIZE:
+                        yield buffer.drain()
+                sheet.write(b"</sheetData>" + tail)
+    # Markaziy katalog ZipFile yopilganda yoziladi
+    yield buffer.drain()
+
+
+def _json_questions_stream(queryset):
+    yield '{"questions": ['
+    for index, row in enumerate(question_rows(queryset)):
+        item = json.dumps(dict(zip(QUESTION_HEADER, row)), ensure_ascii=False)
+        yield ("," if index else "") + "\n" + item
+    yield "\n]}\n"
+
+
+def _response(stream, content_type: str, filename: str) -> StreamingHttpResponse:
+    response = StreamingHttpResponse(stream, content_type=content_type)
+    response["Content-Disposition"] = f'attachment; filename="{filename}"'
+    return response
+
+
+def _filename(prefix: str, extension: str) -> str:
+    return f"{prefix}-{timezone.localtime():%Y%m%d-%H%M%S}.{extension}"
+
+
+def export_results(queryset, file_format: str) -> StreamingHttpResponse:
+    if file_format == "xlsx":
+        return _response(
+            _xlsx_stream(RESULT_HEADER, result_rows(queryset), "Natijalar"),
+            XLSX_CONTENT_TYPE,
+            _filename("natijalar", "xlsx"),
+        )
+    return _response(
+        _csv_stream(RESULT_HEADER, result_rows(queryset), bom=True),
+        "text/csv; charset=utf-8",
+        _filename("natijalar", "csv"),
+    )
+
+
+def export_questions(queryset, file_format: str) -> StreamingHttpResponse:
+    if file_format == "xlsx":
+        return _response(
+            _xlsx_stream(
+                ["Savol", "To'g'ri javob", "Noto'g'ri 1", "Noto'g'ri 2", "Noto'g'ri 3"],
+                _question_xlsx_rows(queryset),
+                "Savollar",
+            ),
+            XLSX_CONTENT_TYPE,
+            _filename("savollar", "xlsx"),
+        )
+    if file_format == "json":
+        return _response(
+            _json_questions_stream(queryset),
+            "application/json; charset=utf-8",
+            _filename("savollar", "json"),
+        )
+    return _response(
+        _csv_stream(QUESTION_HEADER, question_rows(queryset)),
+        "text/csv; charset=utf-8",
+        _filename("savollar", "csv"),
+    )
@@ -0,0 +1,68 @@
+"""
+Savollarni fayldan yuklash (CSV / JSON / DOCX / XLSX) parserlari.
+
+Paketni import qilish hech qanday og'ir kutubxonani yuklamaydi: python-docx
+(lxml bilan birga) va openpyxl shu formatdagi fayl birinchi marta
+yuklanganda import qilinadi. Upload'ni hech qachon ko'rmaydigan worker'lar
+`django.setup()` paytida ularni xotiraga olmaydi.
+
+Har bir parser fayl obyektini olib, `TestTuriAdmin._bulk_create_questions`
+kutadigan lug'atlar ro'yxatini qaytaradi.
+"""
+
+from __future__ import annotations
+
+from importlib import import_module
+
+# kengaytma -> (modul, funksiya, manba nomi, o'rnatilmagan bo'lsa xabar)
+FORMATS = {
+    ".csv": ("tabular", "parse_csv", "CSV", None),
+    ".json": ("tabular", "parse_json", "JSON", None),
+    ".docx": (
+        "word",
+        "parse_docx",
+        "DOCX (Word)",
+        "DOCX fayllarni o‘qish uchun avval 'python-docx' paketini o‘rnating.",
+    ),
+    ".xlsx": (
+        "excel",
+        "parse_excel",
+        "Excel (XLSX)",
+        "Excel fayllarni o‘qish uchun avval 'openpyxl' paketini o‘rnating.",
+    ),
+}
+
+
+class UnsupportedFormat(Exception):
+    pass
+
+
+class MissingDependency(Exception):
+    pass
+
+
+def get_parser(filename: str):
+    """
+    Fayl nomiga mos `(parser, manba nomi)` juftligi. Parser moduli (va uning
+    kutubxonasi) shu yerda, birinchi chaqiruvda import qilinadi.
+    """
+
+    name = filename.lower()
+    for extension, (module_name, function, source, missing) in FORMATS.items():
+        if name.endswith(extension):
+            break
+    else:
+        raise UnsupportedFormat("Faqat CSV, JSON, DOCX yoki Excel (XLSX) fayl yuklash mumkin.")
+
+    try:
+        module = import_module(f".{module_name}", __name__)
+    except ImportError as exc:
+        if missing is None:
+            raise
+        raise MissingDependency(missing) from exc
+    return getattr(module, function), source
+
+
+def parse_upload(upload_file) -> tuple[list[dict], str]:
+    parse, source = get_parser(upload_file.name)
+    return parse(upload_file), source
@@ -0,0 +1,69 @@
+"""
+Excel (XLSX) fayldan savollarni o‘qish.
+
+Kutilgan ustunlar (birinchi qatorda sarlavha bo‘lishi mumkin):
+
+A: Savol
+B: To'g'ri javob
+C–E: Noto'g'ri javoblar
+"""
+
+from __future__ import annotations
+
+from openpyxl import load_workbook
+
+
+def _cell_to_str(value) -> str:
+    if value is None:
+        return ""
+    return str(value).strip()
+
+
+def parse_excel(upload_file) -> list[dict]:
+    workbook = load_workbook(upload_file, read_only=True, data_only=True)
+    sheet = workbook.active
+
+    rows: list[dict] = []
+    first = True
+    for row in sheet.iter_rows(values_only=True):
+        if first:
+            # birinchi qator sarlavha deb hisoblaymiz
+            first = False
+            continue
+
+        question_text = _cell_to_str(row[0] if len(row) > 0 else None)
+        correct = _cell_to_str(row[1] if len(row) > 1 else None)
+        wrong1 = _cell_to_str(row[2] if len(row) > 2 else None)
+        wrong2 = _cell_to_str(row[3] if len(row) > 3 else None)
+        wrong3 = _cell_to_str(row[4] if len(row) > 4 else None)
+
+        if not question_text or not correct:
+            continue
+
+        # To'g'ri javobni A qilib, noto'g'ri javoblarni B, C, D ga joylaymiz
+        choices = [correct, wrong1, wrong2, wrong3]
+        # Bo'sh bo'lmaganlarini to'playmiz
+        non_empty = [c for c in choices if c]
+        if len(non_empty) < 2:  # kamida bitta noto'g'ri javob bo'lsin
+            continue
+
+        # Birinchi element to'g'ri javob bo'lib qoladi, qolganlari noto'g'ri
+        choice_a = non_empty[0]
+        other = non_empty[1:4]
+        # Agar 3 tadan kam bo'lsa, qolganlarini bo'sh qoldiramiz
+        while len(other) < 3:
+            other.append("")
+
+        rows.append(
+            {
+                "question_text": question_text,
+                "choice_a": choice_a,
+                "choice_b": other[0],
+                "choice_c": other[1],
+                "choice_d": other[2],
+                "correct_answer": "A",
+            }
+        )
+
+    workbook.close()
+    return rows
@@ -0,0 +1,33 @@
+"""
+CSV va JSON fayllar: ustunlar/kalitlar savol modeli maydonlari bilan bir xil.
+"""
+
+from __future__ import annotations
+
+import csv
+import io
+import json
+
+
+def _row(item) -> dict:
+    return {
+        "question_text": item["question_text"],
+        "choice_a": item["choice_a"],
+        "choice_b": item["choice_b"],
+        "choice_c": item["choice_c"],
+        "choice_d": item["choice_d"],
+        "correct_answer": item["correct_answer"].upper(),
+    }
+
+
+def parse_csv(upload_file) -> list[dict]:
+    decoded = upload_file.read().decode("utf-8")
+    reader = csv.DictReader(io.StringIO(decoded))
+    return [_row(row) for row in reader if row.get("question_text")]
+
+
+def parse_json(upload_file) -> list[dict]:
+    data = json.load(upload_file)
+    if isinstance(data, dict):
+        data = data.get("questions", [])
+    return [_row(item) for item in data if item.get("question_text")]
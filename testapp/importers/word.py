@@ -0,0 +1,78 @@
+"""
+Word (DOCX) fayldan savollarni o‘qish.
+
+Kutilgan format (takrorlanadi):
+
+Savol matni
+A) variant A
+B) variant B
+C) variant C
+D) variant D
+Javob: A
+
+Bo'sh qatordan keyin keyingi savol.
+"""
+
+from __future__ import annotations
+
+from docx import Document
+
+
+def _clean_choice(line: str) -> str:
+    # "A) matn" yoki "A. matn" bo'lsa, boshini olib tashlaymiz
+    if len(line) > 2 and line[1] in [")", "."]:
+        return line[2:].lstrip()
+    return line
+
+
+def parse_docx(upload_file) -> list[dict]:
+    document = Document(upload_file)
+    lines = [p.text.strip() for p in document.paragraphs if p.text.strip()]
+
+    rows = []
+    i = 0
+    n = len(lines)
+
+    while i + 6 <= n:
+        question_text = lines[i]
+        a_line = lines[i + 1]
+        b_line = lines[i + 2]
+        c_line = lines[i + 3]
+        d_line = lines[i + 4]
+        correct_line = lines[i + 5]
+
+        if not question_text or not correct_line:
+            i += 1
+            continue
+
+        # Endi format: "Javob: A" yoki "Javob A"
+        norm = correct_line.lower()
+        if not norm.startswith("javob"):
+            i += 1
+            continue
+
+        parts = correct_line.split(":", 1)
+        if len(parts) == 2:
+            candidate = parts[1].strip()
+        else:
+            # "Javob A" ko'rinishida bo'lsa
+            candidate = correct_line[len("Javob") :].strip()
+
+        correct = candidate.upper()[:1]
+        if correct not in {"A", "B", "C", "D"}:
+            i += 1
+            continue
+
+        rows.append(
+            {
+                "question_text": question_text,
+                "choice_a": _clean_choice(a_line),
+                "choice_b": _clean_choice(b_line),
+                "choice_c": _clean_choice(c_line),
+                "choice_d": _clean_choice(d_line),
+                "correct_answer": correct,
+            }
+        )
+        i += 6
+
+    return rows
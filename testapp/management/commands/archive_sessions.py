@@ -0,0 +1,129 @@
+"""
+Test sessiyalarini saqlash siyosati (retention).
+
+    python manage.py archive_sessions --batch-size 500 --sleep 0.05
+
+  1. `TEST_SESSION_ABANDON_HOURS` dan oldin boshlangan va tugallanmagan
+     (tashlab ketilgan) sessiyalar javoblari bilan birga o'chiriladi;
+  2. `TEST_SESSION_ARCHIVE_DAYS` dan eski tugallangan sessiyalar arxivlanadi:
+     ball va javoblar sessiya qatoriga ixcham yoziladi, UserAnswer qatorlari
+     o'chiriladi (`services.archive_sessions`);
+  3. oxirida SQLite'da VACUUM va ANALYZE, Postgres'da VACUUM ANALYZE.
+
+Ish kichik tranzaksiyalar bilan bajariladi, oraliqdagi pauza imtihon
+paytidagi yozuvlarga yo'l beradi. Cron yoki systemd timer orqali kuniga bir
+marta ishga tushirish tavsiya etiladi.
+"""
+
+from __future__ import annotations
+
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.utils import timezone
+
+from testapp.models import SessionQuestionOrder, SubmitToken, TestSession, UserAnswer
+from testapp.services import archive_sessions
+
+
+class Command(BaseCommand):
+    help = "Tashlab ketilgan sessiyalarni o'chiradi, eskilarini arxivlaydi va bazani ixchamlaydi."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--abandon-hours", type=int, default=settings.TEST_SESSION_ABANDON_HOURS,
+                            help="Shuncha soatdan oldin boshlangan tugallanmagan sessiyalar o'chiriladi.")
+        parser.add_argument("--archive-days", type=int, default=settings.TEST_SESSION_ARCHIVE_DAYS,
+                            help="Shuncha kundan eski tugallangan sessiyalar arxivlanadi.")
+        parser.add_argument("--batch-size", type=int, default=500)
+        parser.add_argument("--sleep", type=float, default=0.05,
+                            help="Bo'laklar orasidagi pauza, soniyada.")
+        parser.add_argument("--max-batches", type=int, default=None,
+                            help="Har bir bosqich uchun bo'laklar soni chegarasi.")
+        parser.add_argument("--no-vacuum", action="store_true",
+                            help="VACUUM/ANALYZE bosqichini o'tkazib yuborish.")
+
+    def handle(self, *args, **options):
+        now = timezone.now()
+
+        abandoned = TestSession.objects.filter(
+            finished_at__isnull=True,
+            started_at__lt=now - timedelta(hours=options["abandon_hours"]),
+        )
+        deleted, batches = self._in_batches(abandoned, self._delete_batch, options)
+        self.stdout.write(f"{deleted} ta tashlab ketilgan sessiya o'chirildi ({batches} bo'lak).")
+
+        finished = TestSession.objects.filter(
+            finished_at__lt=now - timedelta(days=options["archive_days"]),
+            archived_at__isnull=True,
+        )
+        archived, batches = self._in_batches(finished, archive_sessions, options)
+        self.stdout.write(f"{archived} ta sessiya arxivlandi ({batches} bo'lak).")
+
+        if not options["no_vacuum"]:
+            self._compact()
+
+        self.stdout.write(self.style.SUCCESS("Tayyor."))
+
+    def _in_batches(self, queryset, process, options):
+        batch_size = options["batch_size"]
+        done = 0
+        batches = 0
+        last_pk = 0
+        while options["max_batches"] is None or batches < options["max_batches"]:
+            ids = list(
+                queryset.filter(pk__gt=last_pk)
+                .order_by("pk")
+                .values_list("pk", flat=True)[:batch_size]
+            )
+            if not ids:
+                break
+            done += process(ids)
+            batches += 1
+            last_pk = ids[-1]
+            if len(ids) < batch_size:
+                break
+            if options["sleep"]:
+                time.sleep(options["sleep"])
+        return done, batches
+
+    def _delete_batch(self, ids) -> int:
+        # Cascade'ni Django'ga qoldirmasdan: ORM .delete() har bir bog'liq qatorni
+        # avval xotiraga yig'adi, bu yerda esa har bir jadvalga bitta DELETE.
+        # TestSession'ga bog'liq yangi jadval qo'shilsa, shu ro'yxatga ham qo'shilsin.
+        with transaction.atomic():
+            # Oraliqda tugallangan sessiyalar tegilmaydi
+            ids = list(
+                TestSession.objects.select_for_update()
+                .filter(pk__in=ids, finished_at__isnull=True)
+                .values_list("pk", flat=True)
+            )
+            if not ids:
+                return 0
+            placeholders = ", ".join(["%s"] * len(ids))
+            with connection.cursor() as cursor:
+                for model in (UserAnswer, SessionQuestionOrder, SubmitToken):
+                    cursor.execute(
+                        f'DELETE FROM "{model._meta.db_table}" WHERE "test_session_id" IN ({placeholders})',
+                        ids,
+                    )
+                cursor.execute(
+                    f'DELETE FROM "{TestSession._meta.db_table}" WHERE "id" IN ({placeholders})',
+                    ids,
+                )
+        return len(ids)
+
+    def _compact(self):
+        tables = [TestSession._meta.db_table, UserAnswer._meta.db_table]
+        with connection.cursor() as cursor:
+            if connection.vendor == "sqlite":
+                # VACUUM tranzaksiyadan tashqarida ishlaydi va faylni qayta yozadi
+                cursor.execute("VACUUM")
+                for table in tables:
+                    cursor.execute(f'ANALYZE "{table}"')
+            elif connection.vendor == "postgresql":
+                for table in tables:
+                    cursor.execute(f'VACUUM ANALYZE "{table}"')
+        self.stdout.write("VACUUM/ANALYZE bajarildi.")
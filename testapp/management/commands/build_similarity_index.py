@@ -0,0 +1,69 @@
+"""
+Savollar o'xshashlik indeksini (MinHash imzolari va LSH bo'laklari) qurish.
+
+    python manage.py build_similarity_index             # yangi va o'zgargan savollar
+    python manage.py build_similarity_index --rebuild   # hammasini qaytadan
+    python manage.py build_similarity_index --kind practice --report
+
+Imzolar savol saqlanganda o'zi yangilanadi (testapp/signals.py); buyruq
+birinchi marta, `update()`/SQL bilan o'zgartirilgan savollardan keyin yoki
+similarity.py parametrlari o'zgarganda ishga tushiriladi.
+"""
+
+from __future__ import annotations
+
+import time
+
+from django.core.management.base import BaseCommand
+
+from testapp.models import PracticeQuestion, Question, QuestionSignature
+from testapp.similarity import KIND_PRACTICE, KIND_QUESTION, duplicate_clusters, index_objects
+
+KINDS = {
+    "question": (KIND_QUESTION, Question, "question"),
+    "practice": (KIND_PRACTICE, PracticeQuestion, "practice_question"),
+}
+
+
+class Command(BaseCommand):
+    help = "Deyarli bir xil savollarni topish uchun o'xshashlik indeksini quradi."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--kind", choices=[*KINDS, "all"], default="all")
+        parser.add_argument("--rebuild", action="store_true",
+                            help="Mavjud imzolarni o'chirib, hammasini qaytadan hisoblash.")
+        parser.add_argument("--chunk-size", type=int, default=1000)
+        parser.add_argument("--report", action="store_true",
+                            help="Qurilgandan keyin takroriy savollar klasterlarini chiqarish.")
+
+    def handle(self, *args, **options):
+        kinds = list(KINDS) if options["kind"] == "all" else [options["kind"]]
+        for name in kinds:
+            kind, model, field = KINDS[name]
+            if options["rebuild"]:
+                QuestionSignature.objects.filter(**{f"{field}__isnull": False}).delete()
+
+            started = time.perf_counter()
+            total = 0
+            queryset = model.objects.order_by("pk")
+            last_pk = 0
+            while True:
+                chunk = list(queryset.filter(pk__gt=last_pk)[:options["chunk_size"]])
+                if not chunk:
+                    break
+                index_objects(chunk)
+                total += len(chunk)
+                last_pk = chunk[-1].pk
+            self.stdout.write(
+                f"{model._meta.verbose_name_plural}: {total} ta, "
+                f"{time.perf_counter() - started:.1f} s"
+            )
+
+            if options["report"]:
+                clusters = duplicate_clusters(kind)
+                self.stdout.write(
+                    f"  takroriy klasterlar: {len(clusters)}, "
+                    f"savollar: {sum(len(cluster['ids']) for cluster in clusters)}"
+                )
+                for cluster in clusters[:20]:
+                    self.stdout.write(f"  {cluster['similarity']:.2f}  {cluster['ids']}")
@@ -0,0 +1,247 @@
+"""
+Benchmark va yuklama testlari uchun sintetik ma'lumotlar generatori.
+
+    python manage.py generate_data --test-types 10 --groups 5 \
+        --questions-per-group 25 --sessions 2000 --practice 500 --books 200 --team 12
+
+Yaratilgan barcha yozuvlar `GENERATED_PREFIX` bilan belgilanadi va
+`--flush` bilan (boshqa ma'lumotlarga tegmasdan) o'chiriladi. `--flush`
+to'xtab qolgan benchmark'lardan qolgan `bench-` sessiyalarni ham o'chiradi.
+"""
+
+from __future__ import annotations
+
+import random
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+from django.utils.crypto import get_random_string
+from django.utils.text import slugify
+
+from mainapp.models import Book, TeamMember
+from testapp.management.harness import delete_bench_data
+from testapp.models import (
+    Category,
+    PracticeQuestion,
+    Question,
+    TestSession,
+    TestTuri,
+    UserAnswer,
+)
+
+GENERATED_PREFIX = "[gen]"
+GENERATED_SESSION_PREFIX = "gen-"
+BATCH_SIZE = 1000
+
+WORDS = (
+    "yurak qon tomir hujayra to'qima nerv suyak mushak o'pka jigar buyrak "
+    "gormon ferment oqsil vitamin immunitet infeksiya diagnostika terapiya "
+    "anatomiya fiziologiya farmakologiya patologiya gistologiya biokimyo"
+).split()
+
+
+def _sentence(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(words)).capitalize()
+
+
+class Command(BaseCommand):
+    help = "Benchmark uchun berilgan hajmdagi sintetik ma'lumotlarni yaratadi."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--test-types", type=int, default=5)
+        parser.add_argument("--groups", type=int, default=4,
+                            help="Har bir test turidagi bo'limlar soni.")
+        parser.add_argument("--questions-per-group", type=int, default=25)
+        parser.add_argument("--sessions", type=int, default=500)
+        parser.add_argument("--finished-ratio", type=float, default=0.8,
+                            help="Yakunlangan sessiyalar ulushi (0..1).")
+        parser.add_argument("--practice", type=int, default=200)
+        parser.add_argument("--books", type=int, default=50)
+        parser.add_argument("--team", type=int, default=10)
+        parser.add_argument("--seed", type=int, default=42)
+        parser.add_argument("--flush", action="store_true",
+                            help="Oldin yaratilgan sintetik ma'lumotlarni o'chirish.")
+
+    def handle(self, *args, **options):
+        if options["flush"]:
+            self._flush()
+            return
+
+        rng = random.Random(options["seed"])
+        started = time.perf_counter()
+        with transaction.atomic():
+            group_questions = self._questions(rng, options)
+            answers = self._sessions(rng, options, group_questions)
+            self._practice(rng, options["practice"])
+            self._books(rng, options["books"])
+            self._team(rng, options["team"])
+
+        questions = sum(len(ids) for ids in group_questions.values())
+        self.stdout.write(self.style.SUCCESS(
+            f"{options['test_types']} test turi, {questions} savol, "
+            f"{options['sessions']} sessiya, {answers} javob, "
+            f"{options['practice']} amaliy savol, {options['books']} kitob, "
+            f"{options['team']} jamoa a'zosi - {time.perf_counter() - started:.1f}s"
+        ))
+
+    def _questions(self, rng: random.Random, options) -> dict[tuple[int, int], list[int]]:
+        categories = TestTuri.objects.bulk_create(
+            [
+                TestTuri(
+                    name=f"{GENERATED_PREFIX} Test turi {index}",
+                    description=_sentence(rng, 12),
+                )
+                for index in range(1, options["test_types"] + 1)
+            ]
+        )
+        Question.objects.bulk_create(
+            (
+                Question(
+                    category=category,
+                    question_text=f"{_sentence(rng, rng.randint(8, 25))}?",
+                    choice_a=_sentence(rng, rng.randint(2, 6)),
+                    choice_b=_sentence(rng, rng.randint(2, 6)),
+                    choice_c=_sentence(rng, rng.randint(2, 6)),
+                    choice_d=_sentence(rng, rng.randint(2, 6)),
+                    correct_answer=rng.choice("ABCD"),
+                    group_number=group_number,
+                )
+                for category in categories
+                for group_number in range(1, options["groups"] + 1)
+                for _ in range(options["questions_per_group"])
+            ),
+            batch_size=BATCH_SIZE,
+        )
+
+        group_questions: dict[tuple[int, int], list[int]] = {}
+        rows = (
+            Question.objects.filter(category__in=categories)
+            .order_by("id")
+            .values_list("category_id", "group_number", "id")
+        )
+        for category_id, group_number, question_id in rows:
+            group_questions.setdefault((category_id, group_number), []).append(question_id)
+        return group_questions
+
+    def _sessions(self, rng: random.Random, options, group_questions) -> int:
+        if not group_questions:
+            return 0
+        groups = list(group_questions)
+        now = timezone.now()
+
+        sessions = []
+        for _ in range(options["sessions"]):
+            category_id, group_number = rng.choice(groups)
+            started_at = now - timedelta(minutes=rng.randint(10, 60 * 24 * 90))
+            finished = rng.random() < options["finished_ratio"]
+            sessions.append(
+                TestSession(
+                    session_key=f"{GENERATED_SESSION_PREFIX}{get_random_string(20)}",
+                    category_id=category_id,
+                    group_number=group_number,
+                    started_at=started_at,
+                    finished_at=started_at + timedelta(minutes=rng.randint(5, 40)) if finished else None,
+                )
+            )
+        TestSession.objects.bulk_create(sessions, batch_size=BATCH_SIZE)
+
+        created = 0
+        batch: list[UserAnswer] = []
+        # bulk_create SQLite va Postgres'da yaratilgan pk'larni qaytaradi
+        for test_session in sessions:
+            question_ids = group_questions[(test_session.category_id, test_session.group_number)]
+            # Yakunlanmagan sessiyalarda javoblar qisman bo'ladi
+            answered = (
+                question_ids
+                if test_session.finished_at
+                else question_ids[: rng.randint(0, len(question_ids))]
+            )
+            for question_id in answered:
+                if rng.random() < 0.95:
+                    batch.append(
+                        UserAnswer(
+                            test_session_id=test_session.pk,
+                            question_id=question_id,
+                            selected_answer=rng.choice("ABCD"),
+                        )
+                    )
+            if len(batch) >= BATCH_SIZE:
+                UserAnswer.objects.bulk_create(batch)
+                created += len(batch)
+                batch = []
+        if batch:
+            UserAnswer.objects.bulk_create(batch)
+            created += len(batch)
+        return created
+
+    def _practice(self, rng: random.Random, count: int) -> None:
+        if not count:
+            return
+        categories = Category.objects.bulk_create(
+            [
+                Category(
+                    name=f"{GENERATED_PREFIX} {word}",
+                    slug=slugify(f"gen-{word}-{get_random_string(8)}"),
+                )
+                for word in rng.sample(WORDS, 5)
+            ]
+        )
+        PracticeQuestion.objects.bulk_create(
+            (
+                PracticeQuestion(
+                    category=rng.choice(categories),
+                    question_text=f"{GENERATED_PREFIX} {_sentence(rng, rng.randint(10, 40))}?",
+                    correct_answer=_sentence(rng, rng.randint(1, 5)),
+                )
+                for _ in range(count)
+            ),
+            batch_size=BATCH_SIZE,
+        )
+
+    def _books(self, rng: random.Random, count: int) -> None:
+        Book.objects.bulk_create(
+            (
+                Book(
+                    title=f"{GENERATED_PREFIX} {_sentence(rng, rng.randint(2, 6))}",
+                    description=_sentence(rng, rng.randint(10, 40)),
+                    file=f"books/generated-{index}.pdf",
+                )
+                for index in range(count)
+            ),
+            batch_size=BATCH_SIZE,
+        )
+
+    def _team(self, rng: random.Random, count: int) -> None:
+        TeamMember.objects.bulk_create(
+            [
+                TeamMember(
+                    name=f"{GENERATED_PREFIX} A'zo {index}",
+                    position=rng.choice(["Dotsent", "Professor", "Assistent", "Dasturchi"]),
+                    bio=_sentence(rng, 30),
+                    order=index,
+                )
+                for index in range(count)
+            ]
+        )
+
+    def _flush(self) -> None:
+        with transaction.atomic():
+            deleted = {
+                "sessions": TestSession.objects.filter(
+                    session_key__startswith=GENERATED_SESSION_PREFIX
+                ).delete()[0],
+                "test_types": TestTuri.objects.filter(name__startswith=GENERATED_PREFIX).delete()[0],
+                "practice": PracticeQuestion.objects.filter(
+                    question_text__startswith=GENERATED_PREFIX
+                ).delete()[0],
+                "categories": Category.objects.filter(name__startswith=GENERATED_PREFIX).delete()[0],
+                "books": Book.objects.filter(title__startswith=GENERATED_PREFIX).delete()[0],
+                "team": TeamMember.objects.filter(name__startswith=GENERATED_PREFIX).delete()[0],
+                "bench_sessions": delete_bench_data()["sessions"],
+            }
+        self.stdout.write(self.style.SUCCESS(
+            "O'chirildi: " + ", ".join(f"{key}={value}" for key, value in deleted.items())
+        ))
@@ -0,0 +1,419 @@
+"""
+Imtihon to'lqinini simulyatsiya qiluvchi lokal yuklama testi.
+
+    # jarayon ichida, WSGI handler orqali (oqimlar)
+    python manage.py loadtest --students 300 --concurrency 50
+    # jarayon ichida, ASGI handler orqali (asyncio)
+    python manage.py loadtest --target asgi --students 300 --concurrency 100
+    # ishlab turgan serverga HTTP orqali
+    python manage.py loadtest --url http://127.0.0.1:8000 --students 300
+    # vaqtinchalik 25 savolli bo'limda, hamma talaba bir vaqtda
+    python manage.py loadtest --questions 25 --students 50 --concurrency 50
+
+Har bir virtual talaba o'z cookie sessiyasi bilan haqiqiy oqimni bosib
+o'tadi: test_list -> start_test -> test_run (GET) -> test_run (POST) ->
+test_results. Savol maydonlari test_run sahifasidan o'qiladi, kategoriya
+va bo'lim /api/v1/tests/ katalogidan tanlanadi.
+
+Har bir endpoint uchun o'tkazuvchanlik, p50/p95/p99 kechikish, xatolar va
+"database is locked" ulushi chiqariladi. Lock xatolarini faqat jarayon
+ichidagi rejimlar ajrata oladi; HTTP rejimida ular 5xx sifatida ko'rinadi.
+
+Jarayon ichidagi rejimlarda talabalar `bench-` kaliti bilan ishlaydi va
+yaratilgan test sessiyalari (hamda `--questions` bo'limi) oxirida
+o'chiriladi. HTTP rejimida sessiyalar server bazasida qoladi - uni
+vaqtinchalik bazaga qarshi ishga tushiring.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import http.cookiejar
+import json
+import random
+import re
+import threading
+import time
+import urllib.error
+import urllib.request
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlencode
+
+from asgiref.sync import sync_to_async
+from django.core.management.base import BaseCommand, CommandError
+from django.db import OperationalError, connection, connections
+from django.test import AsyncClient
+from django.urls import reverse
+
+from testapp.management.harness import BENCH_PREFIX, bench_client, delete_bench_data
+from testapp.management.stats import latency_summary
+from testapp.models import Question, TestTuri
+
+QUESTION_FIELD_RE = re.compile(r'name="(question_\d+)"')
+ENDPOINTS = ("test_list", "start_test", "test_run_get", "test_run_post", "test_results")
+
+
+class Recorder:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.timings: dict[str, list[float]] = defaultdict(list)
+        self.statuses: dict[str, Counter] = defaultdict(Counter)
+        self.errors: Counter = Counter()
+        self.lock_errors: Counter = Counter()
+        self.completed = 0
+
+    def record(self, endpoint: str, elapsed: float, status: int | None = None,
+               error: BaseException | None = None) -> None:
+        with self._lock:
+            self.timings[endpoint].append(elapsed)
+            if status is not None:
+                self.statuses[endpoint][status] += 1
+            if error is not None:
+                if isinstance(error, OperationalError) and "locked" in str(error).lower():
+                    self.lock_errors[endpoint] += 1
+                else:
+                    self.errors[endpoint] += 1
+
+    def record_error(self, endpoint: str) -> None:
+        with self._lock:
+            self.errors[endpoint] += 1
+
+    def finish(self) -> None:
+        with self._lock:
+            self.completed += 1
+
+
+class _NoRedirect(urllib.request.HTTPRedirectHandler):
+    def redirect_request(self, *args, **kwargs):
+        return None
+
+
+class HttpTransport:
+    def __init__(self, base_url: str, timeout: float):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.jar = http.cookiejar.CookieJar()
+        self.opener = urllib.request.build_opener(
+            urllib.request.HTTPCookieProcessor(self.jar), _NoRedirect
+        )
+
+    def _csrf_token(self) -> str:
+        for cookie in self.jar:
+            if cookie.name == "csrftoken":
+                return cookie.value
+        return ""
+
+    def request(self, method: str, path: str, data: dict | None = None):
+        url = path if path.startswith("http") else self.base_url + path
+        body = urlencode(data).encode() if data is not None else None
+        request = urllib.request.Request(url, data=body, method=method)
+        if method == "POST":
+            request.add_header("Content-Type", "application/x-www-form-urlencoded")
+            request.add_header("X-CSRFToken", self._csrf_token())
+            request.add_header("Referer", url)
+        try:
+            with self.opener.open(request, timeout=self.timeout) as response:
+                return response.status, response.headers, response.read()
+        except urllib.error.HTTPError as exc:
+            return exc.code, exc.headers, exc.read()
+
+
+class ClientTransport:
+    def __init__(self):
+        self.client = bench_client()
+
+    def request(self, method: str, path: str, data: dict | None = None):
+        response = getattr(self.client, method.lower())(path, data or {})
+        return response.status_code, response.headers, response.content
+
+
+class AsyncClientTransport:
+    def __init__(self):
+        self.client = bench_client(AsyncClient)
+
+    async def request(self, method: str, path: str, data: dict | None = None):
+        response = await getattr(self.client, method.lower())(path, data or {})
+        return response.status_code, response.headers, response.content
+
+
+class StudentFlow:
+    """
+    Bitta talabaning imtihon oqimi. `step` endpoint nomi bilan o'lchaydi.
+    """
+
+    def __init__(self, plan: dict, recorder: Recorder, think_time: float):
+        self.plan = plan
+        self.recorder = recorder
+        self.think_time = think_time
+
+    def answers(self, page: bytes) -> dict[str, str]:
+        fields = QUESTION_FIELD_RE.findall(page.decode("utf-8", "replace"))
+        return {name: random.choice("ABCD") for name in dict.fromkeys(fields)}
+
+    def expect(self, endpoint: str, response, expected: int):
+        status, headers, body = response
+        if status != expected:
+            if status < 500:
+                # 5xx javoblar step() da allaqachon xato sifatida yozilgan
+                self.recorder.record_error(endpoint)
+            raise RuntimeError(f"{endpoint}: HTTP {status}")
+        return headers, body
+
+    def run(self, transport) -> None:
+        try:
+            self.expect("test_list", self.step(transport, "test_list", "GET", self.plan["list_url"]), 200)
+            headers, _ = self.expect("start_test", self.step(
+                transport, "start_test", "POST", self.plan["start_url"],
+                {"group_number": self.plan["group_number"]},
+            ), 302)
+            run_url = headers["Location"]
+            _, page = self.expect("test_run_get", self.step(transport, "test_run_get", "GET", run_url), 200)
+            if self.think_time:
+                time.sleep(random.uniform(0, self.think_time))
+            headers, _ = self.expect("test_run_post", self.step(
+                transport, "test_run_post", "POST", run_url, self.answers(page)
+            ), 302)
+            self.expect("test_results", self.step(transport, "test_results", "GET", headers["Location"]), 200)
+            self.recorder.finish()
+        except Exception:  # noqa: BLE001
+            # Xato step() ichida allaqachon yozilgan
+            pass
+
+    def step(self, transport, endpoint: str, method: str, path: str, data: dict | None = None):
+        started = time.perf_counter()
+        try:
+            response = transport.request(method, path, data)
+        except Exception as exc:  # noqa: BLE001
+            self.recorder.record(endpoint, time.perf_counter() - started, error=exc)
+            raise
+        status = response[0]
+        self.recorder.record(
+            endpoint,
+            time.perf_counter() - started,
+            status=status,
+            error=RuntimeError(f"HTTP {status}") if status >= 500 else None,
+        )
+        return response
+
+    async def arun(self, transport: AsyncClientTransport) -> None:
+        try:
+            self.expect("test_list", await self.astep(transport, "test_list", "GET", self.plan["list_url"]), 200)
+            headers, _ = self.expect("start_test", await self.astep(
+                transport, "start_test", "POST", self.plan["start_url"],
+                {"group_number": self.plan["group_number"]},
+            ), 302)
+            run_url = headers["Location"]
+            _, page = self.expect("test_run_get", await self.astep(transport, "test_run_get", "GET", run_url), 200)
+            if self.think_time:
+                await asyncio.sleep(random.uniform(0, self.think_time))
+            headers, _ = self.expect("test_run_post", await self.astep(
+                transport, "test_run_post", "POST", run_url, self.answers(page)
+            ), 302)
+            self.expect("test_results", await self.astep(
+                transport, "test_results", "GET", headers["Location"]
+            ), 200)
+            self.recorder.finish()
+        except Exception:  # noqa: BLE001
+            pass
+
+    async def astep(self, transport, endpoint: str, method: str, path: str, data: dict | None = None):
+        started = time.perf_counter()
+        try:
+            response = await transport.request(method, path, data)
+        except Exception as exc:  # noqa: BLE001
+            self.recorder.record(endpoint, time.perf_counter() - started, error=exc)
+            raise
+        status = response[0]
+        self.recorder.record(
+            endpoint,
+            time.perf_counter() - started,
+            status=status,
+            error=RuntimeError(f"HTTP {status}") if status >= 500 else None,
+        )
+        return response
+
+
+class Command(BaseCommand):
+    help = "Imtihon to'lqinini (ko'p talaba bir vaqtda) lokal simulyatsiya qiladi."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--target", choices=["wsgi", "asgi"], default="wsgi",
+                            help="Jarayon ichidagi handler (--url berilmasa).")
+        parser.add_argument("--url", help="Ishlab turgan server manzili, masalan http://127.0.0.1:8000")
+        parser.add_argument("--students", type=int, default=100)
+        parser.add_argument("--concurrency", type=int, default=20)
+        parser.add_argument("--ramp-up", type=float, default=0.0,
+                            help="Barcha talabalar shu soniyalar ichida boshlaydi.")
+        parser.add_argument("--think-time", type=float, default=0.0,
+                            help="Javob berishdan oldingi maksimal pauza, soniyada.")
+        parser.add_argument("--category", type=int, help="Test turi id (standart: eng katta bo'lim).")
+        parser.add_argument("--group", type=int, help="Bo'lim raqami.")
+        parser.add_argument("--questions", type=int,
+                            help="Shu sonli savollar bilan vaqtinchalik bo'lim yaratish (jarayon ichida).")
+        parser.add_argument("--timeout", type=float, default=30.0)
+        parser.add_argument("--json", action="store_true", help="Natijani JSON ko'rinishida chiqarish.")
+
+    def handle(self, *args, **options):
+        if options["url"] and options["questions"]:
+            raise CommandError("--questions faqat jarayon ichidagi rejimda ishlaydi.")
+        try:
+            self._handle(options)
+        finally:
+            if not options["url"]:
+                deleted = delete_bench_data()
+                self.stderr.write(f"Benchmark sessiyalari o'chirildi: {deleted['sessions']}")
+        if options["url"]:
+            self.stderr.write(self.style.WARNING(
+                "HTTP rejimida yaratilgan test sessiyalari server bazasida qoldi."
+            ))
+
+    def _handle(self, options):
+        plan = self._bench_plan(options["questions"]) if options["questions"] else self._plan(options)
+        recorder = Recorder()
+        flow = StudentFlow(plan, recorder, options["think_time"])
+        students = options["students"]
+        delay = options["ramp_up"] / students if students else 0
+
+        started = time.perf_counter()
+        if options["url"]:
+            self._run_threads(flow, lambda: HttpTransport(options["url"], options["timeout"]),
+                              students, options["concurrency"], delay, close_db=False)
+        elif options["target"] == "asgi":
+            asyncio.run(self._run_async(flow, students, options["concurrency"], delay))
+        else:
+            connections.close_all()
+            self._run_threads(flow, ClientTransport, students, options["concurrency"], delay, close_db=True)
+        wall_time = time.perf_counter() - started
+
+        report = self._report(recorder, options, wall_time)
+        if options["json"]:
+            self.stdout.write(json.dumps(report, indent=2))
+        else:
+            self._print(report)
+
+    def _bench_plan(self, questions: int) -> dict:
+        category = TestTuri.objects.create(name=f"{BENCH_PREFIX} loadtest")
+        Question.objects.bulk_create(
+            Question(
+                category=category,
+                question_text=f"Benchmark savol {index}",
+                choice_a="A variant",
+                choice_b="B variant",
+                choice_c="C variant",
+                choice_d="D variant",
+                correct_answer=random.choice("ABCD"),
+                group_number=1,
+            )
+            for index in range(questions)
+        )
+        return {
+            "category_id": category.pk,
+            "group_number": 1,
+            "list_url": reverse("test_list"),
+            "start_url": reverse("start_test", args=[category.pk]),
+        }
+
+    def _plan(self, options) -> dict:
+        if options["url"]:
+            transport = HttpTransport(options["url"], options["timeout"])
+        else:
+            transport = ClientTransport()
+        status, _, body = transport.request("GET", reverse("api_catalogue"))
+        if status != 200:
+            raise CommandError(f"Katalogni olib bo'lmadi: HTTP {status}")
+        groups = [
+            (test["id"], group["group_number"], group["total"])
+            for test in json.loads(body)["tests"]
+            for group in test["groups"]
+            if options["category"] in (None, test["id"])
+            and options["group"] in (None, group["group_number"])
+        ]
+        if not groups:
+            raise CommandError("Mos bo'lim topilmadi. Avval `python manage.py generate_data` ni ishga tushiring.")
+        category_id, group_number, _ = max(groups, key=lambda group: group[2])
+        return {
+            "category_id": category_id,
+            "group_number": group_number,
+            "list_url": reverse("test_list"),
+            "start_url": reverse("start_test", args=[category_id]),
+        }
+
+    def _run_threads(self, flow: StudentFlow, transport_factory, students: int,
+                     concurrency: int, delay: float, close_db: bool) -> None:
+        started = time.perf_counter()
+
+        def student(index: int) -> None:
+            wait = started + index * delay - time.perf_counter()
+            if wait > 0:
+                time.sleep(wait)
+            try:
+                flow.run(transport_factory())
+            finally:
+                if close_db:
+                    connections.close_all()
+
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            list(pool.map(student, range(students)))
+
+    async def _run_async(self, flow: StudentFlow, students: int, concurrency: int, delay: float) -> None:
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def student(index: int) -> None:
+            await asyncio.sleep(index * delay)
+            async with semaphore:
+                # Sessiya yaratish (bench_client) bazaga yozishi mumkin
+                await flow.arun(await sync_to_async(AsyncClientTransport)())
+
+        await asyncio.gather(*(student(index) for index in range(students)))
+
+    def _report(self, recorder: Recorder, options, wall_time: float) -> dict:
+        endpoints = {}
+        total_requests = 0
+        for endpoint in ENDPOINTS:
+            timings = recorder.timings.get(endpoint, [])
+            total_requests += len(timings)
+            requests = len(timings) or 1
+            endpoints[endpoint] = {
+                **latency_summary(timings),
+                "throughput": len(timings) / wall_time if wall_time else 0.0,
+                "statuses": dict(recorder.statuses.get(endpoint, {})),
+                "errors": recorder.errors[endpoint],
+                "lock_errors": recorder.lock_errors[endpoint],
+                "lock_error_rate": recorder.lock_errors[endpoint] / requests,
+            }
+        return {
+            "target": options["url"] or options["target"],
+            "students": options["students"],
+            "concurrency": options["concurrency"],
+            "completed": recorder.completed,
+            "wall_time": wall_time,
+            "requests": total_requests,
+            "throughput": total_requests / wall_time if wall_time else 0.0,
+            "endpoints": endpoints,
+            "database": None if options["url"] else {
+                "vendor": connection.vendor,
+                "settings": {
+                    key: value
+                    for key, value in connection.settings_dict.items()
+                    if key in {"ENGINE", "CONN_MAX_AGE", "OPTIONS"}
+                },
+            },
+        }
+
+    def _print(self, report: dict) -> None:
+        self.stdout.write(
+            f"{report['target']}: {report['completed']}/{report['students']} talaba yakunladi, "
+            f"{report['requests']} so'rov, {report['wall_time']:.2f}s, {report['throughput']:.1f} so'rov/s"
+        )
+        self.stdout.write(
+            f"{'endpoint':<14}{'so`rov/s':>10}{'p50':>10}{'p95':>10}{'p99':>10}{'xato':>7}{'lock':>7}"
+        )
+        for endpoint, stats in report["endpoints"].items():
+            line = (
+                f"{endpoint:<14}{stats['throughput']:>10.1f}{stats['p50_ms']:>8.1f}ms"
+                f"{stats['p95_ms']:>8.1f}ms{stats['p99_ms']:>8.1f}ms"
+                f"{stats['errors']:>7}{stats['lock_errors']:>7}"
+            )
+            style = self.style.ERROR if stats["errors"] or stats["lock_errors"] else self.style.SUCCESS
+            self.stdout.write(style(line))
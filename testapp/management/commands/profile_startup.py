@@ -0,0 +1,170 @@
+"""
+Worker ishga tushishi (`django.setup()`) uchun import vaqti va xotira hisoboti.
+
+    python manage.py profile_startup --runs 5 --output bench/startup.json
+    python manage.py profile_startup --compare bench/startup.json
+
+Har bir o'lchov yangi Python jarayonida `-X importtime` bilan bajariladi:
+stderr'dagi qatorlardan har bir modulning o'z va jami import vaqti olinadi,
+jarayon esa `django.setup()` davomiyligi va eng yuqori RSS ni qaytaradi.
+`--forbid` dagi modullar (standart: python-docx, openpyxl, lxml) yuklangan
+bo'lsa buyruq xato bilan tugaydi - ular faqat upload/eksportda kerak.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import platform
+import re
+import subprocess
+import sys
+from collections import defaultdict
+from datetime import datetime, timezone as dt_timezone
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from testapp.management.commands.run_benchmarks import _git_revision
+from testapp.management.stats import latency_summary
+
+DEFAULT_FORBIDDEN = ("docx", "openpyxl", "lxml")
+
+_LINE_RE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$")
+
+_CHILD = """
+import json, os, resource, sys, time
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", {settings_module!r})
+started = time.perf_counter()
+import django
+django.setup()
+elapsed = time.perf_counter() - started
+rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+# Linux'da KiB, macOS'da bayt
+if sys.platform == "darwin":
+    rss //= 1024
+print(json.dumps({{"setup_seconds": elapsed, "max_rss_kib": rss}}))
+"""
+
+
+def parse_importtime(stderr: str) -> dict[str, dict]:
+    """
+    `-X importtime` chiqishi -> {modul: {"self_us", "cumulative_us", "depth"}}.
+    """
+
+    modules = {}
+    for line in stderr.splitlines():
+        match = _LINE_RE.match(line)
+        if match is None:
+            continue
+        self_us, cumulative_us, indent, name = match.groups()
+        modules[name] = {
+            "self_us": int(self_us),
+            "cumulative_us": int(cumulative_us),
+            # Har bir daraja ikki bo'sh joy bilan siljitiladi
+            "depth": (len(indent) - 1) // 2,
+        }
+    return modules
+
+
+def _package(name: str) -> str:
+    return name.split(".", 1)[0]
+
+
+class Command(BaseCommand):
+    help = "django.setup() uchun import vaqti (-X importtime) va xotira hisobotini tuzadi."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--runs", type=int, default=5,
+                            help="Nechta yangi jarayonda o'lchash (median olinadi).")
+        parser.add_argument("--top", type=int, default=15,
+                            help="Hisobotda ko'rsatiladigan eng og'ir paketlar soni.")
+        parser.add_argument("--forbid", action="append",
+                            help="Yuklanmasligi kerak bo'lgan paket (bir necha marta berish mumkin).")
+        parser.add_argument("--output", help="JSON natijani faylga yozish.")
+        parser.add_argument("--compare", help="Oldingi JSON natija bilan solishtirish.")
+
+    def handle(self, *args, **options):
+        if options["runs"] < 1:
+            raise CommandError("--runs kamida 1 bo'lishi kerak.")
+
+        runs = [self._run() for _ in range(options["runs"])]
+        # Paketlar bo'yicha yig'indi oxirgi jarayondan olinadi - birinchisida .pyc yozilishi mumkin
+        modules = runs[-1]["modules"]
+
+        packages = defaultdict(int)
+        for name, timing in modules.items():
+            packages[_package(name)] += timing["self_us"]
+        top = sorted(packages.items(), key=lambda item: item[1], reverse=True)[: options["top"]]
+
+        setup = latency_summary([run["setup_seconds"] for run in runs])
+        rss = sorted(run["max_rss_kib"] for run in runs)[len(runs) // 2]
+        import_ms = sum(timing["self_us"] for timing in modules.values()) / 1000
+
+        self.stdout.write(
+            f"django.setup() p50={setup['p50_ms']:.1f}ms max={setup['max_ms']:.1f}ms, "
+            f"importlar={import_ms:.1f}ms, modullar={len(modules)}, RSS={rss / 1024:.1f}MiB"
+        )
+        for name, self_us in top:
+            self.stdout.write(f"  {name:<30} {self_us / 1000:8.1f}ms")
+
+        forbidden = options["forbid"] or DEFAULT_FORBIDDEN
+        loaded = sorted({_package(name) for name in modules} & set(forbidden))
+
+        report = {
+            "meta": {
+                "timestamp": datetime.now(dt_timezone.utc).isoformat(),
+                "git": _git_revision(),
+                "python": platform.python_version(),
+                "settings": os.environ.get("DJANGO_SETTINGS_MODULE"),
+                "runs": options["runs"],
+            },
+            "setup": setup,
+            "import_ms": import_ms,
+            "modules": len(modules),
+            "max_rss_kib": rss,
+            "packages_ms": {name: self_us / 1000 for name, self_us in top},
+            "forbidden_loaded": loaded,
+        }
+
+        if options["output"]:
+            path = Path(options["output"])
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(json.dumps(report, indent=2))
+            self.stdout.write(self.style.SUCCESS(f"Natija saqlandi: {path}"))
+        if options["compare"]:
+            self._compare(json.loads(Path(options["compare"]).read_text()), report)
+
+        if loaded:
+            raise CommandError(
+                "Worker ishga tushishida og'ir paketlar yuklanmoqda: " + ", ".join(loaded)
+            )
+
+    def _run(self) -> dict:
+        settings_module = os.environ.get("DJANGO_SETTINGS_MODULE", "taalim.settings")
+        completed = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", _CHILD.format(settings_module=settings_module)],
+            cwd=settings.BASE_DIR,
+            capture_output=True,
+            text=True,
+        )
+        if completed.returncode:
+            raise CommandError(f"django.setup() xato bilan tugadi:\n{completed.stderr[-2000:]}")
+        result = json.loads(completed.stdout.strip().splitlines()[-1])
+        result["modules"] = parse_importtime(completed.stderr)
+        return result
+
+    def _compare(self, before: dict, after: dict) -> None:
+        self.stdout.write(f"\nSolishtirish: {before['meta'].get('git')} -> {after['meta'].get('git')}")
+        for label, previous, current, unit in (
+            ("setup p50", before["setup"]["p50_ms"], after["setup"]["p50_ms"], "ms"),
+            ("importlar", before["import_ms"], after["import_ms"], "ms"),
+            ("RSS", before["max_rss_kib"] / 1024, after["max_rss_kib"] / 1024, "MiB"),
+            ("modullar", before["modules"], after["modules"], ""),
+        ):
+            change = (current - previous) / previous * 100 if previous else 0.0
+            style = self.style.SUCCESS if change <= 0 else self.style.WARNING
+            self.stdout.write(style(
+                f"{label:<10} {previous:8.1f} -> {current:8.1f}{unit} ({change:+.1f}%)"
+            ))
@@ -0,0 +1,65 @@
+"""
+Muddati o'tgan sessiyalarni `django_session` jadvalidan bo'laklab o'chirish.
+
+    python manage.py purge_sessions --batch-size 1000 --sleep 0.05
+
+Django'ning `clearsessions` buyrug'i bitta katta DELETE bajaradi va SQLite'da
+yozish qulfini uzoq ushlab turadi. Bu buyruq esa kichik tranzaksiyalar bilan
+ishlaydi, oraliqdagi pauza imtihon paytidagi yozuvlarga yo'l beradi.
+Cron yoki systemd timer orqali muntazam ishga tushirish tavsiya etiladi.
+"""
+
+from __future__ import annotations
+
+import time
+
+from django.conf import settings
+from django.contrib.sessions.models import Session
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+DB_BACKED_ENGINES = {
+    "django.contrib.sessions.backends.db",
+    "django.contrib.sessions.backends.cached_db",
+}
+
+
+class Command(BaseCommand):
+    help = "Muddati o'tgan sessiyalarni bo'laklab o'chiradi."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000)
+        parser.add_argument("--sleep", type=float, default=0.05,
+                            help="Bo'laklar orasidagi pauza, soniyada.")
+        parser.add_argument("--max-batches", type=int, default=None)
+
+    def handle(self, *args, **options):
+        if settings.SESSION_ENGINE not in DB_BACKED_ENGINES:
+            self.stdout.write(
+                f"{settings.SESSION_ENGINE} sessiyalarni bazada saqlamaydi, "
+                "faqat eski yozuvlar tozalanadi."
+            )
+
+        batch_size = options["batch_size"]
+        now = timezone.now()
+        deleted = 0
+        batches = 0
+
+        while options["max_batches"] is None or batches < options["max_batches"]:
+            with transaction.atomic():
+                keys = list(
+                    Session.objects.filter(expire_date__lt=now)
+                    .values_list("session_key", flat=True)[:batch_size]
+                )
+                if not keys:
+                    break
+                Session.objects.filter(session_key__in=keys).delete()
+            deleted += len(keys)
+            batches += 1
+            if len(keys) < batch_size:
+                break
+            if options["sleep"]:
+                time.sleep(options["sleep"])
+
+        self.stdout.write(self.style.SUCCESS(f"{deleted} ta sessiya o'chirildi ({batches} bo'lak)."))
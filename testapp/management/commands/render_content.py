@@ -0,0 +1,66 @@
+"""
+Savollar matnining tayyor HTML'ini (testapp/richtext.py) to'ldirish.
+
+    python manage.py render_content            # render qilinmagan va eskirganlar
+    python manage.py render_content --force    # hammasini qaytadan
+
+Savollar saqlanganda va fayldan import qilinganda HTML o'zi yangilanadi;
+buyruq migratsiyadan keyin, `update()`/SQL bilan o'zgartirilgan matnlardan
+keyin va `RENDER_VERSION` oshirilganda ishga tushiriladi.
+"""
+
+from __future__ import annotations
+
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from testapp.models import PracticeQuestion, Question
+from testapp.richtext import RENDERED_FIELDS, render_objects
+from testapp.services import bump_question_set_versions
+
+
+class Command(BaseCommand):
+    help = "Savollar va amaliy savollar uchun tayyor HTML'ni hisoblaydi."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--force", action="store_true",
+                            help="render_hash mos bo'lsa ham qaytadan render qilish.")
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        for model in (Question, PracticeQuestion):
+            started = time.perf_counter()
+            fields = ["id", *RENDERED_FIELDS[model.__name__], "rendered_html", "render_hash"]
+            if model is Question:
+                fields += ["category_id", "group_number"]
+            total = changed = 0
+            last_pk = 0
+            while True:
+                batch = list(
+                    model.objects.filter(pk__gt=last_pk).order_by("pk")
+                    .only(*fields)[:options["batch_size"]]
+                )
+                if not batch:
+                    break
+                last_pk = batch[-1].pk
+                total += len(batch)
+                if options["force"]:
+                    for obj in batch:
+                        obj.render_hash = ""
+                updated = render_objects(batch)
+                if not updated:
+                    continue
+                with transaction.atomic():
+                    model.objects.bulk_update(updated, ["rendered_html", "render_hash"])
+                    if model is Question:
+                        # test_run bo'laklari keshi bo'lim versiyasi bo'yicha
+                        bump_question_set_versions(
+                            {(obj.category_id, obj.group_number) for obj in updated}
+                        )
+                changed += len(updated)
+            self.stdout.write(
+                f"{model._meta.verbose_name_plural}: {changed}/{total} ta render qilindi, "
+                f"{time.perf_counter() - started:.1f} s"
+            )
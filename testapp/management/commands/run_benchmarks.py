@@ -0,0 +1,222 @@
+"""
+Imtihon oqimi sahifalari uchun benchmark to'plami.
+
+    python manage.py generate_data --sessions 2000
+    python manage.py run_benchmarks --iterations 50 --output bench/latest.json
+    python manage.py run_benchmarks --compare bench/latest.json
+
+Har bir ssenariy test Client orqali to'liq middleware zanjiri bilan
+bajariladi. O'lchanadi: kechikish (p50/p95/p99), SQL so'rovlar soni va
+bitta so'rovning eng yuqori xotira sarfi (tracemalloc). Natija JSON
+ko'rinishida saqlanadi, `--compare` oldingi natija bilan farqni ko'rsatadi.
+
+Benchmark yaratgan test sessiyalari oxirida o'chiriladi (management/harness.py).
+Bir vaqtdagi ko'p talaba yuklamasi - `python manage.py loadtest`.
+"""
+
+from __future__ import annotations
+
+import json
+import platform
+import subprocess
+import time
+import tracemalloc
+from datetime import datetime, timezone as dt_timezone
+from pathlib import Path
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.db.models import Count
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.urls import reverse
+
+from mainapp.models import Book, TeamMember
+from testapp.management.harness import bench_client, delete_bench_data
+from testapp.management.stats import latency_summary
+from testapp.models import PracticeQuestion, Question, TestSession, TestTuri, UserAnswer
+
+
+def _git_revision() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=settings.BASE_DIR,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+class BenchmarkState:
+    """
+    Ssenariylar orasida umumiy holat: bitta talaba (Client) va uning sessiyasi.
+    """
+
+    def __init__(self, category_id: int, group_number: int):
+        self.client = bench_client()
+        self.category_id = category_id
+        self.group_number = group_number
+        self.question_ids = list(
+            Question.objects.filter(category_id=category_id, group_number=group_number)
+            .order_by("id")
+            .values_list("id", flat=True)
+        )
+        self.test_session_id = self.start()
+
+    def start(self) -> int:
+        response = self.client.post(
+            reverse("start_test", args=[self.category_id]),
+            {"group_number": self.group_number},
+        )
+        return int(response["Location"].rstrip("/").rsplit("/", 1)[-1])
+
+    def answers(self) -> dict[str, str]:
+        return {f"question_{question_id}": "ABCD"[question_id % 4] for question_id in self.question_ids}
+
+
+SCENARIOS = {
+    "test_list": lambda s: s.client.get(reverse("test_list")),
+    # Har safar yangi talaba: bir xil talabaning qayta bosishi avvalgi sessiyani qaytaradi
+    "start_test": lambda s: bench_client().post(
+        reverse("start_test", args=[s.category_id]), {"group_number": s.group_number}
+    ),
+    "test_run_get": lambda s: s.client.get(reverse("test_run", args=[s.test_session_id])),
+    "test_run_post": lambda s: s.client.post(
+        reverse("test_run", args=[s.test_session_id]), s.answers()
+    ),
+    "test_results": lambda s: s.client.get(reverse("test_results", args=[s.test_session_id])),
+    "api_questions": lambda s: s.client.get(
+        reverse("api_questions", args=[s.category_id, s.group_number])
+    ),
+    "practice_list": lambda s: s.client.get(reverse("practice_questions_list")),
+    "book_list": lambda s: s.client.get(reverse("books")),
+}
+
+
+class Command(BaseCommand):
+    help = "Imtihon oqimi sahifalarining kechikishi, SQL soni va xotirasini o'lchaydi."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--iterations", type=int, default=20)
+        parser.add_argument("--warmup", type=int, default=3)
+        parser.add_argument("--scenario", action="append", choices=sorted(SCENARIOS),
+                            help="Faqat tanlangan ssenariylar (bir necha marta berish mumkin).")
+        parser.add_argument("--cold", action="store_true",
+                            help="Har bir iteratsiyadan oldin keshni tozalash.")
+        parser.add_argument("--output", help="JSON natijani faylga yozish.")
+        parser.add_argument("--compare", help="Oldingi JSON natija bilan solishtirish.")
+
+    def handle(self, *args, **options):
+        # Bitta Client ketma-ket yuzlab POST yuboradi - chastota cheklovi o'lchovni buzmasin
+        try:
+            with override_settings(RATELIMIT_ENABLED=False):
+                self._handle(options)
+        finally:
+            deleted = delete_bench_data()
+            self.stdout.write(f"Benchmark sessiyalari o'chirildi: {deleted['sessions']}")
+
+    def _handle(self, options):
+        group = (
+            Question.objects.values("category_id", "group_number")
+            .annotate(total=Count("id"))
+            .order_by("-total")
+            .first()
+        )
+        if group is None:
+            raise CommandError("Savollar yo'q. Avval `python manage.py generate_data` ni ishga tushiring.")
+
+        state = BenchmarkState(group["category_id"], group["group_number"])
+        results = {}
+        for name in options["scenario"] or SCENARIOS:
+            results[name] = self._measure(name, SCENARIOS[name], state, options)
+            self.stdout.write(
+                f"{name:<15} p50={results[name]['p50_ms']:7.2f}ms "
+                f"p95={results[name]['p95_ms']:7.2f}ms "
+                f"sql={results[name]['queries']:4d} "
+                f"mem={results[name]['peak_kib']:8.1f}KiB"
+            )
+
+        report = {
+            "meta": {
+                "timestamp": datetime.now(dt_timezone.utc).isoformat(),
+                "git": _git_revision(),
+                "python": platform.python_version(),
+                "database": connection.vendor,
+                "session_engine": settings.SESSION_ENGINE,
+                "async_views": settings.ASYNC_VIEWS,
+                "iterations": options["iterations"],
+                "cold_cache": options["cold"],
+                "questions_in_group": len(state.question_ids),
+                "rows": {
+                    "test_types": TestTuri.objects.count(),
+                    "questions": Question.objects.count(),
+                    "sessions": TestSession.objects.count(),
+                    "answers": UserAnswer.objects.count(),
+                    "practice_questions": PracticeQuestion.objects.count(),
+                    "books": Book.objects.count(),
+                    "team_members": TeamMember.objects.count(),
+                },
+            },
+            "results": results,
+        }
+
+        if options["output"]:
+            path = Path(options["output"])
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(json.dumps(report, indent=2))
+            self.stdout.write(self.style.SUCCESS(f"Natija saqlandi: {path}"))
+        if options["compare"]:
+            self._compare(json.loads(Path(options["compare"]).read_text()), report)
+
+    def _measure(self, name: str, scenario, state: BenchmarkState, options) -> dict:
+        for _ in range(options["warmup"]):
+            scenario(state)
+
+        timings = []
+        queries = 0
+        status = None
+        for _ in range(options["iterations"]):
+            if options["cold"]:
+                cache.clear()
+            with CaptureQueriesContext(connection) as captured:
+                started = time.perf_counter()
+                response = scenario(state)
+                timings.append(time.perf_counter() - started)
+            queries = max(queries, len(captured))
+            status = response.status_code
+
+        # Xotira alohida o'lchanadi - tracemalloc kechikishni buzadi
+        tracemalloc.start()
+        try:
+            scenario(state)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        return {
+            **latency_summary(timings),
+            "queries": queries,
+            "peak_kib": peak / 1024,
+            "status": status,
+        }
+
+    def _compare(self, before: dict, after: dict) -> None:
+        self.stdout.write(f"\nSolishtirish: {before['meta'].get('git')} -> {after['meta'].get('git')}")
+        for name, current in after["results"].items():
+            previous = before["results"].get(name)
+            if previous is None:
+                continue
+            change = (
+                (current["p50_ms"] - previous["p50_ms"]) / previous["p50_ms"] * 100
+                if previous["p50_ms"]
+                else 0.0
+            )
+            style = self.style.SUCCESS if change <= 0 else self.style.WARNING
+            self.stdout.write(style(
+                f"{name:<15} p50 {previous['p50_ms']:7.2f} -> {current['p50_ms']:7.2f}ms ({change:+.1f}%), "
+                f"sql {previous['queries']} -> {current['queries']}"
+            ))
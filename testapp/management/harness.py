@@ -0,0 +1,44 @@
+"""
+run_benchmarks va loadtest uchun umumiy yordamchilar.
+
+Benchmark talabasi (`bench_client`) sessiyasiga `BENCH_SESSION_PREFIX` bilan
+boshlanuvchi topshiruvchi kaliti oldindan yoziladi - u yaratgan TestSession
+qatorlari boshqa ma'lumotlardan ajraladi va buyruq oxirida
+`delete_bench_data` bilan o'chiriladi. Buyruq yarim yo'lda to'xtasa,
+qolganlarini `python manage.py generate_data --flush` o'chiradi.
+"""
+
+from __future__ import annotations
+
+from django.conf import settings
+from django.test import Client
+from django.utils.crypto import get_random_string
+
+from testapp.models import TestSession, TestTuri
+from testapp.services import TEST_TAKER_SESSION_KEY
+
+BENCH_PREFIX = "[bench]"
+BENCH_SESSION_PREFIX = "bench-"
+
+
+def bench_client(client_class=Client):
+    """Test Client (yoki AsyncClient), topshiruvchi kaliti `bench-...`."""
+
+    client = client_class()
+    session = client.session
+    session[TEST_TAKER_SESSION_KEY] = BENCH_SESSION_PREFIX + get_random_string(32)
+    session.save()
+    # signed_cookies engine'da kalit saqlashda o'zgaradi
+    client.cookies[settings.SESSION_COOKIE_NAME] = session.session_key
+    return client
+
+
+def delete_bench_data() -> dict[str, int]:
+    """Benchmark sessiyalari va vaqtinchalik test turlarini o'chiradi."""
+
+    _, sessions = TestSession.objects.filter(session_key__startswith=BENCH_SESSION_PREFIX).delete()
+    _, test_types = TestTuri.objects.filter(name__startswith=BENCH_PREFIX).delete()
+    return {
+        "sessions": sessions.get("testapp.TestSession", 0) + test_types.get("testapp.TestSession", 0),
+        "test_types": test_types.get("testapp.TestTuri", 0),
+    }
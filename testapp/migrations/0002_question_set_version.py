@@ -0,0 +1,34 @@
+# Generated by Django 5.2.9 on 2026-10-19 04:21
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('testapp', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='testsession',
+            name='question_set_version',
+            field=models.PositiveBigIntegerField(default=0),
+        ),
+        migrations.CreateModel(
+            name='QuestionSetVersion',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('group_number', models.PositiveIntegerField(verbose_name="Bo'lim raqami")),
+                ('version', models.PositiveBigIntegerField(default=1, verbose_name='Versiya')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Yangilangan vaqti')),
+                ('category', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='question_set_versions', to='testapp.testturi', verbose_name='Test turi')),
+            ],
+            options={
+                'verbose_name': "Savollar to'plami versiyasi",
+                'verbose_name_plural': "Savollar to'plami versiyalari",
+                'unique_together': {('category', 'group_number')},
+            },
+        ),
+    ]
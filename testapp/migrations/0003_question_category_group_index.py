@@ -0,0 +1,43 @@
+# Generated by Django 5.2.9 on 2026-10-19 04:24
+
+from django.db import DatabaseError, migrations, models, transaction
+
+# Admin'dagi `question_text__icontains` qidiruvi Postgres'da
+# UPPER(...) LIKE UPPER(...) ko'rinishida bajariladi; trigram GIN indeks shu
+# ifodani to'liq skanersiz bajaradi. SQLite'da bunday indeks yo'q - o'tkazib yuboriladi.
+TRGM_INDEX = 'question_text_trgm_idx'
+
+
+def create_trgm_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    try:
+        with transaction.atomic(using=schema_editor.connection.alias):
+            schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+            schema_editor.execute(
+                f'CREATE INDEX IF NOT EXISTS {TRGM_INDEX} ON testapp_question '
+                'USING gin ((UPPER(question_text::text)) gin_trgm_ops)'
+            )
+    except DatabaseError:
+        # pg_trgm o'rnatish huquqi bo'lmasa, qidiruv indeksiz ishlayveradi
+        pass
+
+
+def drop_trgm_index(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute(f'DROP INDEX IF EXISTS {TRGM_INDEX}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('testapp', '0002_question_set_version'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='question',
+            index=models.Index(fields=['category', 'group_number'], name='question_category_group_idx'),
+        ),
+        migrations.RunPython(create_trgm_index, drop_trgm_index),
+    ]
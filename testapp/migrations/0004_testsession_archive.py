@@ -0,0 +1,38 @@
+# Generated by Django 5.2.9 on 2026-10-19 04:27
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('testapp', '0003_question_category_group_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='testsession',
+            name='archived_at',
+            field=models.DateTimeField(blank=True, db_index=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='testsession',
+            name='packed_answers',
+            field=models.TextField(blank=True, default=''),
+        ),
+        migrations.AddField(
+            model_name='testsession',
+            name='question_ids',
+            field=models.TextField(blank=True, default=''),
+        ),
+        migrations.AddField(
+            model_name='testsession',
+            name='score_correct',
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='testsession',
+            name='score_total',
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 5.2.9 on 2026-10-19 04:51
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('testapp', '0004_testsession_archive'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='QuestionSignature',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('scope_id', models.PositiveBigIntegerField(blank=True, null=True)),
+                ('content_hash', models.CharField(max_length=32)),
+                ('minhash', models.BinaryField()),
+                ('practice_question', models.OneToOneField(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='signature', to='testapp.practicequestion')),
+                ('question', models.OneToOneField(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='signature', to='testapp.question')),
+            ],
+            options={
+                'verbose_name': 'Savol imzosi',
+                'verbose_name_plural': 'Savol imzolari',
+            },
+        ),
+        migrations.CreateModel(
+            name='SignatureBucket',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('bucket', models.BigIntegerField(db_index=True)),
+                ('signature', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='buckets', to='testapp.questionsignature')),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='questionsignature',
+            constraint=models.CheckConstraint(condition=models.Q(models.Q(('practice_question__isnull', True), ('question__isnull', False)), models.Q(('practice_question__isnull', False), ('question__isnull', True)), _connector='OR'), name='question_signature_single_owner'),
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.9 on 2026-10-19 05:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('testapp', '0005_question_similarity'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='practicequestion',
+            name='render_hash',
+            field=models.CharField(blank=True, editable=False, max_length=32),
+        ),
+        migrations.AddField(
+            model_name='practicequestion',
+            name='rendered_html',
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+        migrations.AddField(
+            model_name='question',
+            name='render_hash',
+            field=models.CharField(blank=True, editable=False, max_length=32),
+        ),
+        migrations.AddField(
+            model_name='question',
+            name='rendered_html',
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 5.2.9 on 2026-10-19 05:29
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('testapp', '0006_rendered_html'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='QuestionSetSnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('group_number', models.PositiveIntegerField(verbose_name="Bo'lim raqami")),
+                ('version', models.PositiveBigIntegerField(verbose_name='Versiya')),
+                ('question_ids', models.TextField()),
+                ('answer_key', models.TextField()),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now, verbose_name='Yaratilgan vaqti')),
+                ('category', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='question_set_snapshots', to='testapp.testturi', verbose_name='Test turi')),
+            ],
+            options={
+                'verbose_name': "Savollar to'plami nusxasi",
+                'verbose_name_plural': "Savollar to'plami nusxalari",
+                'unique_together': {('category', 'group_number', 'version')},
+            },
+        ),
+    ]
@@ -0,0 +1,64 @@
+# Generated by Django 5.2.9 on 2026-10-19 05:36
+
+from django.db import migrations
+
+# Admin'dagi savol matni qidiruvi SQLite'da (0003 dagi pg_trgm indeksi faqat
+# Postgres uchun). FTS5 "trigram" tokenizer istalgan 3+ belgili qism-satrni
+# indeks bo'yicha topadi - icontains bilan bir xil ma'no, katta-kichik harf
+# kirill/lotin uchun ham farqlanmaydi. testapp_question ustidagi "external
+# content" jadval: matn ikki marta saqlanmaydi, trigger'lar (bulk_create va
+# update() ham) indeksni yangilaydi.
+FTS_SQL = (
+    """
+    CREATE VIRTUAL TABLE testapp_question_fts USING fts5(
+        question_text,
+        content='testapp_question', content_rowid='id',
+        tokenize='trigram'
+    )
+    """,
+    """
+    CREATE TRIGGER testapp_question_fts_ai AFTER INSERT ON testapp_question BEGIN
+        INSERT INTO testapp_question_fts(rowid, question_text) VALUES (new.id, new.question_text);
+    END
+    """,
+    """
+    CREATE TRIGGER testapp_question_fts_ad AFTER DELETE ON testapp_question BEGIN
+        INSERT INTO testapp_question_fts(testapp_question_fts, rowid, question_text)
+        VALUES ('delete', old.id, old.question_text);
+    END
+    """,
+    """
+    CREATE TRIGGER testapp_question_fts_au AFTER UPDATE OF question_text ON testapp_question BEGIN
+        INSERT INTO testapp_question_fts(testapp_question_fts, rowid, question_text)
+        VALUES ('delete', old.id, old.question_text);
+        INSERT INTO testapp_question_fts(rowid, question_text) VALUES (new.id, new.question_text);
+    END
+    """,
+    "INSERT INTO testapp_question_fts(testapp_question_fts) VALUES ('rebuild')",
+)
+DROP_FTS_SQL = (
+    "DROP TRIGGER IF EXISTS testapp_question_fts_au",
+    "DROP TRIGGER IF EXISTS testapp_question_fts_ad",
+    "DROP TRIGGER IF EXISTS testapp_question_fts_ai",
+    "DROP TABLE IF EXISTS testapp_question_fts",
+)
+
+
+def _run(statements):
+    def run(apps, schema_editor):
+        if schema_editor.connection.vendor != 'sqlite':
+            return
+        for statement in statements:
+            schema_editor.execute(statement)
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('testapp', '0007_question_set_snapshot'),
+    ]
+
+    operations = [
+        migrations.RunPython(_run(FTS_SQL), _run(DROP_FTS_SQL)),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.9 on 2026-10-19 05:35
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('testapp', '0008_question_text_fts'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='testsession',
+            name='archived_answer_key',
+            field=models.TextField(blank=True, default=''),
+        ),
+    ]
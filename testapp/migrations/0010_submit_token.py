@@ -0,0 +1,29 @@
+# Generated by Django 5.2.9 on 2026-10-19 05:50
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('testapp', '0009_testsession_archived_answer_key'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SubmitToken',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('scope', models.CharField(choices=[('form', 'Forma'), ('api', 'API')], max_length=8)),
+                ('token', models.CharField(max_length=64)),
+                ('response', models.TextField(blank=True, default='')),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('test_session', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='submit_tokens', to='testapp.testsession')),
+            ],
+            options={
+                'unique_together': {('test_session', 'scope', 'token')},
+            },
+        ),
+    ]
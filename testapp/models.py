@@ -4,6 +4,8 @@ from django.db import models
 from django.db import models
 from django.utils import timezone
 
+from .richtext import RenderedHTML
+
 # Foydalanuvchi javoblari uchun variantlar
 ANSWER_CHOICES = (
     ('A', 'A'),
@@ -44,15 +46,89 @@ class Question(models.Model):
     )
     # 0002_question_group_number migratsiyasidan qo'shilgan
     group_number = models.PositiveIntegerField(default=1, verbose_name="Bo'lim raqami")
+    # Matn va variantlarning tayyor HTML'i (testapp/richtext.py), saqlashda yangilanadi
+    rendered_html = models.JSONField(default=dict, blank=True, editable=False)
+    render_hash = models.CharField(max_length=32, blank=True, editable=False)
+
+    question_html = RenderedHTML("question_text")
+    choice_a_html = RenderedHTML("choice_a")
+    choice_b_html = RenderedHTML("choice_b")
+    choice_c_html = RenderedHTML("choice_c")
+    choice_d_html = RenderedHTML("choice_d")
 
     class Meta:
         verbose_name = 'Savol'
         verbose_name_plural = 'Savollar'
+        indexes = [
+            # Bo'lim savollari, admin filtrlari va katalog shu juftlik bo'yicha olinadi
+            models.Index(fields=['category', 'group_number'], name='question_category_group_idx'),
+        ]
 
     def __str__(self):
         return self.question_text[:50]  # Savolning dastlabki 50 ta belgisini qaytarish
 
 
+# -------------------------------------------------------------------
+
+## Savollar to'plami versiyasi (Question Set Version)
+class QuestionSetVersion(models.Model):
+    """
+    (test turi, bo'lim) savollari har o'zgarganda oshadigan hisoblagich.
+
+    Savol mazmuniga bog'liq barcha keshlar kaliti shu versiyani o'z ichiga oladi.
+    """
+
+    category = models.ForeignKey(
+        TestTuri,
+        on_delete=models.CASCADE,
+        related_name='question_set_versions',
+        verbose_name='Test turi'
+    )
+    group_number = models.PositiveIntegerField(verbose_name="Bo'lim raqami")
+    version = models.PositiveBigIntegerField(default=1, verbose_name='Versiya')
+    updated_at = models.DateTimeField(auto_now=True, verbose_name='Yangilangan vaqti')
+
+    class Meta:
+        verbose_name = "Savollar to'plami versiyasi"
+        verbose_name_plural = "Savollar to'plami versiyalari"
+        unique_together = (('category', 'group_number'),)
+
+    def __str__(self):
+        return f"{self.category_id}/{self.group_number} v{self.version}"
+
+
+## Savollar to'plami nusxasi (Question Set Snapshot)
+class QuestionSetSnapshot(models.Model):
+    """
+    Bo'limning ma'lum versiyadagi savollari va to'g'ri javoblari.
+
+    Test sessiyasi boshlanganda yaratiladi va o'zgarmaydi: natija sessiya
+    yozib qo'ygan `question_set_version` bo'yicha shu nusxadan hisoblanadi,
+    keyingi tahrirlar (javob kaliti, ko'chirish, qayta bo'lish) unga ta'sir qilmaydi.
+    """
+
+    category = models.ForeignKey(
+        TestTuri,
+        on_delete=models.CASCADE,
+        related_name='question_set_snapshots',
+        verbose_name='Test turi'
+    )
+    group_number = models.PositiveIntegerField(verbose_name="Bo'lim raqami")
+    version = models.PositiveBigIntegerField(verbose_name='Versiya')
+    # Ixcham ko'rinish (testapp/packing.py): id'lar va shu tartibda to'g'ri javoblar
+    question_ids = models.TextField()
+    answer_key = models.TextField()
+    created_at = models.DateTimeField(default=timezone.now, verbose_name='Yaratilgan vaqti')
+
+    class Meta:
+        verbose_name = "Savollar to'plami nusxasi"
+        verbose_name_plural = "Savollar to'plami nusxalari"
+        unique_together = (('category', 'group_number', 'version'),)
+
+    def __str__(self):
+        return f"{self.category_id}/{self.group_number} v{self.version}"
+
+
 # -------------------------------------------------------------------
 
 ## Test Sessiyasi (Test Session)
@@ -67,6 +143,18 @@ class TestSession(models.Model):
     )
     # 0003_testsession_group_number migratsiyasidan qo'shilgan
     group_number = models.PositiveIntegerField(default=1)
+    # Test qaysi savollar versiyasi bilan ishlanganini saqlaydi (QuestionSetVersion)
+    question_set_version = models.PositiveBigIntegerField(default=0)
+    # Ixcham ko'rinish (testapp/packing.py): savollar tartibi va har biriga bitta harf.
+    # TEST_ANSWER_STORAGE = 'packed' bo'lsa javoblar boshidan shu yerda saqlanadi,
+    # arxivlangan sessiyada esa UserAnswer qatorlari o'chirilib, shu yerga ko'chiriladi.
+    question_ids = models.TextField(blank=True, default='')
+    packed_answers = models.TextField(blank=True, default='')
+    score_correct = models.PositiveIntegerField(blank=True, null=True)
+    score_total = models.PositiveIntegerField(blank=True, null=True)
+    # Arxivlash paytidagi to'g'ri javoblar, `question_ids` tartibida ("-" - ballga kirmagan savol)
+    archived_answer_key = models.TextField(blank=True, default='')
+    archived_at = models.DateTimeField(blank=True, null=True, db_index=True)
 
     class Meta:
         pass  # Qo'shimcha Meta options mavjud emas
@@ -99,6 +187,44 @@ class UserAnswer(models.Model):
         return f"Answer for Q{self.question.id} in Session {self.test_session.id}"
 
 
+# -------------------------------------------------------------------
+
+## Topshirish tokeni (Submit Token)
+class SubmitToken(models.Model):
+    """
+    Sessiyaga yuborilgan bir martalik token: formadagi `submit_token` yoki
+    API'dagi `Idempotency-Key`.
+
+    Token javoblar bilan bitta tranzaksiyada yoziladi, unique cheklov esa
+    barcha worker'lar uchun umumiy: qayta yuborilgan so'rov qaysi worker'ga
+    tushmasin, javoblar ikkinchi marta yozilmaydi.
+    """
+
+    SCOPE_FORM = 'form'
+    SCOPE_API = 'api'
+    SCOPE_CHOICES = (
+        (SCOPE_FORM, 'Forma'),
+        (SCOPE_API, 'API'),
+    )
+
+    test_session = models.ForeignKey(
+        TestSession,
+        on_delete=models.CASCADE,
+        related_name='submit_tokens'
+    )
+    scope = models.CharField(max_length=8, choices=SCOPE_CHOICES)
+    token = models.CharField(max_length=64)
+    # API javobi (JSON) - shu kalit bilan qayta yuborilgan so'rovga qaytariladi
+    response = models.TextField(blank=True, default='')
+    created_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        unique_together = (('test_session', 'scope', 'token'),)
+
+    def __str__(self):
+        return f"{self.scope}:{self.token} in Session {self.test_session_id}"
+
+
 # -------------------------------------------------------------------
 
 ## Sessiya Savollari Tartibi (Session Question Order)
@@ -149,6 +275,11 @@ class PracticeQuestion(models.Model):
     correct_answer = models.TextField(verbose_name="To'g'ri javob")
     created_at = models.DateTimeField(auto_now_add=True, verbose_name='Yaratilgan vaqti')
     updated_at = models.DateTimeField(auto_now=True, verbose_name='Yangilangan vaqti')
+    rendered_html = models.JSONField(default=dict, blank=True, editable=False)
+    render_hash = models.CharField(max_length=32, blank=True, editable=False)
+
+    question_html = RenderedHTML("question_text")
+    correct_answer_html = RenderedHTML("correct_answer")
 
     class Meta:
         verbose_name = 'Amaliy savol'
@@ -156,4 +287,62 @@ class PracticeQuestion(models.Model):
         ordering = ['-created_at']
 
     def __str__(self):
-        return self.question_text[:50]  # Savolning dastlabki 50 ta belgisini qaytarish
\ No newline at end of file
+        return self.question_text[:50]  # Savolning dastlabki 50 ta belgisini qaytarish
+
+# -------------------------------------------------------------------
+
+## Savol o'xshashlik imzosi (MinHash/LSH, testapp/similarity.py)
+class QuestionSignature(models.Model):
+    """
+    Savol (yoki amaliy savol) matnining MinHash imzosi.
+
+    Imzo `SIGNATURE_PERMUTATIONS` ta 32 bitli qiymat sifatida baytlarda
+    saqlanadi; LSH bo'laklari (band) xeshlari esa `SignatureBucket` da.
+    """
+
+    question = models.OneToOneField(
+        Question,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name='signature'
+    )
+    practice_question = models.OneToOneField(
+        PracticeQuestion,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name='signature'
+    )
+    # Test turi (savol) yoki kategoriya (amaliy savol) - hisobot filtri uchun
+    scope_id = models.PositiveBigIntegerField(blank=True, null=True)
+    # Normallashtirilgan matn xeshi: matn o'zgarmasa imzo qayta hisoblanmaydi
+    content_hash = models.CharField(max_length=32)
+    minhash = models.BinaryField()
+
+    class Meta:
+        verbose_name = "Savol imzosi"
+        verbose_name_plural = "Savol imzolari"
+        constraints = [
+            models.CheckConstraint(
+                condition=models.Q(question__isnull=False, practice_question__isnull=True)
+                | models.Q(question__isnull=True, practice_question__isnull=False),
+                name='question_signature_single_owner',
+            ),
+        ]
+
+    def __str__(self):
+        return f"Signature q{self.question_id or ''}p{self.practice_question_id or ''}"
+
+
+class SignatureBucket(models.Model):
+    signature = models.ForeignKey(
+        QuestionSignature,
+        on_delete=models.CASCADE,
+        related_name='buckets'
+    )
+    # (savol turi, band raqami, band qiymatlari) dan olingan 64 bitli xesh
+    bucket = models.BigIntegerField(db_index=True)
+
+    def __str__(self):
+        return f"{self.signature_id}:{self.bucket}"
@@ -0,0 +1,44 @@
+"""
+Sessiya javoblarini ixcham (packed) ko'rinishda saqlash uchun kodlash.
+
+  - savollar tartibi: id'lar ro'yxati oraliqlar bilan yoziladi,
+    masalan [781, 782, 783, 790] -> "781-783,790";
+  - javoblar: shu tartibdagi har bir savol uchun bitta harf (A/B/C/D),
+    javob berilmagan savol uchun "-", masalan "AB-D".
+"""
+
+from __future__ import annotations
+
+UNANSWERED = "-"
+
+
+def pack_ids(question_ids) -> str:
+    ranges = []
+    for question_id in question_ids:
+        if ranges and question_id == ranges[-1][1] + 1:
+            ranges[-1][1] = question_id
+        else:
+            ranges.append([question_id, question_id])
+    return ",".join(
+        str(start) if start == end else f"{start}-{end}" for start, end in ranges
+    )
+
+
+def unpack_ids(packed: str) -> list[int]:
+    question_ids = []
+    for part in filter(None, packed.split(",")):
+        start, _, end = part.partition("-")
+        question_ids.extend(range(int(start), int(end or start) + 1))
+    return question_ids
+
+
+def pack_answers(question_ids, answers: dict[int, str]) -> str:
+    return "".join(answers.get(question_id) or UNANSWERED for question_id in question_ids)
+
+
+def unpack_answers(question_ids, packed: str) -> dict[int, str]:
+    return {
+        question_id: letter
+        for question_id, letter in zip(question_ids, packed)
+        if letter != UNANSWERED
+    }
@@ -0,0 +1,137 @@
+"""
+test_run sahifasi uchun oldindan tayyorlangan savol HTML bo'laklari.
+
+Bo'limdagi savol matni va variantlari barcha talabalar uchun bir xil, faqat
+variantlar tartibi va belgilangan javob farq qiladi. Shuning uchun har bir
+savol `testapp/includes/question.html` (karta) va `question_option.html`
+(variant, belgilangan va belgilanmagan holatda) shablonlari bilan bir marta
+render qilinadi va (category, group_number, version) bo'yicha keshlanadi -
+savollar sessiya boshlangan versiya nusxasidan (QuestionSetSnapshot) olinadi.
+Har bir so'rovda faqat variantlar aralashtiriladi va tayyor satrlar
+birlashtiriladi.
+"""
+
+from __future__ import annotations
+
+import random
+from dataclasses import dataclass
+
+from django.core.cache import cache
+from django.template.loader import render_to_string
+from django.utils.safestring import SafeString, mark_safe
+
+from .models import Question
+from .richtext import field_html
+from .services import QUESTION_PAYLOAD_CACHE_TIMEOUT, asession_answer_key, session_answer_key
+
+
+CHOICE_FIELDS = ("choice_a", "choice_b", "choice_c", "choice_d")
+
+
+# Karta shablonida variantlar o'rni
+OPTIONS_MARKER = "<!-- options -->"
+# QuestionFragment tuzilishi o'zgarsa oshiriladi - umumiy keshdagi eskilari o'qilmaydi
+FRAGMENTS_FORMAT = 2
+
+
+@dataclass(frozen=True)
+class QuestionFragment:
+    question_id: int
+    # Karta boshi ("Savol N / M", savol matni) va oxiri - o'zgarmas qismlar
+    head: str
+    tail: str
+    # (harf, belgilanmagan HTML, belgilangan HTML); bo'sh variantlar tashlab ketilgan
+    options: tuple[tuple[str, str, str], ...]
+
+
+def fragments_cache_key(category_id: int, group_number: int, version: int) -> str:
+    return f"testapp:fragments{FRAGMENTS_FORMAT}:{category_id}:{group_number}:v{version}"
+
+
+def _render_option(question_id: int, letter: str, text: str, checked: bool) -> str:
+    return render_to_string(
+        "testapp/includes/question_option.html",
+        {"question_id": question_id, "letter": letter, "text": mark_safe(text), "checked": checked},
+    )
+
+
+def _build_fragments(rows: list[tuple]) -> list[QuestionFragment]:
+    total = len(rows)
+    fragments = []
+    for number, (question_id, text, *choices, rendered) in enumerate(rows, start=1):
+        card = render_to_string(
+            "testapp/includes/question.html",
+            {
+                "number": number,
+                "total": total,
+                "question_html": mark_safe(field_html(rendered, "question_text", text)),
+            },
+        )
+        head, tail = card.split(OPTIONS_MARKER, 1)
+        options = []
+        for letter, field, choice in zip("ABCD", CHOICE_FIELDS, choices):
+            if choice in {None, ""}:
+                continue
+            html = field_html(rendered, field, choice)
+            options.append((
+                letter,
+                _render_option(question_id, letter, html, False),
+                _render_option(question_id, letter, html, True),
+            ))
+        fragments.append(QuestionFragment(question_id, head, tail, tuple(options)))
+    return fragments
+
+
+def _rows_queryset(question_ids):
+    return (
+        Question.objects.filter(pk__in=question_ids)
+        .order_by("id")
+        .values_list("id", "question_text", *CHOICE_FIELDS, "rendered_html")
+    )
+
+
+def _session_cache_key(test_session) -> str:
+    return fragments_cache_key(
+        test_session.category_id, test_session.group_number, test_session.question_set_version
+    )
+
+
+def question_fragments(test_session) -> list[QuestionFragment]:
+    """Sessiya boshlangan versiya nusxasidagi savollar bo'laklari."""
+
+    key = _session_cache_key(test_session)
+    fragments = cache.get(key)
+    if fragments is None:
+        fragments = _build_fragments(list(_rows_queryset(list(session_answer_key(test_session)))))
+        cache.set(key, fragments, QUESTION_PAYLOAD_CACHE_TIMEOUT)
+    return fragments
+
+
+async def aquestion_fragments(test_session) -> list[QuestionFragment]:
+    key = _session_cache_key(test_session)
+    fragments = await cache.aget(key)
+    if fragments is None:
+        question_ids = list(await asession_answer_key(test_session))
+        rows = [row async for row in _rows_queryset(question_ids)]
+        fragments = _build_fragments(rows)
+        await cache.aset(key, fragments, QUESTION_PAYLOAD_CACHE_TIMEOUT)
+    return fragments
+
+
+def render_questions(
+    fragments: list[QuestionFragment], user_answers: dict[int, str]
+) -> SafeString:
+    """
+    Bo'laklarni birlashtiradi: variantlar har safar aralashtiriladi,
+    talabaning oldingi javobi `checked` bilan belgilanadi.
+    """
+
+    parts = []
+    for fragment in fragments:
+        selected = user_answers.get(fragment.question_id, "")
+        options = list(fragment.options)
+        random.shuffle(options)
+        parts.append(fragment.head)
+        parts.extend(checked if letter == selected else unchecked for letter, unchecked, checked in options)
+        parts.append(fragment.tail)
+    return mark_safe("".join(parts))
@@ -0,0 +1,231 @@
+"""
+Savol matnidagi formatlash va formulalarni xavfsiz HTML'ga aylantirish.
+
+O'qituvchi yozadigan belgilash (Markdown'ning kichik qismi):
+
+    **qalin**, *kursiv*, `kod`, yangi qator
+    $...$, $$...$$ - formula: x^2, x^{n+1}, a_1, H_{2}O, \\frac{a}{b},
+                     \\sqrt{x}, \\alpha, \\pi, \\cdot, \\times, \\le, \\ne, \\pm ...
+    \\$ - oddiy dollar belgisi (formula ichida ham, tashqarisida ham)
+
+Narx kabi matnlar formulaga aylanmasligi uchun yopuvchi `$` dan keyin raqam
+kelmasligi kerak: "Narxi $5 va $10" - oddiy matn.
+
+Natijada faqat strong, em, code, br, sup, sub va span (class bilan) teglari
+bo'ladi, har bir matn bo'lagi escape qilinadi: kiritilgan HTML matn sifatida
+ko'rinadi, alohida sanitizer kerak emas.
+
+Render saqlash va import paytida bir marta bajariladi (`render_objects`),
+natija modelning `rendered_html` ustunida, `render_hash` (manba matnlar va
+`RENDER_VERSION` xeshi) bilan saqlanadi. Sahifalar tayyor HTML'ni o'qiydi;
+render qilinmagan eski qatorlar uchun `RenderedHTML` joyida render qiladi
+(`python manage.py render_content` hammasini to'ldiradi).
+"""
+
+from __future__ import annotations
+
+import hashlib
+import re
+
+from django.utils.html import escape
+from django.utils.safestring import mark_safe
+
+# Renderer o'zgarsa oshiriladi - barcha render_hash'lar eskiradi
+RENDER_VERSION = 2
+
+RENDERED_FIELDS = {
+    "Question": ("question_text", "choice_a", "choice_b", "choice_c", "choice_d"),
+    "PracticeQuestion": ("question_text", "correct_answer"),
+}
+
+# Formulada ichma-ich qavslar chuqurligi chegarasi (rekursiya)
+MAX_MATH_DEPTH = 16
+
+_MARKUP_CHARS = frozenset("*`$\n")
+# Formula ichida `\` keyingi belgini "yutadi": \$ formulani yopmaydi
+_TOKEN_RE = re.compile(
+    r"(\$\$(?:\\.|[^\\])+?\$\$"
+    r"|\$(?:\\[^\n]|[^$\\\n])+?\$(?!\d)"
+    r"|\\\$"
+    r"|`[^`\n]+`)",
+    re.DOTALL,
+)
+# 2*3*4 kabi ifodalar kursivga aylanmasin - yulduzcha so'z ichida emas
+_BOLD_RE = re.compile(r"(?<![\w*])\*\*(?=\S)(.+?)(?<=\S)\*\*(?![\w*])")
+_ITALIC_RE = re.compile(r"(?<![\w*])\*(?=\S)([^*]+?)(?<=\S)\*(?![\w*])")
+# Oxirgi `\` (nomsiz buyruq) - belgining o'zi
+_COMMAND_RE = re.compile(r"\\([A-Za-z]+|.?)", re.DOTALL)
+_MATH_SPECIAL_RE = re.compile(r"[\\^_{}]")
+
+SYMBOLS = {
+    "alpha": "α", "beta": "β", "gamma": "γ", "delta": "δ", "epsilon": "ε",
+    "theta": "θ", "lambda": "λ", "mu": "μ", "pi": "π", "rho": "ρ",
+    "sigma": "σ", "tau": "τ", "phi": "φ", "omega": "ω",
+    "Delta": "Δ", "Sigma": "Σ", "Omega": "Ω", "Pi": "Π",
+    "cdot": "·", "times": "×", "div": "÷", "pm": "±", "mp": "∓",
+    "le": "≤", "leq": "≤", "ge": "≥", "geq": "≥", "ne": "≠", "neq": "≠",
+    "approx": "≈", "equiv": "≡", "sim": "∼", "infty": "∞", "partial": "∂",
+    "to": "→", "rightarrow": "→", "leftarrow": "←", "Rightarrow": "⇒",
+    "leftrightarrow": "↔", "rightleftharpoons": "⇌",
+    "degree": "°", "circ": "°", "angle": "∠", "perp": "⊥", "parallel": "∥",
+    "in": "∈", "notin": "∉", "subset": "⊂", "cup": "∪", "cap": "∩",
+    "sum": "∑", "prod": "∏", "int": "∫", "forall": "∀", "exists": "∃",
+    "quad": " ", ",": " ", " ": " ",
+}
+
+
+def _group(tex: str, i: int) -> tuple[str, int]:
+    """`^`, `_`, `\\frac` argumenti: {...}, buyruq yoki bitta belgi."""
+
+    while i < len(tex) and tex[i] == " ":
+        i += 1
+    if i >= len(tex):
+        return "", i
+    if tex[i] == "{":
+        depth = 0
+        j = i
+        while j < len(tex):
+            if tex[j] == "\\":
+                # \{ va \} qavs hisoblanmaydi
+                j += 2
+                continue
+            if tex[j] == "{":
+                depth += 1
+            elif tex[j] == "}":
+                depth -= 1
+                if depth == 0:
+                    return tex[i + 1:j], j + 1
+            j += 1
+        return tex[i + 1:], len(tex)
+    if tex[i] == "\\":
+        match = _COMMAND_RE.match(tex, i)
+        return match.group(0), match.end()
+    return tex[i], i + 1
+
+
+def render_math(tex: str, depth: int = 0) -> str:
+    if depth > MAX_MATH_DEPTH:
+        return str(escape(tex))
+    parts = []
+    i = 0
+    while i < len(tex):
+        char = tex[i]
+        if char == "\\":
+            match = _COMMAND_RE.match(tex, i)
+            name, i = match.group(1), match.end()
+            if name == "frac":
+                numerator, i = _group(tex, i)
+                denominator, i = _group(tex, i)
+                parts.append(
+                    f'<span class="frac"><sup>{render_math(numerator, depth + 1)}</sup>'
+                    f"&frasl;<sub>{render_math(denominator, depth + 1)}</sub></span>"
+                )
+            elif name == "sqrt":
+                argument, i = _group(tex, i)
+                parts.append(f'√<span class="sqrt">{render_math(argument, depth + 1)}</span>')
+            elif not name:
+                parts.append("\\")
+            elif name in SYMBOLS:
+                parts.append(SYMBOLS[name])
+            else:
+                # \{ \% \$ - belgining o'zi, noma'lum buyruq - o'zgarishsiz
+                parts.append(str(escape(name if not name.isalpha() else "\\" + name)))
+        elif char in "^_":
+            argument, i = _group(tex, i + 1)
+            tag = "sup" if char == "^" else "sub"
+            parts.append(f"<{tag}>{render_math(argument, depth + 1)}</{tag}>")
+        elif char == "{":
+            argument, i = _group(tex, i)
+            parts.append(render_math(argument, depth + 1))
+        elif char == "}":
+            i += 1
+        else:
+            match = _MATH_SPECIAL_RE.search(tex, i)
+            end = match.start() if match else len(tex)
+            parts.append(str(escape(tex[i:end])))
+            i = end
+    return "".join(parts)
+
+
+def _render_inline(text: str) -> str:
+    html = str(escape(text))
+    html = _BOLD_RE.sub(r"<strong>\1</strong>", html)
+    html = _ITALIC_RE.sub(r"<em>\1</em>", html)
+    return html.replace("\r\n", "\n").replace("\n", "<br>")
+
+
+def render(text: str) -> str:
+    """Belgilangan matn -> xavfsiz HTML satr."""
+
+    if not text:
+        return ""
+    if _MARKUP_CHARS.isdisjoint(text):
+        return str(escape(text))
+
+    parts = []
+    for index, token in enumerate(_TOKEN_RE.split(text)):
+        if index % 2 == 0:
+            parts.append(_render_inline(token))
+        elif token == "\\$":
+            parts.append("$")
+        elif token.startswith("$$"):
+            parts.append(f'<span class="math math-display">{render_math(token[2:-2].strip())}</span>')
+        elif token.startswith("$"):
+            parts.append(f'<span class="math">{render_math(token[1:-1].strip())}</span>')
+        else:
+            parts.append(f"<code>{escape(token[1:-1])}</code>")
+    return "".join(parts)
+
+
+def _source_fields(obj) -> tuple[str, ...]:
+    return RENDERED_FIELDS[type(obj).__name__]
+
+
+def content_hash(obj) -> str:
+    digest = hashlib.md5(str(RENDER_VERSION).encode(), usedforsecurity=False)
+    for field in _source_fields(obj):
+        digest.update(b"\0" + (getattr(obj, field) or "").encode())
+    return digest.hexdigest()
+
+
+def render_object(obj) -> bool:
+    """
+    Obyektning `rendered_html`/`render_hash` ustunlarini yangilaydi (saqlamaydi).
+    Matn o'zgarmagan bo'lsa hech narsa qilmaydi va False qaytaradi.
+    """
+
+    current = content_hash(obj)
+    if obj.render_hash == current:
+        return False
+    obj.rendered_html = {field: render(getattr(obj, field) or "") for field in _source_fields(obj)}
+    obj.render_hash = current
+    return True
+
+
+def render_objects(objects) -> list:
+    """bulk_create/bulk_update'dan oldin: o'zgargan obyektlar ro'yxati."""
+
+    return [obj for obj in objects if render_object(obj)]
+
+
+def field_html(rendered: dict | None, field: str, text: str | None) -> str:
+    """Saqlangan HTML; render qilinmagan eski qatorlar uchun joyida render."""
+
+    html = (rendered or {}).get(field)
+    return render(text or "") if html is None else html
+
+
+class RenderedHTML:
+    """
+    Model atributi: `question.question_html` -> tayyor xavfsiz HTML.
+
+        question_html = RenderedHTML("question_text")
+    """
+
+    def __init__(self, field: str):
+        self.field = field
+
+    def __get__(self, obj, objtype=None):
+        if obj is None:
+            return self
+        return mark_safe(field_html(obj.rendered_html, self.field, getattr(obj, self.field)))
@@ -0,0 +1,676 @@
+"""
+Test topshirish oqimi uchun umumiy yordamchi funksiyalar.
+
+HTML view'lar (`views.py`) va JSON API (`api.py`) bir xil ma'lumotlar
+bilan ishlaydi, shuning uchun so'rovlar va javoblarni saqlash shu yerda.
+"""
+
+from __future__ import annotations
+
+from collections import defaultdict
+from datetime import timedelta
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F
+from django.utils import timezone
+
+from .models import (
+    Question,
+    QuestionSetSnapshot,
+    QuestionSetVersion,
+    QuestionSignature,
+    SubmitToken,
+    TestSession,
+    TestTuri,
+    UserAnswer,
+)
+from .packing import pack_answers, pack_ids, unpack_answers, unpack_ids
+
+VALID_ANSWERS = frozenset({"A", "B", "C", "D"})
+
+# settings.TEST_ANSWER_STORAGE: "packed" - javoblar TestSession qatorida, "rows" - UserAnswer'da
+ANSWER_STORAGE_PACKED = "packed"
+
+# Anonim test topshiruvchi identifikatori saqlanadigan sessiya kaliti
+TEST_TAKER_SESSION_KEY = "test_taker_key"
+# Shu vaqt ichida bir xil bo'lim uchun qayta "Boshlash" bosilsa, yangi sessiya ochilmaydi
+START_DEDUP_TIMEOUT = 30
+
+CATALOGUE_CACHE_KEY = "testapp:catalogue"
+CATALOGUE_CACHE_TIMEOUT = 60
+QUESTION_PAYLOAD_CACHE_TIMEOUT = 60 * 60
+
+
+def build_catalogue() -> list[dict]:
+    """
+    Test turlari va ularning bo'limlari (savollar soni bilan).
+
+    ORM obyektlari emas, oddiy lug'atlar qaytariladi - natijani keshda
+    saqlash va JSON'ga aylantirish arzon bo'lishi uchun.
+    """
+
+    catalogue = cache.get(CATALOGUE_CACHE_KEY)
+    if catalogue is not None:
+        return catalogue
+
+    group_counts = (
+        Question.objects.values("category_id", "group_number")
+        .annotate(total=Count("id"))
+        .order_by("category_id", "group_number")
+    )
+    groups_by_category: dict[int, list[dict]] = defaultdict(list)
+    for row in group_counts:
+        groups_by_category[row["category_id"]].append(
+            {"group_number": row["group_number"], "total": row["total"]}
+        )
+
+    catalogue = []
+    for category in TestTuri.objects.order_by("name").values("id", "name", "description"):
+        groups = groups_by_category.get(category["id"], [])
+        catalogue.append(
+            {
+                **category,
+                "groups": groups,
+                "total_questions": sum(group["total"] for group in groups),
+            }
+        )
+
+    cache.set(CATALOGUE_CACHE_KEY, catalogue, CATALOGUE_CACHE_TIMEOUT)
+    return catalogue
+
+
+async def abuild_catalogue() -> list[dict]:
+    """
+    `build_catalogue` ning async varianti (ASGI view'lar uchun).
+    """
+
+    catalogue = await cache.aget(CATALOGUE_CACHE_KEY)
+    if catalogue is not None:
+        return catalogue
+
+    groups_by_category: dict[int, list[dict]] = defaultdict(list)
+    group_counts = (
+        Question.objects.values("category_id", "group_number")
+        .annotate(total=Count("id"))
+        .order_by("category_id", "group_number")
+    )
+    async for row in group_counts.aiterator():
+        groups_by_category[row["category_id"]].append(
+            {"group_number": row["group_number"], "total": row["total"]}
+        )
+
+    catalogue = []
+    categories = TestTuri.objects.order_by("name").values("id", "name", "description")
+    async for category in categories.aiterator():
+        groups = groups_by_category.get(category["id"], [])
+        catalogue.append(
+            {
+                **category,
+                "groups": groups,
+                "total_questions": sum(group["total"] for group in groups),
+            }
+        )
+
+    await cache.aset(CATALOGUE_CACHE_KEY, catalogue, CATALOGUE_CACHE_TIMEOUT)
+    return catalogue
+
+
+def resolve_group_number(category_id: int, group_number: int) -> int | None:
+    """
+    So'ralgan bo'lim bo'sh bo'lsa, birinchi mavjud bo'limni qaytaradi.
+    Kategoriyada umuman savol bo'lmasa - None.
+    """
+
+    group_number = max(group_number, 1)
+    groups = Question.objects.filter(category_id=category_id)
+    if groups.filter(group_number=group_number).exists():
+        return group_number
+    return (
+        groups.order_by("group_number")
+        .values_list("group_number", flat=True)
+        .first()
+    )
+
+
+async def aresolve_group_number(category_id: int, group_number: int) -> int | None:
+    group_number = max(group_number, 1)
+    groups = Question.objects.filter(category_id=category_id)
+    if await groups.filter(group_number=group_number).aexists():
+        return group_number
+    return await (
+        groups.order_by("group_number")
+        .values_list("group_number", flat=True)
+        .afirst()
+    )
+
+
+def question_set_version(category_id: int, group_number: int) -> int:
+    """
+    Bo'lim savollari versiyasi - savol mazmuniga bog'liq keshlar kalitiga qo'shiladi.
+
+    Har safar `QuestionSetVersion` jadvalidan (unikal indeks bo'yicha bitta
+    qator) o'qiladi: worker'lar keshi umumiy bo'lmasa ham tahrir hammasiga
+    darhol ko'rinadi. Hali o'zgartirilmagan bo'lim uchun versiya 0.
+    """
+
+    return (
+        QuestionSetVersion.objects.filter(category_id=category_id, group_number=group_number)
+        .values_list("version", flat=True)
+        .first()
+    ) or 0
+
+
+async def aquestion_set_version(category_id: int, group_number: int) -> int:
+    return (
+        await QuestionSetVersion.objects.filter(category_id=category_id, group_number=group_number)
+        .values_list("version", flat=True)
+        .afirst()
+    ) or 0
+
+
+def bump_question_set_versions(groups) -> None:
+    """
+    Berilgan (category_id, group_number) juftliklari versiyasini bittaga oshiradi.
+
+    Oshirish bitta UPDATE ... SET version = version + 1 bilan bajariladi,
+    katalog keshi esa tranzaksiya commit bo'lgandan keyin o'chiriladi.
+    """
+
+    groups = set(groups)
+    if not groups:
+        return
+    with transaction.atomic():
+        for category_id, group_number in groups:
+            versions = QuestionSetVersion.objects.filter(
+                category_id=category_id, group_number=group_number
+            )
+            if versions.update(version=F("version") + 1):
+                continue
+            try:
+                with transaction.atomic():
+                    QuestionSetVersion.objects.create(
+                        category_id=category_id, group_number=group_number, version=1
+                    )
+            except IntegrityError:
+                # Parallel so'rov qatorni birinchi bo'lib yaratdi
+                versions.update(version=F("version") + 1)
+
+    transaction.on_commit(lambda: cache.delete(CATALOGUE_CACHE_KEY))
+
+
+def lock_test_type(category_id: int) -> None:
+    """
+    Test turi qatorini tranzaksiya oxirigacha qulflaydi: shu test turidagi
+    qayta bo'lish, ko'chirish va fayldan import navbat bilan bajariladi.
+    SQLite'da tranzaksiya o'zi butun bazaga yozish qulfini oladi.
+    """
+
+    list(TestTuri.objects.select_for_update().filter(pk=category_id).values_list("pk", flat=True))
+
+
+def regroup_questions(category_id: int, chunk_size: int) -> int:
+    """
+    Test turi savollarini `chunk_size` tadan qaytadan bo'limlarga bo'ladi.
+
+    Joriy tartib (group_number, id) saqlanadi. Har bir yangi bo'lim uchun bitta
+    UPDATE ... WHERE id IN (...) bajariladi, bo'limi o'zgarmagan savollar
+    tegilmaydi. O'zgargan qatorlar soni qaytariladi.
+    """
+
+    changed = 0
+    affected = set()
+    with transaction.atomic():
+        # O'qish va UPDATE bitta tranzaksiyada, qatorlar qulflangan: orada
+        # qo'shilgan yoki ko'chirilgan savol noto'g'ri raqamlanmaydi
+        lock_test_type(category_id)
+        rows = list(
+            Question.objects.select_for_update()
+            .filter(category_id=category_id)
+            .order_by("group_number", "id")
+            .values_list("id", "group_number")
+        )
+        for start in range(0, len(rows), chunk_size):
+            group_number = start // chunk_size + 1
+            moved = [
+                (question_id, old_group)
+                for question_id, old_group in rows[start:start + chunk_size]
+                if old_group != group_number
+            ]
+            if not moved:
+                continue
+            changed += Question.objects.filter(
+                pk__in=[question_id for question_id, _ in moved]
+            ).update(group_number=group_number)
+            affected.add((category_id, group_number))
+            affected.update((category_id, old_group) for _, old_group in moved)
+        bump_question_set_versions(affected)
+    return changed
+
+
+def move_questions(queryset, category_id: int, group_number: int | None = None) -> int:
+    """
+    Savollarni boshqa test turiga (va ixtiyoriy ravishda boshqa bo'limga)
+    bitta UPDATE bilan ko'chiradi. `group_number` berilmasa, bo'lim raqami saqlanadi.
+    """
+
+    with transaction.atomic():
+        lock_test_type(category_id)
+        old_groups = set(
+            queryset.order_by().values_list("category_id", "group_number").distinct()
+        )
+        if not old_groups:
+            return 0
+        fields = {"category_id": category_id}
+        if group_number is not None:
+            fields["group_number"] = group_number
+            new_groups = {(category_id, group_number)}
+        else:
+            new_groups = {(category_id, group) for _, group in old_groups}
+        # O'xshashlik indeksidagi test turi (UPDATE signal yubormaydi); queryset
+        # category bo'yicha filtrlangan bo'lishi mumkin - ko'chirishdan oldin
+        QuestionSignature.objects.filter(question__in=queryset.values("pk")).update(
+            scope_id=category_id
+        )
+        changed = queryset.update(**fields)
+        bump_question_set_versions(old_groups | new_groups)
+    return changed
+
+
+def question_payload_cache_key(category_id: int, group_number: int, version: int) -> str:
+    return f"testapp:questions:{category_id}:{group_number}:v{version}"
+
+
+def build_question_payload(
+    category_id: int, group_number: int, version: int, question_ids=None
+) -> list[dict]:
+    """
+    Bo'lim savollari (to'g'ri javobsiz), `id` bo'yicha tartiblangan.
+
+    Savollar `version` nusxasidan olinadi (sessiya uchun - `session_answer_key`
+    bilan `question_ids`), nusxa hali bo'lmasa bo'limning hozirgi savollari.
+    """
+
+    key = question_payload_cache_key(category_id, group_number, version)
+    payload = cache.get(key)
+    if payload is not None:
+        return payload
+
+    if question_ids is None:
+        question_ids = _load_snapshot(category_id, group_number, version)
+    if question_ids is None:
+        rows = Question.objects.filter(category_id=category_id, group_number=group_number)
+    else:
+        rows = Question.objects.filter(pk__in=list(question_ids))
+    rows = rows.order_by("id").values_list(
+        "id", "question_text", "choice_a", "choice_b", "choice_c", "choice_d"
+    )
+    payload = [
+        {
+            "id": question_id,
+            "text": text,
+            "choices": [
+                [letter, choice]
+                for letter, choice in zip("ABCD", (choice_a, choice_b, choice_c, choice_d))
+                if choice
+            ],
+        }
+        for question_id, text, choice_a, choice_b, choice_c, choice_d in rows
+    ]
+    cache.set(key, payload, QUESTION_PAYLOAD_CACHE_TIMEOUT)
+    return payload
+
+
+def question_set_snapshot_key(category_id: int, group_number: int, version: int) -> str:
+    return f"testapp:snapshot:{category_id}:{group_number}:v{version}"
+
+
+def _load_snapshot(category_id: int, group_number: int, version: int) -> dict[int, str] | None:
+    # Nusxa o'zgarmaydi - keshdagi qiymat hech qachon eskirmaydi
+    key = question_set_snapshot_key(category_id, group_number, version)
+    answers = cache.get(key)
+    if answers is None:
+        row = (
+            QuestionSetSnapshot.objects.filter(
+                category_id=category_id, group_number=group_number, version=version
+            )
+            .values_list("question_ids", "answer_key")
+            .first()
+        )
+        if row is None:
+            return None
+        answers = unpack_answers(unpack_ids(row[0]), row[1])
+        cache.set(key, answers, QUESTION_PAYLOAD_CACHE_TIMEOUT)
+    return answers
+
+
+def snapshot_question_set(category_id: int, group_number: int) -> tuple[int, dict[int, str]]:
+    """
+    Bo'limning joriy versiyasi va {question_id: to'g'ri javob}; shu versiya
+    uchun `QuestionSetSnapshot` hali bo'lmasa yaratiladi.
+
+    Tahrir commit bo'lgan paytda boshlangan sessiya oldingi versiya nusxasini
+    olishi mumkin - sessiya versiyani yozib qo'yadi va ko'rsatish ham, ball
+    ham shu nusxa bo'yicha bo'ladi.
+    """
+
+    version = question_set_version(category_id, group_number)
+    answers = _load_snapshot(category_id, group_number, version)
+    if answers is not None:
+        return version, answers
+
+    with transaction.atomic():
+        # Versiya qatori qulflanadi: savollar o'qilayotganda parallel tahrir
+        # (bump_question_set_versions) commit bo'lguncha kutadi
+        version_row, _ = QuestionSetVersion.objects.select_for_update().get_or_create(
+            category_id=category_id, group_number=group_number, defaults={"version": 0}
+        )
+        version = version_row.version
+        answers = dict(
+            Question.objects.filter(category_id=category_id, group_number=group_number)
+            .order_by("id")
+            .values_list("id", "correct_answer")
+        )
+        question_ids = sorted(answers)
+        QuestionSetSnapshot.objects.get_or_create(
+            category_id=category_id,
+            group_number=group_number,
+            version=version,
+            defaults={
+                "question_ids": pack_ids(question_ids),
+                "answer_key": pack_answers(question_ids, answers),
+            },
+        )
+    cache.set(
+        question_set_snapshot_key(category_id, group_number, version),
+        answers,
+        QUESTION_PAYLOAD_CACHE_TIMEOUT,
+    )
+    return version, answers
+
+
+def session_answer_key(test_session: TestSession) -> dict[int, str]:
+    """
+    Sessiya boshlangan versiyadagi javoblar kaliti. Arxivlangan sessiyada -
+    arxivlash paytida yozib qo'yilgan kalit, nusxasi bo'lmagan (nusxalashdan
+    oldin boshlangan) sessiyalar uchun - bo'limning joriy nusxasi.
+    """
+
+    if test_session.archived_at and test_session.archived_answer_key:
+        return unpack_answers(
+            unpack_ids(test_session.question_ids), test_session.archived_answer_key
+        )
+    answers = _load_snapshot(
+        test_session.category_id, test_session.group_number, test_session.question_set_version
+    )
+    if answers is None:
+        _, answers = snapshot_question_set(test_session.category_id, test_session.group_number)
+    return answers
+
+
+asession_answer_key = sync_to_async(session_answer_key)
+
+
+def normalize_answers(raw: dict, question_ids) -> dict[int, str]:
+    """
+    Faqat shu bo'limga tegishli va A/B/C/D bo'lgan javoblarni qoldiradi.
+    """
+
+    allowed = set(question_ids)
+    answers: dict[int, str] = {}
+    for question_id, selected in raw.items():
+        try:
+            question_id = int(question_id)
+        except (TypeError, ValueError):
+            continue
+        if not isinstance(selected, str):
+            # API JSON'ida son/ro'yxat bo'lishi mumkin
+            continue
+        selected = selected.upper()
+        if question_id in allowed and selected in VALID_ANSWERS:
+            answers[question_id] = selected
+    return answers
+
+
+def create_test_session(session_key: str, category_id: int, group_number: int) -> TestSession:
+    """
+    Yangi test sessiyasi. `TEST_ANSWER_STORAGE = "packed"` bo'lsa, bo'lim
+    savollari tartibi shu yerda muzlatiladi va javoblar keyin UserAnswer
+    qatorlariga emas, sessiyaning o'ziga (`packed_answers`) yoziladi.
+    """
+
+    version, key = snapshot_question_set(category_id, group_number)
+    question_ids = ""
+    if settings.TEST_ANSWER_STORAGE == ANSWER_STORAGE_PACKED:
+        question_ids = pack_ids(sorted(key))
+    with transaction.atomic():
+        # Ikki marta bosilgan yoki qayta yuborilgan forma avvalgi sessiyani
+        # qaytaradi. Tekshiruv bazada (session_key indeksi bo'yicha), shuning
+        # uchun so'rov boshqa worker'ga tushsa ham ishlaydi
+        existing = (
+            TestSession.objects.filter(
+                session_key=session_key,
+                category_id=category_id,
+                group_number=group_number,
+                finished_at__isnull=True,
+                started_at__gte=timezone.now() - timedelta(seconds=START_DEDUP_TIMEOUT),
+            )
+            .order_by("-pk")
+            .first()
+        )
+        if existing:
+            return existing
+        return TestSession.objects.create(
+            session_key=session_key,
+            category_id=category_id,
+            group_number=group_number,
+            question_set_version=version,
+            question_ids=question_ids,
+        )
+
+
+acreate_test_session = sync_to_async(create_test_session)
+
+
+def save_answers(test_session: TestSession, answers: dict[int, str]) -> None:
+    """
+    Sessiya javoblarini bitta tranzaksiyada almashtiradi.
+
+    Ixcham sessiyada bu bitta UPDATE. Aks holda har bir savol uchun alohida
+    update_or_create o'rniga bitta DELETE va bitta bulk INSERT bajariladi.
+    """
+
+    if test_session.question_ids:
+        question_ids = unpack_ids(test_session.question_ids)
+        if not answers.keys() <= set(question_ids):
+            # Test davomida bo'limga savol qo'shilgan - tartib kengaytiriladi
+            question_ids = sorted(set(question_ids) | answers.keys())
+            test_session.question_ids = pack_ids(question_ids)
+        test_session.packed_answers = pack_answers(question_ids, answers)
+        TestSession.objects.filter(pk=test_session.pk).update(
+            question_ids=test_session.question_ids,
+            packed_answers=test_session.packed_answers,
+        )
+        return
+
+    with transaction.atomic():
+        UserAnswer.objects.filter(test_session=test_session).delete()
+        UserAnswer.objects.bulk_create(
+            [
+                UserAnswer(
+                    test_session=test_session,
+                    question_id=question_id,
+                    selected_answer=selected,
+                )
+                for question_id, selected in answers.items()
+            ]
+        )
+
+
+def claim_submit_token(test_session: TestSession, scope: str, token: str) -> SubmitToken | None:
+    """
+    Token shu sessiyada birinchi marta ishlatilayotgan bo'lsa - yangi
+    `SubmitToken` qatori, aks holda None.
+
+    Javoblarni yozish bilan bitta `transaction.atomic()` ichida chaqiriladi:
+    yozish xato bilan tugasa token ham bekor bo'ladi va qayta yuborish
+    odatdagidek bajariladi; parallel ikkinchi so'rov esa birinchisi commit
+    bo'lguncha unique indeksda kutadi va None oladi.
+    """
+
+    try:
+        with transaction.atomic():
+            return SubmitToken.objects.create(test_session=test_session, scope=scope, token=token)
+    except IntegrityError:
+        return None
+
+
+def submit_answers(test_session: TestSession, answers: dict[int, str], token: str = "") -> bool:
+    """
+    Forma javoblarini saqlab sessiyani tugatadi. Qayta yuborilgan (ikki marta
+    bosilgan, sahifa yangilangan) forma - hech narsa yozilmaydi, False.
+    Token bo'lmasa (eski forma) so'rov odatdagidek qayta ishlanadi.
+    """
+
+    with transaction.atomic():
+        if token and claim_submit_token(test_session, SubmitToken.SCOPE_FORM, token) is None:
+            return False
+        save_answers(test_session, answers)
+        finish_session(test_session)
+    return True
+
+
+# Token va javoblar bitta tranzaksiyada bo'lishi kerak, async ORM esa
+# transaction.atomic() ni qo'llamaydi - shuning uchun sync funksiya ustidan.
+asubmit_answers = sync_to_async(submit_answers)
+
+
+def finish_session(test_session: TestSession) -> None:
+    if not test_session.finished_at:
+        test_session.finished_at = timezone.now()
+        test_session.save(update_fields=["finished_at"])
+
+
+def session_answers(test_session: TestSession) -> dict[int, str]:
+    if test_session.question_ids:
+        return unpack_answers(unpack_ids(test_session.question_ids), test_session.packed_answers)
+    return dict(
+        UserAnswer.objects.filter(test_session=test_session).values_list(
+            "question_id", "selected_answer"
+        )
+    )
+
+
+async def asession_answers(test_session: TestSession) -> dict[int, str]:
+    if test_session.question_ids:
+        return unpack_answers(unpack_ids(test_session.question_ids), test_session.packed_answers)
+    rows = UserAnswer.objects.filter(test_session=test_session).values_list(
+        "question_id", "selected_answer"
+    )
+    # values_list().aiterator() SQL'ni sinxron bajaradi, shuning uchun
+    # QuerySet'ning o'zi ustida async for
+    return {question_id: selected async for question_id, selected in rows}
+
+
+def session_questions(test_session: TestSession):
+    """
+    Natijalar sahifasidagi savollar: sessiya boshlangan versiya nusxasidagi
+    (ixcham sessiyada - sessiyaning o'zidagi) savollar, joriy matni bilan.
+    """
+
+    if test_session.question_ids:
+        question_ids = unpack_ids(test_session.question_ids)
+    else:
+        question_ids = session_answer_key(test_session)
+    return Question.objects.filter(pk__in=question_ids).order_by("id")
+
+
+async def asession_questions(test_session: TestSession):
+    if test_session.question_ids:
+        question_ids = unpack_ids(test_session.question_ids)
+    else:
+        question_ids = await asession_answer_key(test_session)
+    return Question.objects.filter(pk__in=question_ids).order_by("id")
+
+
+def archive_sessions(session_ids) -> int:
+    """
+    Tugallangan sessiyalarni arxivlaydi: ball va javoblar TestSession
+    qatorining o'ziga ixcham ko'rinishda yoziladi, UserAnswer va SubmitToken
+    qatorlari o'chiriladi.
+    """
+
+    with transaction.atomic():
+        sessions = list(
+            TestSession.objects.select_for_update()
+            .filter(pk__in=session_ids, finished_at__isnull=False, archived_at__isnull=True)
+        )
+        if not sessions:
+            return 0
+
+        answers_by_session: dict[int, dict[int, str]] = defaultdict(dict)
+        rows = UserAnswer.objects.filter(test_session__in=sessions).values_list(
+            "test_session_id", "question_id", "selected_answer"
+        )
+        for session_id, question_id, selected in rows:
+            answers_by_session[session_id][question_id] = selected
+
+        now = timezone.now()
+        for test_session in sessions:
+            if test_session.question_ids:
+                answers = session_answers(test_session)
+            else:
+                answers = answers_by_session.get(test_session.pk, {})
+            key = session_answer_key(test_session)
+            # Javob berilgan, lekin keyin bo'limdan chiqarilgan savollar ham saqlanadi
+            question_ids = sorted(key.keys() | answers.keys())
+            result = score(answers, key)
+            test_session.question_ids = pack_ids(question_ids)
+            test_session.packed_answers = pack_answers(question_ids, answers)
+            test_session.archived_answer_key = pack_answers(question_ids, key)
+            test_session.score_correct = result["correct"]
+            test_session.score_total = result["total"]
+            test_session.archived_at = now
+
+        TestSession.objects.bulk_update(
+            sessions,
+            [
+                "question_ids",
+                "packed_answers",
+                "archived_answer_key",
+                "score_correct",
+                "score_total",
+                "archived_at",
+            ],
+        )
+        UserAnswer.objects.filter(test_session__in=sessions).delete()
+        SubmitToken.objects.filter(test_session__in=sessions).delete()
+    return len(sessions)
+
+
+def archived_score(test_session: TestSession) -> dict:
+    """Arxivlangan sessiya balli - arxivlash paytida saqlangan natija."""
+
+    total = test_session.score_total or 0
+    correct = test_session.score_correct or 0
+    percentage = (correct / total * 100) if total > 0 else 0
+    return {
+        "total": total,
+        "correct": correct,
+        "wrong": total - correct,
+        "percentage": round(percentage, 2),
+    }
+
+
+def score(answers: dict[int, str], key: dict[int, str]) -> dict:
+    total = len(key)
+    correct = sum(1 for question_id, right in key.items() if answers.get(question_id) == right)
+    percentage = (correct / total * 100) if total > 0 else 0
+    return {
+        "total": total,
+        "correct": correct,
+        "wrong": total - correct,
+        "percentage": round(percentage, 2),
+    }
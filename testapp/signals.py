@@ -0,0 +1,71 @@
+"""
+Savollar o'zgarganda (category, group_number) versiyasini oshirish,
+matn HTML'ini (testapp/richtext.py) va o'xshashlik imzosini
+(testapp/similarity.py) yangilash.
+
+Admin'dagi QuestionInline va QuestionAdmin orqali tahrirlar shu signallardan
+o'tadi; bulk_create/update() signal yubormaydi, shuning uchun ularni
+chaqiruvchi kod `render_objects`, `bump_question_set_versions` va
+`index_objects` ni o'zi chaqiradi.
+"""
+
+from django.core.cache import cache
+from django.db.models import QuerySet
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from .models import PracticeQuestion, Question, TestTuri
+from .richtext import render_object
+from .services import CATALOGUE_CACHE_KEY, bump_question_set_versions
+from .similarity import index_objects
+
+
+@receiver(pre_save, sender=Question)
+def remember_question_group(sender, instance: Question, **kwargs):
+    # Savol boshqa bo'lim/test turiga ko'chirilsa, eski bo'lim ham o'zgargan
+    instance._previous_group = None
+    if instance.pk:
+        instance._previous_group = (
+            Question.objects.filter(pk=instance.pk)
+            .values_list("category_id", "group_number")
+            .first()
+        )
+    # Shu save() bilan birga yoziladi - alohida UPDATE yo'q
+    render_object(instance)
+
+
+@receiver(post_save, sender=Question)
+def question_saved(sender, instance: Question, **kwargs):
+    groups = {(instance.category_id, instance.group_number)}
+    if getattr(instance, "_previous_group", None):
+        groups.add(instance._previous_group)
+    bump_question_set_versions(groups)
+    # O'xshashlik imzosi faqat matn/variantlar o'zgarganda qayta hisoblanadi
+    index_objects([instance])
+
+
+@receiver(post_delete, sender=Question)
+def question_deleted(sender, instance: Question, origin=None, **kwargs):
+    # Test turi o'chirilganda uning versiya yozuvlari ham CASCADE bilan ketadi
+    if isinstance(origin, TestTuri) or (
+        isinstance(origin, QuerySet) and origin.model is TestTuri
+    ):
+        cache.delete(CATALOGUE_CACHE_KEY)
+        return
+    bump_question_set_versions([(instance.category_id, instance.group_number)])
+
+
+@receiver(post_save, sender=TestTuri)
+@receiver(post_delete, sender=TestTuri)
+def test_turi_changed(sender, **kwargs):
+    cache.delete(CATALOGUE_CACHE_KEY)
+
+
+@receiver(pre_save, sender=PracticeQuestion)
+def render_practice_question(sender, instance: PracticeQuestion, **kwargs):
+    render_object(instance)
+
+
+@receiver(post_save, sender=PracticeQuestion)
+def practice_question_saved(sender, instance: PracticeQuestion, **kwargs):
+    index_objects([instance])
@@ -0,0 +1,310 @@
+"""
+Savollar bazasidagi deyarli bir xil (qayta yozilgan) savollarni topish.
+
+Matn normallashtiriladi (kichik harf, tinish belgilarisiz, o‘/o'/oʻ bir xil),
+ketma-ket so'z juftliklariga (shingle) bo'linadi va `SIGNATURE_PERMUTATIONS` ta xesh
+qiymati bo'yicha MinHash imzosi olinadi. Ikki imzodagi teng qiymatlar
+ulushi matnlar Jaccard o'xshashligining bahosi.
+
+LSH: imzo `LSH_BANDS` ta bo'lakka bo'linadi, har bir bo'lak xeshi
+`SignatureBucket` jadvaliga indeks bilan yoziladi. Nomzodlar faqat umumiy
+bo'lakka ega savollar - indeks bo'yicha qidiruv, butun bazani skanerlash yo'q.
+16x4 bo'lak bilan o'xshashligi ~0.5 dan yuqori juftliklar katta ehtimol bilan
+nomzod bo'ladi, so'ng imzo bo'yicha `DUPLICATE_THRESHOLD` bilan tekshiriladi.
+
+Savolda variantlar ham hisobga olinadi (tartibidan qat'i nazar), amaliy
+savolda - faqat savol matni. Imzolar savol saqlanganda (signals.py) va
+fayldan import qilinganda (`index_objects`) yangilanadi; to'liq qayta
+qurish - `python manage.py build_similarity_index`.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import re
+import struct
+from collections import defaultdict
+
+from django.db import transaction
+from django.db.models import Count
+
+from .models import PracticeQuestion, Question, QuestionSignature, SignatureBucket
+
+# So'z juftliklari: kichik lug'atli fan matnlarida belgi n-gramlari (harf
+# ketma-ketliklari) bir-biriga bog'liq bo'lmagan savollarda ham takrorlanadi
+SHINGLE_SIZE = 2
+SIGNATURE_PERMUTATIONS = 64
+LSH_BANDS = 16
+BAND_ROWS = SIGNATURE_PERMUTATIONS // LSH_BANDS
+DUPLICATE_THRESHOLD = 0.6
+# Katta bo'lakda (shablon savollar) juftliklar soni kvadratik o'sadi - undan
+# kattasida a'zolar faqat bo'lakning birinchi a'zosi bilan solishtiriladi
+MAX_BUCKET_PAIRWISE = 20
+
+KIND_QUESTION = "q"
+KIND_PRACTICE = "p"
+
+# Har bir shingle uchun bitta 64 baytli blake2b xeshi = 16 ta 32 bitli
+# "permutatsiya" qiymati; tuzi (salt) har xil bo'lgan bir nechta xesh bilan
+# SIGNATURE_PERMUTATIONS taga yetkaziladi. Ustun bo'yicha minimum - C darajasida
+# (`map(min, zip(...))`), Python'dagi (a*x+b) % p siklidan ~2.5 marta tez.
+_HASH_WORDS = 16
+_HASH_SALTS = [f"taalim-mh-{block}".encode() for block in range(SIGNATURE_PERMUTATIONS // _HASH_WORDS)]
+_HASH_STRUCT = struct.Struct(f"<{_HASH_WORDS}I")
+_SIGNATURE_FORMAT = f"<{SIGNATURE_PERMUTATIONS}I"
+
+_APOSTROPHES_RE = re.compile(r"[‘’ʻʼ`´]")
+_NON_WORD_RE = re.compile(r"[^\w']+")
+
+
+def normalize(text: str) -> str:
+    text = _APOSTROPHES_RE.sub("'", text.lower())
+    return " ".join(_NON_WORD_RE.sub(" ", text).split())
+
+
+def question_content(question: Question) -> str:
+    choices = sorted(
+        normalize(choice)
+        for choice in (question.choice_a, question.choice_b, question.choice_c, question.choice_d)
+        if choice
+    )
+    return " | ".join([normalize(question.question_text), *choices])
+
+
+def practice_content(question: PracticeQuestion) -> str:
+    return normalize(question.question_text)
+
+
+def shingles(text: str) -> set[bytes]:
+    words = text.split()
+    if len(words) < SHINGLE_SIZE:
+        return {text.encode()}
+    return {
+        " ".join(words[i:i + SHINGLE_SIZE]).encode()
+        for i in range(len(words) - SHINGLE_SIZE + 1)
+    }
+
+
+def minhash(text: str) -> tuple[int, ...]:
+    values = shingles(text)
+    signature = []
+    for salt in _HASH_SALTS:
+        signature.extend(map(min, zip(*(
+            _HASH_STRUCT.unpack(hashlib.blake2b(value, digest_size=64, salt=salt).digest())
+            for value in values
+        ))))
+    return tuple(signature)
+
+
+def pack_signature(signature: tuple[int, ...]) -> bytes:
+    return struct.pack(_SIGNATURE_FORMAT, *signature)
+
+
+def unpack_signature(data) -> tuple[int, ...]:
+    return struct.unpack(_SIGNATURE_FORMAT, bytes(data))
+
+
+def similarity(left: tuple[int, ...], right: tuple[int, ...]) -> float:
+    return sum(a == b for a, b in zip(left, right)) / SIGNATURE_PERMUTATIONS
+
+
+def band_buckets(kind: str, signature: tuple[int, ...]) -> list[int]:
+    buckets = []
+    for band in range(LSH_BANDS):
+        rows = signature[band * BAND_ROWS:(band + 1) * BAND_ROWS]
+        digest = hashlib.blake2b(
+            f"{kind}:{band}:".encode() + struct.pack(f"<{BAND_ROWS}I", *rows), digest_size=8
+        ).digest()
+        buckets.append(int.from_bytes(digest, "little", signed=True))
+    return buckets
+
+
+def _content_hash(content: str) -> str:
+    return hashlib.md5(content.encode(), usedforsecurity=False).hexdigest()
+
+
+def _owner(obj) -> tuple[str, str, str, int | None]:
+    if isinstance(obj, Question):
+        return KIND_QUESTION, "question", question_content(obj), obj.category_id
+    return KIND_PRACTICE, "practice_question", practice_content(obj), obj.category_id
+
+
+def index_objects(objects) -> None:
+    """
+    Savollar (yoki amaliy savollar) imzolarini yaratadi/yangilaydi.
+    Matni o'zgarmagan savollar uchun faqat `scope_id` yangilanadi.
+    """
+
+    objects = list(objects)
+    if not objects:
+        return
+    kind, field, _, _ = _owner(objects[0])
+    existing = {
+        getattr(signature, f"{field}_id"): signature
+        for signature in QuestionSignature.objects.filter(
+            **{f"{field}_id__in": [obj.pk for obj in objects]}
+        ).only("id", f"{field}_id", "content_hash", "scope_id")
+    }
+
+    to_create, to_rebuild, scope_changed = [], [], []
+    for obj in objects:
+        _, _, content, scope_id = _owner(obj)
+        content_hash = _content_hash(content)
+        signature = existing.get(obj.pk)
+        if signature is not None and signature.content_hash == content_hash:
+            if signature.scope_id != scope_id:
+                signature.scope_id = scope_id
+                scope_changed.append(signature)
+            continue
+        values = minhash(content)
+        if signature is None:
+            signature = QuestionSignature(**{field: obj})
+            to_create.append((signature, values))
+        else:
+            to_rebuild.append((signature, values))
+        signature.scope_id = scope_id
+        signature.content_hash = content_hash
+        signature.minhash = pack_signature(values)
+
+    with transaction.atomic():
+        if scope_changed:
+            QuestionSignature.objects.bulk_update(scope_changed, ["scope_id"])
+        if to_rebuild:
+            QuestionSignature.objects.bulk_update(
+                [signature for signature, _ in to_rebuild], ["scope_id", "content_hash", "minhash"]
+            )
+            SignatureBucket.objects.filter(
+                signature__in=[signature for signature, _ in to_rebuild]
+            ).delete()
+        if to_create:
+            QuestionSignature.objects.bulk_create([signature for signature, _ in to_create])
+        SignatureBucket.objects.bulk_create(
+            [
+                SignatureBucket(signature=signature, bucket=bucket)
+                for signature, values in to_rebuild + to_create
+                for bucket in band_buckets(kind, values)
+            ],
+            batch_size=2000,
+        )
+
+
+def find_similar(
+    obj, threshold: float = DUPLICATE_THRESHOLD, same_scope: bool = False
+) -> list[tuple[int, float]]:
+    """
+    Berilgan savolga o'xshash savollar: [(id, o'xshashlik), ...], kamayish tartibida.
+    """
+
+    kind, field, content, scope_id = _owner(obj)
+    values = minhash(content)
+    candidates = QuestionSignature.objects.filter(
+        buckets__bucket__in=band_buckets(kind, values), **{f"{field}__isnull": False}
+    ).exclude(**{f"{field}_id": obj.pk})
+    if same_scope:
+        candidates = candidates.filter(scope_id=scope_id)
+
+    found = {}
+    for owner_id, packed in candidates.values_list(f"{field}_id", "minhash").distinct():
+        score = similarity(values, unpack_signature(packed))
+        if score >= threshold:
+            found[owner_id] = score
+    return sorted(found.items(), key=lambda item: item[1], reverse=True)
+
+
+def duplicate_clusters(
+    kind: str = KIND_QUESTION, scope_id: int | None = None, threshold: float = DUPLICATE_THRESHOLD
+) -> list[dict]:
+    """
+    Deyarli bir xil savollar klasterlari (bog'liq komponentlar):
+    [{"ids": [...], "similarity": klasterni bog'lagan juftliklarning eng past bahosi}, ...],
+    katta klasterlar avval.
+    """
+
+    field = "question" if kind == KIND_QUESTION else "practice_question"
+    signatures = QuestionSignature.objects.filter(**{f"{field}__isnull": False})
+    if scope_id is not None:
+        signatures = signatures.filter(scope_id=scope_id)
+
+    buckets = SignatureBucket.objects.filter(signature__in=signatures)
+    # Faqat bir nechta savolga umumiy bo'laklar - GROUP BY bazada, indeks bo'yicha
+    shared = (
+        buckets.values("bucket")
+        .annotate(members=Count("id"))
+        .filter(members__gt=1)
+        .values("bucket")
+    )
+    members = defaultdict(list)
+    for bucket, signature_id in (
+        buckets.filter(bucket__in=shared).order_by("signature_id").values_list("bucket", "signature_id")
+    ):
+        members[bucket].append(signature_id)
+    pairs = set()
+    for ids in members.values():
+        if len(ids) > MAX_BUCKET_PAIRWISE:
+            pairs.update((ids[0], other) for other in ids[1:])
+        else:
+            pairs.update(
+                (ids[i], ids[j]) for i in range(len(ids)) for j in range(i + 1, len(ids))
+            )
+    if not pairs:
+        return []
+
+    involved = {signature_id for pair in pairs for signature_id in pair}
+    rows = {}
+    for ids in _chunked(sorted(involved), 900):
+        for signature_id, owner_id, packed in QuestionSignature.objects.filter(
+            pk__in=ids
+        ).values_list("id", f"{field}_id", "minhash"):
+            # (qiymat, pozitsiya) butun son to'plami: juftlikni solishtirish - C'dagi kesishma
+            rows[signature_id] = (
+                owner_id,
+                frozenset(
+                    value * SIGNATURE_PERMUTATIONS + position
+                    for position, value in enumerate(unpack_signature(packed))
+                ),
+            )
+
+    parent = {}
+
+    def find(node):
+        parent.setdefault(node, node)
+        while parent[node] != node:
+            parent[node] = parent[parent[node]]
+            node = parent[node]
+        return node
+
+    pair_scores = {}
+    for left, right in pairs:
+        if left in parent and right in parent and find(left) == find(right):
+            # Bir klasterda - baho klasterni o'zgartirmaydi
+            continue
+        score = len(rows[left][1] & rows[right][1]) / SIGNATURE_PERMUTATIONS
+        if score < threshold:
+            continue
+        root_left, root_right = find(left), find(right)
+        if root_left != root_right:
+            parent[root_right] = root_left
+        pair_scores[(left, right)] = score
+
+    clusters = defaultdict(list)
+    for node in parent:
+        clusters[find(node)].append(node)
+    cluster_scores = defaultdict(lambda: 1.0)
+    for (left, _), score in pair_scores.items():
+        root = find(left)
+        cluster_scores[root] = min(cluster_scores[root], score)
+
+    result = [
+        {
+            "ids": sorted(rows[node][0] for node in nodes),
+            "similarity": cluster_scores[root],
+        }
+        for root, nodes in clusters.items()
+    ]
+    result.sort(key=lambda cluster: (-len(cluster["ids"]), -cluster["similarity"]))
+    return result
+
+
+def _chunked(values: list, size: int):
+    for offset in range(0, len(values), size):
+        yield values[offset:offset + size]
@@ -1,3 +1,345 @@
-from django.test import TestCase
+import json
+import random
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+
+from . import throttling
+from .checks import ratelimit_cache_check
+from .models import Question, SubmitToken, TestTuri
+from .packing import pack_answers, pack_ids, unpack_answers, unpack_ids
+from .richtext import render, render_math
+from .similarity import DUPLICATE_THRESHOLD, duplicate_clusters, find_similar
+from .services import (
+    create_test_session,
+    move_questions,
+    save_answers,
+    score,
+    session_answer_key,
+    session_answers,
+    submit_answers,
+)
+
+
+def make_questions(category, count, group_number=1):
+    return Question.objects.bulk_create(
+        Question(
+            question_text=f"Savol {index}",
+            choice_a="a",
+            choice_b="b",
+            choice_c="c",
+            choice_d="d",
+            correct_answer="ABCD"[index % 4],
+            category=category,
+            group_number=group_number,
+        )
+        for index in range(count)
+    )
+
+
+class PackingTests(SimpleTestCase):
+    def test_ids_round_trip_with_ranges_and_gaps(self):
+        question_ids = [3, 781, 782, 783, 790, 791, 1000]
+        packed = pack_ids(question_ids)
+        self.assertEqual(packed, "3,781-783,790-791,1000")
+        self.assertEqual(unpack_ids(packed), question_ids)
+
+    def test_ids_edge_cases(self):
+        self.assertEqual(pack_ids([]), "")
+        self.assertEqual(unpack_ids(""), [])
+        self.assertEqual(unpack_ids(pack_ids([7])), [7])
+        # Tartib saqlanadi: o'sib bormaydigan qo'shnilar oraliqqa qo'shilmaydi
+        self.assertEqual(unpack_ids(pack_ids([5, 3, 4, 2])), [5, 3, 4, 2])
+
+    def test_answers_round_trip_with_unanswered(self):
+        question_ids = unpack_ids("10-13,20")
+        answers = {10: "A", 12: "D", 20: "B"}
+        packed = pack_answers(question_ids, answers)
+        self.assertEqual(packed, "A-D-B")
+        self.assertEqual(unpack_answers(question_ids, packed), answers)
+
+    def test_answers_outside_question_set_are_dropped(self):
+        self.assertEqual(pack_answers([1, 2], {2: "C", 99: "A"}), "-C")
+
+
+class RichTextTests(SimpleTestCase):
+    def test_html_is_escaped(self):
+        self.assertEqual(render("<script>alert(1)</script>"), "&lt;script&gt;alert(1)&lt;/script&gt;")
+        self.assertEqual(render("**<b>x</b>**"), "<strong>&lt;b&gt;x&lt;/b&gt;</strong>")
+        self.assertEqual(render("`<i>`"), "<code>&lt;i&gt;</code>")
+        self.assertEqual(
+            render("$\\frac{<}{b}$"),
+            '<span class="math"><span class="frac"><sup>&lt;</sup>&frasl;<sub>b</sub></span></span>',
+        )
+        self.assertEqual(render("$\\unknown<$"), '<span class="math">\\unknown&lt;</span>')
+
+    def test_markup(self):
+        self.assertEqual(render("a < b & **c**"), "a &lt; b &amp; <strong>c</strong>")
+        self.assertEqual(render("$x^2$"), '<span class="math">x<sup>2</sup></span>')
+        self.assertEqual(render("line1\nline2"), "line1<br>line2")
+
+    def test_trailing_backslash_is_literal(self):
+        self.assertEqual(render_math("\\"), "\\")
+        self.assertEqual(render_math("x^\\"), "x<sup>\\</sup>")
+        self.assertEqual(render_math("x^{a\\}}"), "x<sup>a}</sup>")
+        # \$ formulani yopmaydi - "$a\$" formula emas
+        self.assertEqual(render("$a\\$"), "$a$")
+        self.assertEqual(render("$x^\\$ ok"), "$x^$ ok")
+        self.assertEqual(render("$a\\$b$"), '<span class="math">a$b</span>')
+
+    def test_dollar_amounts_stay_text(self):
+        self.assertEqual(render("Narxi $5 va $10"), "Narxi $5 va $10")
+        self.assertEqual(render("\\$5 and \\$6"), "$5 and $6")
+
+
+class ThrottlingTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+
+    def hit(self, now, rate="3/60", ident="talaba"):
+        with mock.patch.object(throttling.time, "time", return_value=now):
+            return throttling.hit("submit", ident, rate)
+
+    def test_hit_blocks_over_limit(self):
+        self.assertEqual([self.hit(120.0) for _ in range(3)], [None, None, None])
+        # To'rtinchisi: keyingi oynada 4 * (1 - 0.5) + 1 <= 3 bo'lguncha
+        self.assertEqual(self.hit(120.0), 90)
+        self.assertIsNone(self.hit(210.0))
+
+    def test_retry_after_within_window(self):
+        # Oldingi oynada 4 ta, joriyda rad etilgan bittasi: 4 * (1 - e) + 2 <= 3 -> e >= 0.75
+        self.assertEqual(throttling._retry_after(3, 60, previous=4, current=1, elapsed=0.25), 30)
+
+    def test_retry_after_is_exact(self):
+        rnd = random.Random(40)
+        for _ in range(200):
+            limit, window = rnd.randint(1, 10), rnd.choice([10, 60])
+            rate = f"{limit}/{window}"
+            start = 1_000_000.0 + rnd.random() * window
+            steps = [rnd.random() * window / (2 * limit) for _ in range(200)]
+
+            def burst(probe):
+                cache.clear()
+                now = start
+                for step in steps:
+                    retry_after = self.hit(now, rate)
+                    if retry_after is not None:
+                        return retry_after, self.hit(now + probe(retry_after), rate)
+                    now += step
+                self.fail("chegaraga yetilmadi")
+
+            retry_after, after_wait = burst(lambda retry_after: retry_after)
+            self.assertIsNone(after_wait)
+            if retry_after > 1:
+                self.assertIsNotNone(burst(lambda retry_after: retry_after - 1)[1])
+
+    @override_settings(TRUSTED_PROXIES=["10.0.0.0/8", "127.0.0.1"])
+    def test_client_ip_behind_trusted_proxies(self):
+        factory = RequestFactory()
+
+        def client_ip(remote, forwarded):
+            request = factory.get("/", REMOTE_ADDR=remote, HTTP_X_FORWARDED_FOR=forwarded)
+            return throttling.client_ip(request)
+
+        self.assertEqual(client_ip("127.0.0.1", "6.6.6.6, 5.5.5.5, 10.1.2.3"), "5.5.5.5")
+        self.assertEqual(client_ip("127.0.0.1", "10.9.9.9, 10.1.2.3"), "10.9.9.9")
+        # Ishonchsiz manbadan kelgan sarlavha e'tiborga olinmaydi
+        self.assertEqual(client_ip("1.2.3.4", "5.5.5.5"), "1.2.3.4")
+        self.assertEqual(client_ip("127.0.0.1", ""), "127.0.0.1")
+
+    @override_settings(RATELIMIT_ENABLED=True, SHARED_CACHE=False)
+    def test_rate_limit_requires_shared_cache(self):
+        self.assertEqual([error.id for error in ratelimit_cache_check(None)], ["testapp.E001"])
+        with self.settings(SHARED_CACHE=True):
+            self.assertEqual(ratelimit_cache_check(None), [])
+
+
+class SubmitTokenTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.category = TestTuri.objects.create(name="Biologiya")
+        cls.questions = make_questions(cls.category, 3)
+
+    def setUp(self):
+        # Nusxa va savollar keshi kalitlarida id bor, bazadagi id'lar esa qayta ishlatiladi
+        cache.clear()
+
+    def start(self):
+        return create_test_session("talaba", self.category.pk, 1)
+
+    def test_repeated_start_returns_the_same_session(self):
+        self.assertEqual(self.start().pk, self.start().pk)
+
+    def test_form_token_is_used_once(self):
+        test_session = self.start()
+        first, second = self.questions[:2]
+        self.assertTrue(submit_answers(test_session, {first.pk: "A"}, "token"))
+        self.assertFalse(submit_answers(test_session, {second.pk: "B"}, "token"))
+        self.assertEqual(session_answers(test_session), {first.pk: "A"})
+
+    def test_failed_submit_does_not_burn_token(self):
+        test_session = self.start()
+        question = self.questions[0]
+        with mock.patch("testapp.services.finish_session", side_effect=RuntimeError):
+            with self.assertRaises(RuntimeError):
+                submit_answers(test_session, {question.pk: "A"}, "token")
+        self.assertFalse(SubmitToken.objects.filter(test_session=test_session).exists())
+        self.assertTrue(submit_answers(test_session, {question.pk: "B"}, "token"))
+        test_session.refresh_from_db()
+        self.assertEqual(session_answers(test_session), {question.pk: "B"})
+        self.assertIsNotNone(test_session.finished_at)
+
+    def test_form_resubmission_through_view(self):
+        self.client.get(reverse("test_list"))
+        response = self.client.post(reverse("start_test", args=[self.category.pk]))
+        url = response.url
+        question = self.questions[0]
+        self.client.post(url, {"submit_token": "token", f"question_{question.pk}": "A"})
+        response = self.client.post(url, {"submit_token": "token", f"question_{question.pk}": "C"})
+        test_session = SubmitToken.objects.get(token="token").test_session
+        self.assertRedirects(response, reverse("test_results", args=[test_session.pk]))
+        self.assertEqual(session_answers(test_session), {question.pk: "A"})
+
+    def test_api_idempotency_key_replays_first_response(self):
+        started = self.client.post(reverse("api_start", args=[self.category.pk])).json()
+        question = self.questions[0]
+
+        def submit(answer):
+            return self.client.post(
+                started["submit_url"],
+                json.dumps({"answers": {str(question.pk): answer}}),
+                content_type="application/json",
+                headers={"Idempotency-Key": "retry-1"},
+            )
+
+        first = submit(question.correct_answer)
+        second = submit("D" if question.correct_answer != "D" else "A")
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual(second.content, first.content)
+        self.assertEqual(first.json()["correct"], 1)
+        self.assertEqual(SubmitToken.objects.filter(scope=SubmitToken.SCOPE_API).count(), 1)
+
+
+class SnapshotScoringTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.category = TestTuri.objects.create(name="Kimyo")
+        cls.other = TestTuri.objects.create(name="Fizika")
+        cls.questions = make_questions(cls.category, 4)
+
+    def setUp(self):
+        cache.clear()
+
+    def edit_and_move(self):
+        first, second = self.questions[:2]
+        first.correct_answer = "D" if first.correct_answer != "D" else "A"
+        first.save()
+        move_questions(Question.objects.filter(pk=second.pk), self.other.pk)
+        return first, second
+
+    def test_score_uses_snapshot_after_edit_and_move(self):
+        test_session = create_test_session("talaba", self.category.pk, 1)
+        save_answers(test_session, {q.pk: q.correct_answer for q in self.questions})
+        first, second = self.edit_and_move()
+
+        key = session_answer_key(test_session)
+        self.assertEqual(set(key), {q.pk for q in self.questions})
+        self.assertEqual(score(session_answers(test_session), key)["correct"], 4)
+
+        # Yangi sessiya yangi versiyada
+        new_session = create_test_session("boshqa", self.category.pk, 1)
+        self.assertGreater(new_session.question_set_version, test_session.question_set_version)
+        new_key = session_answer_key(new_session)
+        self.assertNotIn(second.pk, new_key)
+        self.assertEqual(new_key[first.pk], first.correct_answer)
+
+    def test_api_serves_and_grades_the_session_snapshot(self):
+        started = self.client.post(reverse("api_start", args=[self.category.pk])).json()
+        self.assertEqual(started["questions_url"], reverse("api_session_questions", args=[started["session_id"]]))
+        answers = {str(q.pk): q.correct_answer for q in self.questions}
+        first, second = self.edit_and_move()
+
+        served = self.client.get(started["questions_url"]).json()
+        self.assertEqual([q["id"] for q in served["questions"]], [q.pk for q in self.questions])
+        current = self.client.get(reverse("api_questions", args=[self.category.pk, 1])).json()
+        self.assertNotIn(second.pk, [q["id"] for q in current["questions"]])
+
+        result = self.client.post(
+            started["submit_url"], json.dumps({"answers": answers}), content_type="application/json"
+        ).json()
+        self.assertEqual((result["correct"], result["total"]), (4, 4))
+
+    def test_session_questions_are_private(self):
+        started = self.client.post(reverse("api_start", args=[self.category.pk])).json()
+        self.assertEqual(self.client_class().get(started["questions_url"]).status_code, 404)
+
+
+class SimilarityTests(TestCase):
+    TEXT = (
+        "Hujayraning energiya stansiyasi deb qaysi organoid ataladi va u qanday "
+        "jarayonda ATF molekulalarini sintez qiladi"
+    )
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.category = TestTuri.objects.create(name="Biologiya")
+        cls.other = TestTuri.objects.create(name="Sitologiya")
+
+        def question(text, category=None, **choices):
+            # create() - signal imzoni yaratadi (index_objects)
+            return Question.objects.create(
+                question_text=text,
+                choice_a=choices.get("a", "Mitoxondriya"),
+                choice_b="Ribosoma",
+                choice_c="Lizosoma",
+                choice_d="Yadro",
+                correct_answer="A",
+                category=category or cls.category,
+            )
+
+        cls.original = question(cls.TEXT)
+        # Registr va tinish belgilari farqi - normalize() dan keyin bir xil
+        cls.copy = question(cls.TEXT.upper() + "?")
+        cls.near = question(cls.TEXT.replace("qanday", "qaysi"))
+        cls.elsewhere = question(cls.TEXT, category=cls.other)
+        cls.unrelated = question(
+            "Fotosintezning yorug'lik bosqichida suv molekulasi parchalanib "
+            "kislorod ajraladi, bu jarayon qayerda kechadi",
+            a="Tilakoid",
+        )
+
+    def test_find_similar(self):
+        found = dict(find_similar(self.original))
+        self.assertEqual(found[self.copy.pk], 1.0)
+        self.assertGreaterEqual(found[self.near.pk], DUPLICATE_THRESHOLD)
+        self.assertIn(self.elsewhere.pk, found)
+        self.assertNotIn(self.original.pk, found)
+        self.assertNotIn(self.unrelated.pk, found)
+
+        same_scope = dict(find_similar(self.original, same_scope=True))
+        self.assertEqual(set(same_scope), {self.copy.pk, self.near.pk})
+
+    def test_duplicate_clusters(self):
+        clusters = duplicate_clusters(scope_id=self.category.pk)
+        self.assertEqual(len(clusters), 1)
+        self.assertEqual(clusters[0]["ids"], sorted([self.original.pk, self.copy.pk, self.near.pk]))
+        self.assertGreaterEqual(clusters[0]["similarity"], DUPLICATE_THRESHOLD)
+
+        everywhere = duplicate_clusters()
+        self.assertEqual(len(everywhere), 1)
+        self.assertIn(self.elsewhere.pk, everywhere[0]["ids"])
+        self.assertNotIn(self.unrelated.pk, everywhere[0]["ids"])
+
+    def test_edit_updates_signature(self):
+        self.near.question_text = "Butunlay boshqa savol: Yer Quyosh atrofida necha kunda aylanadi"
+        self.near.save()
+        self.assertNotIn(self.near.pk, dict(find_similar(self.original)))
+
+    def test_question_change_form_lists_similar_questions(self):
+        self.client.force_login(User.objects.create_superuser("admin", "admin@example.com", "parol"))
+        response = self.client.get(reverse("admin:testapp_question_change", args=[self.original.pk]))
+        self.assertContains(response, reverse("admin:testapp_question_change", args=[self.copy.pk]))
+        self.assertNotContains(response, reverse("admin:testapp_question_change", args=[self.unrelated.pk]))
@@ -0,0 +1,178 @@
+"""
+Test topshirish oqimi uchun so'rovlar chastotasini cheklash.
+
+Hisoblagichlar umumiy keshda (`CACHE_URL` bilan Redis) saqlanadi, shuning
+uchun cheklov barcha worker'lar uchun birgalikda ishlaydi. LocMem keshda har
+bir worker alohida hisoblagan bo'lardi (chegara worker soniga ko'payadi) -
+shuning uchun `RATELIMIT_ENABLED` faqat umumiy kesh bilan yoqiladi
+(testapp/checks.py). Takroriy yuborishdan himoya keshga emas, bazaga
+bog'liq (`services.submit_answers`).
+
+Sirg'aluvchi oyna (sliding window counter): joriy va oldingi oyna
+hisoblagichlari olinadi, oldingisi oynaning qolgan ulushiga ko'paytiriladi.
+Har bir so'rov bitta `incr` va bitta `get` - bazaga murojaat yo'q.
+
+Identifikator - test topshiruvchi kaliti (sessiyada bo'lsa) va IP manzil
+(proksi ortida - X-Forwarded-For'dan, `client_ip`).
+IP uchun chegara ancha yuqori: imtihon zalida ko'p talaba bitta NAT
+manzili orqali chiqadi.
+"""
+
+from __future__ import annotations
+
+import ipaddress
+import math
+import time
+from functools import lru_cache, wraps
+
+from asgiref.sync import iscoroutinefunction
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse
+
+from .services import TEST_TAKER_SESSION_KEY
+
+
+def parse_rate(rate: str) -> tuple[int, int]:
+    """
+    "10/60" -> (10 ta so'rov, 60 soniya).
+    """
+
+    limit, _, window = rate.partition("/")
+    return int(limit), int(window or 60)
+
+
+def _window_keys(scope: str, ident: str, window: int, now: float):
+    current = int(now // window)
+    prefix = f"testapp:rl:{scope}:{ident}:{window}"
+    return f"{prefix}:{current}", f"{prefix}:{current - 1}", (now % window) / window
+
+
+def _retry_after(limit: int, window: int, previous: int, current: int, elapsed: float) -> int:
+    # Keyingi so'rov hisobga olinganda yig'indi chegaradan oshmaydigan vaqt.
+    # `current` rad etilgan so'rovni ham o'z ichiga oladi, keyingisi - current + 1
+    if current < limit:
+        # Joriy oyna ichida: oldingi oyna ulushi yetarlicha kamayguncha
+        wait = 1 - elapsed - (limit - current - 1) / previous
+    else:
+        # Keyingi oynada joriy hisoblagich "oldingi" bo'lib, ulushi kamayguncha
+        wait = (1 - elapsed) + max(0.0, 1 - (limit - 1) / current)
+    return max(1, math.ceil(wait * window))
+
+
+def hit(scope: str, ident: str, rate: str) -> int | None:
+    """
+    So'rovni hisobga oladi. Chegaradan oshgan bo'lsa - necha soniyadan
+    keyin qayta urinish mumkinligi, aks holda None.
+    """
+
+    limit, window = parse_rate(rate)
+    current_key, previous_key, elapsed = _window_keys(scope, ident, window, time.time())
+    cache.add(current_key, 0, window * 2)
+    try:
+        current = cache.incr(current_key)
+    except ValueError:
+        # Kalit add va incr orasida muddati tugab o'chgan
+        cache.set(current_key, 1, window * 2)
+        current = 1
+    previous = cache.get(previous_key) or 0
+    if previous * (1 - elapsed) + current > limit:
+        return _retry_after(limit, window, previous, current, elapsed)
+    return None
+
+
+async def ahit(scope: str, ident: str, rate: str) -> int | None:
+    limit, window = parse_rate(rate)
+    current_key, previous_key, elapsed = _window_keys(scope, ident, window, time.time())
+    await cache.aadd(current_key, 0, window * 2)
+    try:
+        current = await cache.aincr(current_key)
+    except ValueError:
+        await cache.aset(current_key, 1, window * 2)
+        current = 1
+    previous = await cache.aget(previous_key) or 0
+    if previous * (1 - elapsed) + current > limit:
+        return _retry_after(limit, window, previous, current, elapsed)
+    return None
+
+
+@lru_cache(maxsize=8)
+def _trusted_networks(proxies: tuple[str, ...]) -> tuple:
+    return tuple(ipaddress.ip_network(proxy, strict=False) for proxy in proxies if proxy)
+
+
+def _is_trusted(address: str, networks: tuple) -> bool:
+    try:
+        ip = ipaddress.ip_address(address)
+    except ValueError:
+        return False
+    return any(ip in network for network in networks)
+
+
+def client_ip(request) -> str:
+    """
+    Mijoz IP manzili. So'rov ishonchli proksidan (`TRUSTED_PROXIES`) kelgan
+    bo'lsa, X-Forwarded-For o'ngdan chapga o'qiladi va birinchi ishonchsiz
+    manzil olinadi: chap tomonni mijozning o'zi yozishi mumkin.
+    """
+
+    address = request.META.get("REMOTE_ADDR", "")
+    networks = _trusted_networks(tuple(settings.TRUSTED_PROXIES))
+    if _is_trusted(address, networks):
+        forwarded = request.META.get("HTTP_X_FORWARDED_FOR", "")
+        for hop in reversed([hop.strip() for hop in forwarded.split(",") if hop.strip()]):
+            address = hop
+            if not _is_trusted(hop, networks):
+                break
+    return address or "unknown"
+
+
+def _limited_response(retry_after: int) -> HttpResponse:
+    response = HttpResponse(
+        "Juda ko'p so'rov yuborildi. Birozdan keyin qayta urinib ko'ring.",
+        status=429,
+        content_type="text/plain; charset=utf-8",
+    )
+    response["Retry-After"] = str(retry_after)
+    return response
+
+
+def ratelimit(scope: str):
+    """
+    View dekoratori: faqat POST so'rovlar `settings.RATELIMIT_RATES[scope]`
+    bo'yicha test topshiruvchi kaliti va `RATELIMIT_RATES["ip"]` bo'yicha IP
+    manzil uchun hisoblanadi. Chegaradan oshsa 429 va Retry-After qaytadi.
+    """
+
+    def decorator(view):
+        if iscoroutinefunction(view):
+
+            @wraps(view)
+            async def async_wrapper(request, *args, **kwargs):
+                if settings.RATELIMIT_ENABLED and request.method == "POST":
+                    rates = settings.RATELIMIT_RATES
+                    retry_after = await ahit(f"{scope}:ip", client_ip(request), rates["ip"])
+                    taker_key = await request.session.aget(TEST_TAKER_SESSION_KEY)
+                    if retry_after is None and taker_key:
+                        retry_after = await ahit(scope, taker_key, rates[scope])
+                    if retry_after is not None:
+                        return _limited_response(retry_after)
+                return await view(request, *args, **kwargs)
+
+            return async_wrapper
+
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            if settings.RATELIMIT_ENABLED and request.method == "POST":
+                rates = settings.RATELIMIT_RATES
+                retry_after = hit(f"{scope}:ip", client_ip(request), rates["ip"])
+                taker_key = request.session.get(TEST_TAKER_SESSION_KEY)
+                if retry_after is None and taker_key:
+                    retry_after = hit(scope, taker_key, rates[scope])
+                if retry_after is not None:
+                    return _limited_response(retry_after)
+            return view(request, *args, **kwargs)
+
+        return wrapper
+
+    return decorator
@@ -1,18 +1,36 @@
+from django.conf import settings
 from django.urls import path
 
-from . import views
+from . import api, async_views, views
+
+# ASGI profilida test sahifalari async view'lar orqali xizmat qiladi
+test_views = async_views if settings.ASYNC_VIEWS else views
 
 urlpatterns = [
-    path("testlar/", views.test_list, name="test_list"),
-    path("testlar/<int:category_id>/start/", views.start_test, name="start_test"),
-    path("test/<int:test_id>/", views.test_run, name="test_run"),
+    path("testlar/", test_views.test_list, name="test_list"),
+    path("testlar/<int:category_id>/start/", test_views.start_test, name="start_test"),
+    path("test/<int:test_id>/", test_views.test_run, name="test_run"),
     path(
         "results/<int:test_session_id>/",
-        views.test_results,
+        test_views.test_results,
         name="test_results",
     ),
-    path("savollar/", views.practice_questions_list, name="practice_questions_list"),
-    path("savollar/<int:question_id>/", views.practice_question_detail, name="practice_question_detail"),
+    path("savollar/", test_views.practice_questions_list, name="practice_questions_list"),
+    path("savollar/<int:question_id>/", test_views.practice_question_detail, name="practice_question_detail"),
+    # JSON API (mobil/SPA mijozlar uchun)
+    path("api/v1/tests/", api.catalogue, name="api_catalogue"),
+    path("api/v1/tests/<int:category_id>/start/", api.start_session, name="api_start"),
+    path(
+        "api/v1/tests/<int:category_id>/groups/<int:group_number>/questions/",
+        api.questions,
+        name="api_questions",
+    ),
+    path(
+        "api/v1/sessions/<int:test_session_id>/questions/",
+        api.session_questions,
+        name="api_session_questions",
+    ),
+    path("api/v1/sessions/<int:test_session_id>/submit/", api.submit, name="api_submit"),
 ]
 
 
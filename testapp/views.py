@@ -1,15 +1,27 @@
 from __future__ import annotations
 
-from collections import defaultdict
-import random
-
-from django.db.models import Count
+from django.contrib.sessions.backends.signed_cookies import SessionStore as SignedCookieSessionStore
 from django.http import Http404, HttpRequest, HttpResponse
 from django.shortcuts import get_object_or_404, redirect, render
-from django.utils import timezone
+from django.utils.crypto import get_random_string
 from django.views.decorators.http import require_GET, require_http_methods, require_POST
 
-from .models import Question, TestSession, TestTuri, UserAnswer, PracticeQuestion, Category
+from .models import Question, TestSession, TestTuri, PracticeQuestion, Category
+from .rendering import question_fragments, render_questions
+from .throttling import ratelimit
+from .services import (
+    TEST_TAKER_SESSION_KEY,
+    archived_score,
+    build_catalogue,
+    create_test_session,
+    normalize_answers,
+    resolve_group_number,
+    score,
+    session_answer_key,
+    session_answers,
+    session_questions,
+    submit_answers,
+)
 
 
 @require_GET
@@ -18,30 +30,14 @@ def test_list(request: HttpRequest) -> HttpResponse:
     /tests/ - mavjud test turlari ro'yxati.
     """
 
-    categories = TestTuri.objects.all().order_by("name")
-    group_counts = (
-        Question.objects.values("category_id", "group_number")
-        .annotate(total=Count("id"))
-        .order_by("category_id", "group_number")
-    )
-
-    groups_by_category: dict[int, list[dict]] = defaultdict(list)
-    for row in group_counts:
-        groups_by_category[row["category_id"]].append(
-            {"group_number": row["group_number"], "total": row["total"]}
-        )
-
-    category_entries = []
-    for category in categories:
-        groups = groups_by_category.get(category.id, [])
-        total_questions = sum(group["total"] for group in groups)
-        category_entries.append(
-            {
-                "category": category,
-                "groups": groups,
-                "total_questions": total_questions,
-            }
-        )
+    category_entries = [
+        {
+            "category": entry,
+            "groups": entry["groups"],
+            "total_questions": entry["total_questions"],
+        }
+        for entry in build_catalogue()
+    ]
 
     return render(
         request,
@@ -50,13 +46,33 @@ def test_list(request: HttpRequest) -> HttpResponse:
     )
 
 
+
 def _get_or_create_session_key(request: HttpRequest) -> str:
-    if not request.session.session_key:
-        request.session.create()
-    return request.session.session_key
+    """
+    Anonim test topshiruvchining barqaror identifikatori.
+
+    Identifikator sessiya ma'lumotining ichida saqlanadi: signed_cookies
+    engine'da session_key har saqlashda o'zgaradi, boshqa engine'larda esa
+    `session.create()` bilan so'rov o'rtasida bazaga yozish shart bo'lmaydi -
+    sessiyani SessionMiddleware javob qaytarishda bir marta saqlaydi.
+    """
+
+    session = request.session
+    taker_key = session.get(TEST_TAKER_SESSION_KEY)
+    if taker_key:
+        return taker_key
+
+    if session.session_key and not isinstance(session, SignedCookieSessionStore):
+        # Oldin yaratilgan TestSession'lar shu kalit bilan bog'langan
+        taker_key = session.session_key
+    else:
+        taker_key = get_random_string(32)
+    session[TEST_TAKER_SESSION_KEY] = taker_key
+    return taker_key
 
 
 @require_POST
+@ratelimit("start")
 def start_test(request: HttpRequest, category_id: int) -> HttpResponse:
     """
     Tanlangan TestTuriga yangi TestSession yaratadi va savol ishlash sahifasiga yuboradi.
@@ -65,33 +81,19 @@ def start_test(request: HttpRequest, category_id: int) -> HttpResponse:
     category = get_object_or_404(TestTuri, pk=category_id)
     session_key = _get_or_create_session_key(request)
 
-    group_number = int(request.POST.get("group_number", 1) or 1)
-    if group_number < 1:
-        group_number = 1
-
-    if not Question.objects.filter(
-        category=category, group_number=group_number
-    ).exists():
-        first_group = (
-            Question.objects.filter(category=category)
-            .order_by("group_number")
-            .values_list("group_number", flat=True)
-            .first()
-        )
-        if first_group is None:
-            raise Http404("Ushbu kategoriya uchun savollar mavjud emas.")
-        group_number = first_group
-
-    test_session = TestSession.objects.create(
-        session_key=session_key,
-        category=category,
-        group_number=group_number,
+    group_number = resolve_group_number(
+        category.pk, int(request.POST.get("group_number", 1) or 1)
     )
+    if group_number is None:
+        raise Http404("Ushbu kategoriya uchun savollar mavjud emas.")
+
+    test_session = create_test_session(session_key, category.pk, group_number)
 
     return redirect("test_run", test_id=test_session.pk)
 
 
 @require_http_methods(["GET", "POST"])
+@ratelimit("submit")
 def test_run(request: HttpRequest, test_id: int) -> HttpResponse:
     """
     /test/<test_id>/ - barcha savollar bitta sahifada ko'rsatiladi.
@@ -103,13 +105,9 @@ def test_run(request: HttpRequest, test_id: int) -> HttpResponse:
     if test_session.session_key != _get_or_create_session_key(request):
         raise Http404("Ushbu test sessiyasiga kirish huquqingiz yo'q.")
 
-    questions = list(
-        Question.objects.filter(
-            category=test_session.category, group_number=test_session.group_number
-        ).order_by("id")
-    )
+    fragments = question_fragments(test_session)
 
-    if not questions:
+    if not fragments:
         return render(
             request,
             "testapp/test_empty.html",
@@ -117,120 +115,86 @@ def test_run(request: HttpRequest, test_id: int) -> HttpResponse:
         )
 
     if request.method == "POST":
-        for question in questions:
-            field_name = f"question_{question.id}"
-            selected = (request.POST.get(field_name) or "").upper()
-            if selected in {"A", "B", "C", "D"}:
-                UserAnswer.objects.update_or_create(
-                    test_session=test_session,
-                    question=question,
-                    defaults={"selected_answer": selected},
-                )
-            else:
-                UserAnswer.objects.filter(
-                    test_session=test_session, question=question
-                ).delete()
-
-        if not test_session.finished_at:
-            test_session.finished_at = timezone.now()
-            test_session.save(update_fields=["finished_at"])
-
-        return redirect("test_results", test_session_id=test_session.pk)
-
-    user_answers = {
-        answer.question_id: answer.selected_answer
-        for answer in UserAnswer.objects.filter(test_session=test_session)
-    }
-
-    question_entries = []
-    for index, question in enumerate(questions, start=1):
-        options = [
-            ("A", question.choice_a),
-            ("B", question.choice_b),
-            ("C", question.choice_c),
-            ("D", question.choice_d),
-        ]
-        random.shuffle(options)
-        option_entries = [
-            {"value": key, "text": text}
-            for key, text in options
-            if text not in {None, ""}
-        ]
-
-        question_entries.append(
+        question_ids = [fragment.question_id for fragment in fragments]
+        answers = normalize_answers(
             {
-                "question": question,
-                "selected": user_answers.get(question.id, ""),
-                "number": index,
-                "options": option_entries,
-            }
+                question_id: request.POST.get(f"question_{question_id}")
+                for question_id in question_ids
+            },
+            question_ids,
         )
+        # Qayta yuborilgan forma (ikki marta bosish, yangilash) bazaga yozmaydi
+        submit_answers(test_session, answers, request.POST.get("submit_token", ""))
 
-    total_questions = len(question_entries)
+        return redirect("test_results", test_session_id=test_session.pk)
 
     return render(
         request,
         "testapp/test_run.html",
         {
             "test_session": test_session,
-            "question_entries": question_entries,
-            "total_questions": total_questions,
+            "questions_html": render_questions(fragments, session_answers(test_session)),
+            "total_questions": len(fragments),
+            "submit_token": get_random_string(22),
         },
     )
 
 
-@require_GET
-def test_results(request: HttpRequest, test_session_id: int) -> HttpResponse:
+def _results_context(
+    test_session: TestSession,
+    questions: list[Question],
+    user_answers: dict[int, str],
+    key: dict[int, str],
+) -> dict:
     """
-    /results/<test_session_id>/ - natijalar sahifasi.
+    Natija sessiya boshlangan versiya kaliti (`key`) bo'yicha: keyin
+    o'zgartirilgan to'g'ri javoblar va ko'chirilgan savollar ta'sir qilmaydi.
+    Arxivlangan sessiyada ball arxivlash paytida saqlangan natijadan olinadi.
     """
 
-    test_session = get_object_or_404(TestSession, pk=test_session_id)
-    if test_session.session_key != _get_or_create_session_key(request):
-        raise Http404()
+    if test_session.archived_at:
+        result = archived_score(test_session)
+    else:
+        result = score(user_answers, key)
 
-    questions = list(
-        Question.objects.filter(
-            category=test_session.category, group_number=test_session.group_number
-        ).order_by("id")
-    )
-    user_answers = {
-        ua.question_id: ua.selected_answer
-        for ua in UserAnswer.objects.filter(test_session=test_session)
-    }
-
-    total = len(questions)
-    correct = 0
     details = []
-
     for q in questions:
         user_ans = user_answers.get(q.id, "")
-        is_correct = user_ans == q.correct_answer
-        if is_correct:
-            correct += 1
+        correct_answer = key.get(q.id, q.correct_answer)
         details.append(
             {
                 "question": q,
                 "user_answer": user_ans,
-                "is_correct": is_correct,
+                "correct_answer": correct_answer,
+                "is_correct": user_ans == correct_answer,
             }
         )
 
-    wrong = total - correct
-    percentage = (correct / total * 100) if total > 0 else 0
+    return {
+        "test_session": test_session,
+        "group_number": test_session.group_number,
+        **result,
+        "details": details,
+    }
+
+
+@require_GET
+def test_results(request: HttpRequest, test_session_id: int) -> HttpResponse:
+    """
+    /results/<test_session_id>/ - natijalar sahifasi.
+    """
+
+    test_session = get_object_or_404(TestSession, pk=test_session_id)
+    if test_session.session_key != _get_or_create_session_key(request):
+        raise Http404()
+
+    questions = list(session_questions(test_session))
+    user_answers = session_answers(test_session)
 
     return render(
         request,
         "testapp/test_results.html",
-        {
-            "test_session": test_session,
-            "group_number": test_session.group_number,
-            "total": total,
-            "correct": correct,
-            "wrong": wrong,
-            "percentage": round(percentage, 2),
-            "details": details,
-        },
+        _results_context(test_session, questions, user_answers, session_answer_key(test_session)),
     )
 
 
@@ -240,7 +204,11 @@ def practice_questions_list(request: HttpRequest) -> HttpResponse:
     /savollar/ - amaliy savollar ro'yxati.
     """
     category_slug = request.GET.get('category')
-    questions = PracticeQuestion.objects.all().order_by("-created_at")
+    questions = (
+        PracticeQuestion.objects.select_related("category")
+        .defer("rendered_html")  # ro'yxatda faqat qisqa oddiy matn
+        .order_by("-created_at")
+    )
     categories = Category.objects.all()
     
     if category_slug: